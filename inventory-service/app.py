@@ -3,6 +3,8 @@ from flask import Flask
 from routes.stock_routes import stock_bp
 from routes.warehouse_routes import warehouse_bp
 from routes.movement_routes import movement_bp
+from routes.alert_routes import alert_bp
+from routes import dependencies
 
 
 def create_app():
@@ -11,6 +13,10 @@ def create_app():
     app.register_blueprint(stock_bp, url_prefix="/stock")
     app.register_blueprint(warehouse_bp, url_prefix="/warehouses")
     app.register_blueprint(movement_bp, url_prefix="/movements")
+    app.register_blueprint(alert_bp, url_prefix="/alerts")
+
+    # Release abandoned order holds in the background
+    dependencies.stock_service.start_reservation_expiry()
 
     @app.route("/health")
     def health():
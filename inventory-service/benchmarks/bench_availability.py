@@ -0,0 +1,72 @@
+"""Latency of bulk availability lookups on a large inventory.
+
+Loads items across warehouses, then times ``POST /stock/availability``
+requests for random sets of products, both in the service and through the
+Flask app, and reports latency percentiles.
+
+    python benchmarks/bench_availability.py --items 1000000 --batch 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import create_app  # noqa: E402
+from models.inventory_item import InventoryItem  # noqa: E402
+from routes import dependencies  # noqa: E402
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000  # noqa: E731
+    return f"p50 {pick(0.50):6.2f} ms   p99 {pick(0.99):6.2f} ms   max {samples[-1] * 1000:6.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--warehouses", type=int, default=50)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    repo = dependencies.stock_repo
+    print(f"Loading {args.items:,} items across {args.warehouses} warehouses")
+    for n in range(args.items):
+        repo.save(InventoryItem(product_id=f"prod-{n % args.products}", sku=f"SKU-{n}",
+                                warehouse_id=f"wh-{n % args.warehouses}",
+                                quantity=rng.randint(0, 500), reserved_quantity=rng.randint(0, 20)))
+
+    service = dependencies.stock_service
+    client = create_app().test_client()
+    batches = [[f"prod-{rng.randrange(args.products)}" for _ in range(args.batch)]
+               for _ in range(args.requests)]
+
+    for by_warehouse in (False, True):
+        label = "per warehouse" if by_warehouse else "totals"
+        service_times, http_times = [], []
+        for product_ids in batches:
+            start = time.perf_counter()
+            service.get_availability(product_ids=product_ids, by_warehouse=by_warehouse)
+            service_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            response = client.post("/stock/availability",
+                                   json={"product_ids": product_ids, "by_warehouse": by_warehouse})
+            http_times.append(time.perf_counter() - start)
+            assert response.status_code == 200
+        print(f"{args.batch} products, {label}:")
+        print(f"  service: {percentiles(service_times)}")
+        print(f"  http:    {percentiles(http_times)}   mean {statistics.mean(http_times) * 1000:.2f} ms")
+    dependencies.stock_service.stop_reservation_expiry()
+
+
+if __name__ == "__main__":
+    main()
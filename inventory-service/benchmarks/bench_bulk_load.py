@@ -0,0 +1,72 @@
+"""Bulk-loading a large inventory into StockRepository.
+
+Loads items spread across warehouses in batches and reports the write rate
+per batch, so index costs that grow with warehouse size show up as a
+falling rate. Then times warehouse and product lookups and deletes.
+
+    python benchmarks/bench_bulk_load.py --items 1000000 --warehouses 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.inventory_item import InventoryItem  # noqa: E402
+from repositories.stock_repository import StockRepository  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--warehouses", type=int, default=50)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--deletes", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    repo = StockRepository()
+    warehouses = [f"wh-{w}" for w in range(args.warehouses)]
+    batch_size = max(1, args.items // args.batches)
+
+    print(f"Loading {args.items:,} items across {args.warehouses} warehouses")
+    start = time.perf_counter()
+    for first in range(0, args.items, batch_size):
+        batch_start = time.perf_counter()
+        last = min(first + batch_size, args.items)
+        for n in range(first, last):
+            repo.save(InventoryItem(product_id=f"prod-{n % args.products}", sku=f"SKU-{n}",
+                                    warehouse_id=warehouses[n % args.warehouses],
+                                    quantity=rng.randint(0, 500)))
+        elapsed = time.perf_counter() - batch_start
+        print(f"  items {first:>9,}-{last:>9,}: {(last - first) / elapsed:>10,.0f} saves/s")
+    total = time.perf_counter() - start
+    print(f"Loaded in {total:.1f}s ({args.items / total:,.0f} saves/s)")
+
+    start = time.perf_counter()
+    for warehouse_id in warehouses:
+        repo.find_by_warehouse(warehouse_id)
+    elapsed = time.perf_counter() - start
+    print(f"find_by_warehouse: {elapsed / len(warehouses) * 1000:.1f} ms per warehouse")
+
+    products = [f"prod-{rng.randrange(args.products)}" for _ in range(10_000)]
+    start = time.perf_counter()
+    for product_id in products:
+        repo.find_by_product(product_id)
+    elapsed = time.perf_counter() - start
+    print(f"find_by_product:   {elapsed / len(products) * 1e6:.1f} us per product")
+
+    victims = rng.sample([item.id for item in repo.get_all()], min(args.deletes, args.items))
+    start = time.perf_counter()
+    for item_id in victims:
+        repo.delete(item_id)
+    elapsed = time.perf_counter() - start
+    print(f"delete:            {len(victims) / elapsed:,.0f} deletes/s")
+
+
+if __name__ == "__main__":
+    main()
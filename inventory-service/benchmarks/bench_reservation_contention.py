@@ -0,0 +1,92 @@
+"""Reservation throughput on hot SKUs: optimistic CAS vs per-item locks.
+
+Many threads reserve single units on a small set of hot items, as during a
+flash sale, and each concurrency mode is timed on identical workloads.
+
+    python benchmarks/bench_reservation_contention.py --threads 16 --hot-items 4
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.warehouse import Warehouse  # noqa: E402
+from repositories.stock_repository import StockRepository  # noqa: E402
+from repositories.warehouse_repository import WarehouseRepository  # noqa: E402
+from services.stock_service import StockService  # noqa: E402
+
+
+def run(mode: str, threads: int, hot_items: int, ops_per_thread: int, seed: int) -> dict:
+    stock_repo = StockRepository()
+    warehouse_repo = WarehouseRepository()
+    warehouse = warehouse_repo.save(Warehouse(name="Bench", code="WH-BENCH", address="1 Bench St",
+                                              city="Newark", state="NJ"))
+    service = StockService(stock_repo, warehouse_repo, concurrency=mode)
+    total = threads * ops_per_thread
+    items = [
+        service.add_inventory_item(f"prod-{i}", f"SKU-{i}", warehouse.id, quantity=0)
+        for i in range(hot_items)
+    ]
+    for item in items:
+        stock_repo.find_by_id(item.id).max_quantity = total
+        service.receive_stock(item.id, total)
+
+    barrier = threading.Barrier(threads + 1)
+    failures = []
+
+    def worker(n: int):
+        rng = random.Random(seed + n)
+        targets = [rng.choice(items).id for _ in range(ops_per_thread)]
+        barrier.wait()
+        for item_id in targets:
+            try:
+                service.reserve_stock(item_id, 1)
+            except ValueError:
+                failures.append(item_id)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    reserved = sum(service.get_item(item.id).reserved_quantity for item in items)
+    assert reserved == total - len(failures), "lost update detected"
+    return {
+        "mode": mode,
+        "ops_per_sec": total / elapsed,
+        "conflicts": service.conflicts,
+        "failures": len(failures),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--hot-items", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=5000, help="Reservations per thread")
+    parser.add_argument("--switch-interval", type=float, default=None,
+                        help="sys.setswitchinterval value, to vary preemption pressure")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.switch_interval is not None:
+        sys.setswitchinterval(args.switch_interval)
+
+    print(f"{args.threads} threads, {args.hot_items} hot items, {args.ops} reservations per thread")
+    for mode in (StockService.OPTIMISTIC, StockService.LOCKING):
+        result = run(mode, args.threads, args.hot_items, args.ops, args.seed)
+        print(f"  {result['mode']:<10} {result['ops_per_sec']:>10,.0f} reservations/s  "
+              f"conflicts={result['conflicts']}  failures={result['failures']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,7 @@ class InventoryItem:
     reorder_point: int = 10
     reorder_quantity: int = 50
     max_quantity: int = 1000
+    version: int = 0  # bumped on every save; used for compare-and-swap updates
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
@@ -42,6 +43,7 @@ class InventoryItem:
             "reorder_point": self.reorder_point,
             "reorder_quantity": self.reorder_quantity,
             "max_quantity": self.max_quantity,
+            "version": self.version,
             "is_low_stock": self.is_low_stock,
             "is_out_of_stock": self.is_out_of_stock,
             "created_at": self.created_at.isoformat(),
@@ -0,0 +1,37 @@
+"""Stock reservation model."""
+from datetime import datetime
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Optional
+import uuid
+
+
+class ReservationStatus(str, Enum):
+    HELD = "held"            # stock is reserved until expires_at
+    CONFIRMED = "confirmed"  # converted into a shipment
+    RELEASED = "released"    # released by the caller
+    EXPIRED = "expired"      # released because the hold timed out
+
+
+@dataclass
+class Reservation:
+    order_id: str
+    item_id: str
+    quantity: int
+    expires_at: datetime
+    status: ReservationStatus = ReservationStatus.HELD
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    release_error: Optional[str] = None  # why the held stock could not be released
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "order_id": self.order_id,
+            "item_id": self.item_id,
+            "quantity": self.quantity,
+            "status": self.status.value,
+            "expires_at": self.expires_at.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "release_error": self.release_error,
+        }
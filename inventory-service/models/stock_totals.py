@@ -0,0 +1,24 @@
+"""Aggregated stock levels for a product or a warehouse."""
+from dataclasses import dataclass
+
+
+@dataclass
+class StockTotals:
+    quantity: int = 0
+    reserved_quantity: int = 0
+    available_quantity: int = 0
+    item_count: int = 0
+
+    def add(self, quantity: int, reserved_quantity: int, available_quantity: int, sign: int = 1):
+        self.quantity += sign * quantity
+        self.reserved_quantity += sign * reserved_quantity
+        self.available_quantity += sign * available_quantity
+        self.item_count += sign
+
+    def to_dict(self) -> dict:
+        return {
+            "quantity": self.quantity,
+            "reserved_quantity": self.reserved_quantity,
+            "available_quantity": self.available_quantity,
+            "item_count": self.item_count,
+        }
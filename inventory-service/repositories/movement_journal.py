@@ -0,0 +1,130 @@
+"""Append-only, indexed stock movement journal."""
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from models.stock_movement import StockMovement
+
+
+class MovementJournal:
+    """Append-only log of stock movements with secondary indexes.
+
+    Every movement gets a sequence number (its position in the log). The
+    per-item, per-warehouse and per-reference indexes hold ascending
+    sequence numbers. Each movement also gets a journal time: its
+    ``created_at``, raised if needed so journal times never decrease. Each
+    index is therefore time-ordered, so time ranges are found by binary
+    search and cursor pages are slices. A query costs O(log n) plus the
+    size of the page it returns.
+    """
+
+    def __init__(self):
+        self._movements: List[StockMovement] = []
+        self._times: List[datetime] = []
+        self._item_idx: Dict[str, List[int]] = {}
+        self._warehouse_idx: Dict[str, List[int]] = {}
+        self._reference_idx: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def append(self, movement: StockMovement) -> StockMovement:
+        with self._lock:
+            # Movements built concurrently can arrive a few microseconds out
+            # of order; journal time is record time, so keep it monotonic
+            # without touching the caller's movement.
+            recorded_at = movement.created_at
+            if self._times and recorded_at < self._times[-1]:
+                recorded_at = self._times[-1]
+            seq = len(self._movements)
+            # Append to the log before the indexes, so that every indexed
+            # sequence number is always readable by lock-free queries.
+            self._times.append(recorded_at)
+            self._movements.append(movement)
+            self._item_idx.setdefault(movement.inventory_item_id, []).append(seq)
+            self._warehouse_idx.setdefault(movement.warehouse_id, []).append(seq)
+            dest = movement.destination_warehouse_id
+            if dest and dest != movement.warehouse_id:
+                self._warehouse_idx.setdefault(dest, []).append(seq)
+            if movement.reference_id:
+                self._reference_idx.setdefault(movement.reference_id, []).append(seq)
+        return movement
+
+    def query(self, item_id: str = None, warehouse_id: str = None, reference_id: str = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None,
+              cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[StockMovement], Optional[str]]:
+        """Find movements in journal order.
+
+        ``start`` is inclusive and ``end`` exclusive, compared with journal time. Pass the returned
+        cursor back to get the next page; it is None on the last page.
+        """
+        if limit <= 0:
+            raise ValueError("Limit must be positive")
+        after = self._parse_cursor(cursor)
+
+        candidates = []
+        if item_id is not None:
+            candidates.append(self._item_idx.get(item_id, []))
+        if warehouse_id is not None:
+            candidates.append(self._warehouse_idx.get(warehouse_id, []))
+        if reference_id is not None:
+            candidates.append(self._reference_idx.get(reference_id, []))
+
+        times = self._times
+        size = len(times)  # snapshot, so concurrent appends don't leak in
+        if candidates:
+            # Walk the most selective index and check the other filters
+            seqs = min(candidates, key=len)
+            key = times.__getitem__
+            lo = bisect_left(seqs, start, key=key) if start is not None else 0
+            if after is not None:
+                lo = max(lo, bisect_right(seqs, after))
+            hi = bisect_left(seqs, end, key=key) if end is not None else len(seqs)
+            hi = min(hi, bisect_left(seqs, size))
+        else:
+            seqs = None
+            lo = bisect_left(times, start, 0, size) if start is not None else 0
+            if after is not None:
+                lo = max(lo, after + 1)
+            hi = bisect_left(times, end, 0, size) if end is not None else size
+
+        page = []
+        last_seq = None
+        movements = self._movements
+        for i in range(lo, hi):
+            seq = seqs[i] if seqs is not None else i
+            movement = movements[seq]
+            if ((item_id is None or movement.inventory_item_id == item_id)
+                    and (warehouse_id is None or warehouse_id in (
+                        movement.warehouse_id, movement.destination_warehouse_id))
+                    and (reference_id is None or movement.reference_id == reference_id)):
+                if len(page) == limit:
+                    return page, str(last_seq)
+                page.append(movement)
+                last_seq = seq
+        return page, None
+
+    def find_by_item(self, item_id: str) -> List[StockMovement]:
+        movements = self._movements
+        return [movements[seq] for seq in self._item_idx.get(item_id, [])]
+
+    def find_by_reference(self, reference_id: str) -> List[StockMovement]:
+        movements = self._movements
+        return [movements[seq] for seq in self._reference_idx.get(reference_id, [])]
+
+    def get_all(self) -> List[StockMovement]:
+        return list(self._movements)
+
+    def count(self) -> int:
+        return len(self._movements)
+
+    @staticmethod
+    def _parse_cursor(cursor: Optional[str]) -> Optional[int]:
+        if not cursor:
+            return None
+        try:
+            after = int(cursor)
+        except ValueError:
+            raise ValueError(f"Invalid cursor '{cursor}'")
+        if after < 0:
+            raise ValueError(f"Invalid cursor '{cursor}'")
+        return after
@@ -0,0 +1,83 @@
+"""In-memory ledger of open stock reservations."""
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from models.reservation import Reservation
+
+
+class ReservationLedger:
+    """Open reservations grouped by order.
+
+    ``claim`` and ``pop_order`` are atomic, so an order can only be reserved
+    once, and confirming, releasing and expiring the same order cannot both
+    succeed.
+    """
+
+    def __init__(self):
+        self._orders: Dict[str, Optional[List[Reservation]]] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, order_id: str) -> bool:
+        """Reserve the order id while its stock is being reserved; False if taken."""
+        with self._lock:
+            if order_id in self._orders:
+                return False
+            self._orders[order_id] = None
+            return True
+
+    def unclaim(self, order_id: str):
+        with self._lock:
+            if self._orders.get(order_id, ()) is None:
+                del self._orders[order_id]
+
+    def add(self, order_id: str, reservations: List[Reservation]):
+        with self._lock:
+            self._orders[order_id] = reservations
+
+    def find_by_order(self, order_id: str) -> List[Reservation]:
+        return list(self._orders.get(order_id) or [])
+
+    def extend(self, order_id: str, expires_at: datetime) -> List[Reservation]:
+        """Move an open order's expiry, returning its reservations (empty if none are open)."""
+        with self._lock:
+            reservations = self._orders.get(order_id)
+            if not reservations:
+                return []
+            for reservation in reservations:
+                reservation.expires_at = expires_at
+            return list(reservations)
+
+    def pop_expired(self, order_id: str, now: datetime) -> List[Reservation]:
+        """Remove an order's reservations only if they have expired by ``now``."""
+        with self._lock:
+            reservations = self._orders.get(order_id)
+            if not reservations or reservations[0].expires_at > now:
+                return []
+            del self._orders[order_id]
+            return reservations
+
+    def take(self, order_id: str) -> List[Reservation]:
+        """Remove an order's reservations but keep the order id claimed.
+
+        Finish with ``unclaim`` once the reservations are settled, or put
+        them back with ``add`` if settling them failed.
+        """
+        with self._lock:
+            reservations = self._orders.get(order_id)
+            if not reservations:
+                return []
+            self._orders[order_id] = None
+            return reservations
+
+    def pop_order(self, order_id: str) -> List[Reservation]:
+        """Remove an order's reservations, returning them (empty if none are open)."""
+        with self._lock:
+            reservations = self._orders.get(order_id)
+            if not reservations:
+                return []
+            del self._orders[order_id]
+            return reservations
+
+    def count(self) -> int:
+        return sum(1 for r in self._orders.values() if r)
@@ -1,45 +1,211 @@
 """In-memory stock repository."""
-from typing import Dict, List, Optional
+import threading
+from itertools import islice
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from models.inventory_item import InventoryItem
+from models.stock_totals import StockTotals
+from utils.sequence_index import SequenceIndex
+
+
+class _Counted(NamedTuple):
+    """An item's keys and levels as last added to the running totals."""
+    product_id: str
+    warehouse_id: str
+    sku: str
+    quantity: int
+    reserved_quantity: int
+    available_quantity: int
 
 
 class StockRepository:
     def __init__(self):
+        self._lock = threading.Lock()
         self._items: Dict[str, InventoryItem] = {}
-        self._product_idx: Dict[str, List[str]] = {}
-        self._warehouse_idx: Dict[str, List[str]] = {}
+        # Every item gets a sequence number, which orders listings and is
+        # the pagination cursor. The global listing and the per-product and
+        # per-warehouse indexes are kept in sequence order.
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._ordered = SequenceIndex()
+        self._product_idx: Dict[str, SequenceIndex] = {}
+        self._warehouse_idx: Dict[str, SequenceIndex] = {}
         self._sku_warehouse_idx: Dict[str, str] = {}  # "sku:warehouse_id" -> item_id
+        # Maintained on every save/delete so stock-level queries are O(result).
+        # Dicts are used as insertion-ordered sets to give pages a stable order.
+        self._low_stock_ids: Dict[str, None] = {}
+        self._out_of_stock_ids: Dict[str, None] = {}
+        # Running totals, updated by deltas. Each item's last counted levels
+        # are kept because callers may mutate a stored item before saving it,
+        # so its old levels cannot be read back from the item itself.
+        self._product_totals: Dict[str, StockTotals] = {}
+        self._warehouse_totals: Dict[str, StockTotals] = {}
+        self._sku_totals: Dict[str, StockTotals] = {}
+        # product id / SKU -> warehouse id -> totals, for availability breakdowns
+        self._product_warehouse_totals: Dict[str, Dict[str, StockTotals]] = {}
+        self._sku_warehouse_totals: Dict[str, Dict[str, StockTotals]] = {}
+        self._counted: Dict[str, _Counted] = {}
+        self._listeners: List[Callable[[str], None]] = []
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """Call ``listener(item_id)`` after every save or delete of an item.
+
+        Listeners run on the writer's thread, so they must be cheap (e.g.
+        mark the item dirty for later processing).
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, item_ids: List[str]):
+        for listener in self._listeners:
+            for item_id in item_ids:
+                listener(item_id)
 
     def save(self, item: InventoryItem) -> InventoryItem:
+        """Insert a new item, or store ``item`` over the version it was read at.
+
+        Saving an existing item is checked like ``compare_and_save`` against
+        the version ``item`` carries, so a plain save raises ValueError rather
+        than overwrite a concurrent write.
+        """
+        with self._lock:
+            current = self._items.get(item.id)
+            if current is None:
+                self._store(item, item.version)
+            elif current.version != item.version:
+                raise ValueError(f"Inventory item '{item.id}' was modified concurrently")
+            else:
+                self._store(item, item.version + 1)
+        self._notify([item.id])
+        return item
+
+    def compare_and_save(self, item: InventoryItem, expected_version: int) -> bool:
+        """Store ``item`` only if the stored copy is still at ``expected_version``.
+
+        ``item`` must be a copy, not the stored object. Returns False, storing
+        nothing, if another writer saved the item in the meantime.
+        """
+        with self._lock:
+            current = self._items.get(item.id)
+            if current is None or current.version != expected_version:
+                return False
+            self._store(item, expected_version + 1)
+        self._notify([item.id])
+        return True
+
+    def compare_and_save_many(self, items: List[InventoryItem], expected_versions: List[int]) -> bool:
+        """Store several item copies atomically, only if none was saved since it was read."""
+        with self._lock:
+            for item, expected in zip(items, expected_versions):
+                current = self._items.get(item.id)
+                if current is None or current.version != expected:
+                    return False
+            for item, expected in zip(items, expected_versions):
+                self._store(item, expected + 1)
+        self._notify([item.id for item in items])
+        return True
+
+    def _store(self, item: InventoryItem, version: int) -> InventoryItem:
+        # Caller holds the lock
         key = f"{item.sku}:{item.warehouse_id}"
         if key in self._sku_warehouse_idx and self._sku_warehouse_idx[key] != item.id:
             raise ValueError(f"Item with SKU '{item.sku}' already exists in warehouse '{item.warehouse_id}'")
 
+        item.version = version
+
         self._items[item.id] = item
         self._sku_warehouse_idx[key] = item.id
 
-        if item.product_id not in self._product_idx:
-            self._product_idx[item.product_id] = []
-        if item.id not in self._product_idx[item.product_id]:
-            self._product_idx[item.product_id].append(item.id)
+        self._track(self._low_stock_ids, item.id, item.is_low_stock)
+        self._track(self._out_of_stock_ids, item.id, item.is_out_of_stock)
+        previous = self._uncount(item.id)
+        if previous is None:
+            self._sequence(item)
+        else:
+            if previous.sku != item.sku or previous.warehouse_id != item.warehouse_id:
+                self._sku_warehouse_idx.pop(f"{previous.sku}:{previous.warehouse_id}", None)
+            if (previous.product_id, previous.warehouse_id) != (item.product_id, item.warehouse_id):
+                # Re-sequence, so that every index stays in ascending sequence order
+                self._unsequence(item.id, previous)
+                self._sequence(item)
+        counted = _Counted(item.product_id, item.warehouse_id, item.sku,
+                           item.quantity, item.reserved_quantity, item.available_quantity)
+        self._counted[item.id] = counted
+        self._count(counted, 1)
+        return item
 
-        if item.warehouse_id not in self._warehouse_idx:
-            self._warehouse_idx[item.warehouse_id] = []
-        if item.id not in self._warehouse_idx[item.warehouse_id]:
-            self._warehouse_idx[item.warehouse_id].append(item.id)
+    def _sequence(self, item: InventoryItem):
+        # Caller holds the lock
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq[item.id] = seq
+        self._ordered.append(seq, item.id)
+        self._product_idx.setdefault(item.product_id, SequenceIndex()).append(seq, item.id)
+        self._warehouse_idx.setdefault(item.warehouse_id, SequenceIndex()).append(seq, item.id)
 
-        return item
+    def _unsequence(self, item_id: str, counted: _Counted):
+        # Caller holds the lock. Uses the keys the item was indexed under.
+        seq = self._seq.pop(item_id)
+        self._ordered.remove(seq)
+        self._unindex(self._product_idx, counted.product_id, seq)
+        self._unindex(self._warehouse_idx, counted.warehouse_id, seq)
+
+    def _uncount(self, item_id: str) -> Optional[_Counted]:
+        # Caller holds the lock
+        counted = self._counted.pop(item_id, None)
+        if counted is not None:
+            self._count(counted, -1)
+        return counted
+
+    @staticmethod
+    def _unindex(index: Dict[str, SequenceIndex], key: str, seq: int):
+        # Caller holds the lock
+        ids = index.get(key)
+        if ids is not None:
+            ids.remove(seq)
+            if not ids:
+                del index[key]
+
+    def _count(self, counted: _Counted, sign: int):
+        # Caller holds the lock
+        levels = counted[3:]
+        for totals, key in ((self._product_totals, counted.product_id),
+                            (self._warehouse_totals, counted.warehouse_id),
+                            (self._sku_totals, counted.sku)):
+            self._add_levels(totals, key, levels, sign)
+        for nested, key in ((self._product_warehouse_totals, counted.product_id),
+                            (self._sku_warehouse_totals, counted.sku)):
+            totals = nested.setdefault(key, {})
+            self._add_levels(totals, counted.warehouse_id, levels, sign)
+            if not totals:
+                del nested[key]
+
+    @staticmethod
+    def _add_levels(totals: Dict[str, StockTotals], key: str, levels: Tuple[int, int, int], sign: int):
+        # Caller holds the lock
+        entry = totals.get(key)
+        if entry is None:
+            entry = totals[key] = StockTotals()
+        entry.add(*levels, sign=sign)
+        if entry.item_count == 0:
+            del totals[key]
+
+    @staticmethod
+    def _track(ids: Dict[str, None], item_id: str, member: bool):
+        if member:
+            ids[item_id] = None
+        else:
+            ids.pop(item_id, None)
 
     def find_by_id(self, item_id: str) -> Optional[InventoryItem]:
         return self._items.get(item_id)
 
     def find_by_product(self, product_id: str) -> List[InventoryItem]:
-        ids = self._product_idx.get(product_id, [])
-        return [self._items[i] for i in ids if i in self._items]
+        with self._lock:
+            return [self._items[i] for i in self._product_idx.get(product_id, ())]
 
     def find_by_warehouse(self, warehouse_id: str) -> List[InventoryItem]:
-        ids = self._warehouse_idx.get(warehouse_id, [])
-        return [self._items[i] for i in ids if i in self._items]
+        with self._lock:
+            return [self._items[i] for i in self._warehouse_idx.get(warehouse_id, ())]
 
     def find_by_sku_and_warehouse(self, sku: str, warehouse_id: str) -> Optional[InventoryItem]:
         key = f"{sku}:{warehouse_id}"
@@ -48,25 +214,128 @@ class StockRepository:
             return self._items.get(item_id)
         return None
 
-    def find_low_stock(self) -> List[InventoryItem]:
-        return [item for item in self._items.values() if item.is_low_stock]
+    def find_low_stock(self, skip: int = 0, limit: Optional[int] = None) -> List[InventoryItem]:
+        return self._page(self._low_stock_ids, skip, limit)
+
+    def find_out_of_stock(self, skip: int = 0, limit: Optional[int] = None) -> List[InventoryItem]:
+        return self._page(self._out_of_stock_ids, skip, limit)
+
+    def count_low_stock(self) -> int:
+        return len(self._low_stock_ids)
 
-    def find_out_of_stock(self) -> List[InventoryItem]:
-        return [item for item in self._items.values() if item.is_out_of_stock]
+    def count_out_of_stock(self) -> int:
+        return len(self._out_of_stock_ids)
+
+    def _page(self, ids: Dict[str, None], skip: int, limit: Optional[int]) -> List[InventoryItem]:
+        end = None if limit is None else skip + limit
+        with self._lock:
+            return [self._items[i] for i in islice(ids, skip, end)]
 
     def delete(self, item_id: str) -> bool:
-        item = self._items.get(item_id)
-        if not item:
-            return False
-        del self._items[item_id]
-        key = f"{item.sku}:{item.warehouse_id}"
-        self._sku_warehouse_idx.pop(key, None)
+        with self._lock:
+            item = self._items.get(item_id)
+            if not item:
+                return False
+            del self._items[item_id]
+            self._low_stock_ids.pop(item_id, None)
+            self._out_of_stock_ids.pop(item_id, None)
+            # Unindex by the keys as stored; the item may have been mutated since
+            counted = self._uncount(item_id)
+            self._sku_warehouse_idx.pop(f"{counted.sku}:{counted.warehouse_id}", None)
+            self._unsequence(item_id, counted)
+        self._notify([item_id])
         return True
 
+    def query(self, warehouse_id: str = None, product_id: str = None,
+              cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[InventoryItem], Optional[str]]:
+        """Page through items in listing order, optionally by warehouse and/or product.
+
+        Pass the returned cursor back to get the next page; it is None on the
+        last page. Cursors stay valid across concurrent writes. The cursor
+        is found by binary search in the most selective index, so a page
+        costs O(log n + page) however deep into the listing it is.
+        """
+        if limit <= 0:
+            raise ValueError("Limit must be positive")
+        after = self._parse_cursor(cursor)
+        page = []
+        with self._lock:
+            indexes = []
+            if warehouse_id is not None:
+                indexes.append(self._warehouse_idx.get(warehouse_id, SequenceIndex()))
+            if product_id is not None:
+                indexes.append(self._product_idx.get(product_id, SequenceIndex()))
+            walk = min(indexes, key=len) if indexes else self._ordered
+            counted = self._counted
+            for seq, item_id in walk.after(after):
+                keys = counted[item_id]
+                if ((warehouse_id is None or keys.warehouse_id == warehouse_id)
+                        and (product_id is None or keys.product_id == product_id)):
+                    page.append((seq, item_id))
+                    if len(page) > limit:
+                        break
+            next_cursor = None
+            if len(page) > limit:
+                page.pop()
+                next_cursor = str(page[-1][0])
+            return [self._items[item_id] for _, item_id in page], next_cursor
+
+    @staticmethod
+    def _parse_cursor(cursor: Optional[str]) -> int:
+        if not cursor:
+            return -1
+        try:
+            after = int(cursor)
+        except ValueError:
+            raise ValueError(f"Invalid cursor '{cursor}'")
+        if after < 0:
+            raise ValueError(f"Invalid cursor '{cursor}'")
+        return after
+
     def get_all(self) -> List[InventoryItem]:
         return list(self._items.values())
 
     def get_total_quantity(self, product_id: str) -> int:
-        items = self.find_by_product(product_id)
-        return sum(item.available_quantity for item in items)
+        return self.get_product_totals(product_id).available_quantity
+
+    def get_product_totals(self, product_id: str) -> StockTotals:
+        return self._totals(self._product_totals, product_id)
+
+    def get_warehouse_totals(self, warehouse_id: str) -> StockTotals:
+        return self._totals(self._warehouse_totals, warehouse_id)
+
+    def get_available(self, keys: Iterable[str], by_sku: bool = False) -> Dict[str, int]:
+        """Available quantity per product id (or per SKU), read in one pass.
+
+        Unknown keys map to 0.
+        """
+        totals = self._sku_totals if by_sku else self._product_totals
+        result = {}
+        with self._lock:
+            for key in keys:
+                entry = totals.get(key)
+                result[key] = entry.available_quantity if entry is not None else 0
+        return result
+
+    def get_available_by_warehouse(self, keys: Iterable[str],
+                                   by_sku: bool = False) -> Dict[str, Dict[str, int]]:
+        """Available quantity per warehouse for each product id (or SKU)."""
+        nested = self._sku_warehouse_totals if by_sku else self._product_warehouse_totals
+        empty = {}
+        result = {}
+        with self._lock:
+            for key in keys:
+                result[key] = {warehouse_id: totals.available_quantity
+                               for warehouse_id, totals in nested.get(key, empty).items()}
+        return result
+
+    def get_all_warehouse_totals(self) -> Dict[str, StockTotals]:
+        with self._lock:
+            return {key: replace(totals) for key, totals in self._warehouse_totals.items()}
+
+    def _totals(self, totals: Dict[str, StockTotals], key: str) -> StockTotals:
+        # Copy under the lock so callers never see a half-applied delta
+        with self._lock:
+            entry = totals.get(key)
+            return replace(entry) if entry is not None else StockTotals()
 
@@ -0,0 +1,50 @@
+"""Stock alert route handlers."""
+from flask import Blueprint, request, jsonify
+
+from routes import dependencies
+from routes.pagination import bool_arg, offset_page, page_limit
+
+alert_bp = Blueprint("alert", __name__)
+
+
+@alert_bp.route("/", methods=["GET"])
+def list_alerts():
+    """List alerts, filtered by ``type``, ``acknowledged`` and ``resolved``.
+
+    Stock changes are only evaluated by ``POST /alerts/check``;
+    ``pending_changes`` counts the items waiting for it.
+    """
+    service = dependencies.alert_service
+    alerts = service.get_alerts(
+        alert_type=request.args.get("type"),
+        acknowledged=bool_arg("acknowledged"),
+        resolved=bool_arg("resolved"),
+    )
+    try:
+        page, next_cursor = offset_page(lambda skip, limit: alerts[skip:skip + limit], page_limit())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "alerts": [a.to_dict() for a in page],
+        "next_cursor": next_cursor,
+        "pending_changes": service.pending_count(),
+    })
+
+
+@alert_bp.route("/check", methods=["POST"])
+def check_alerts():
+    """Evaluate pending stock changes and return the alerts they opened."""
+    alerts = dependencies.alert_service.check_stock_levels()
+    return jsonify({"alerts": [a.to_dict() for a in alerts]})
+
+
+@alert_bp.route("/<alert_id>/acknowledge", methods=["POST"])
+def acknowledge_alert(alert_id):
+    if not dependencies.alert_service.acknowledge_alert(alert_id):
+        return jsonify({"error": f"Alert '{alert_id}' not found"}), 404
+    return jsonify({"id": alert_id, "acknowledged": True})
+
+
+@alert_bp.route("/reorder-suggestions", methods=["GET"])
+def reorder_suggestions():
+    return jsonify({"suggestions": dependencies.alert_service.get_reorder_suggestions()})
@@ -0,0 +1,19 @@
+"""Shared repository and service instances for the route blueprints.
+
+Every blueprint must see the same repositories; otherwise stock received
+through ``/stock`` would never show up in ``/movements``.
+"""
+from repositories.movement_journal import MovementJournal
+from repositories.stock_repository import StockRepository
+from repositories.warehouse_repository import WarehouseRepository
+from services.alert_service import AlertService
+from services.stock_service import StockService
+from services.warehouse_service import WarehouseService
+
+stock_repo = StockRepository()
+warehouse_repo = WarehouseRepository()
+movement_journal = MovementJournal()
+
+stock_service = StockService(stock_repo, warehouse_repo, movement_journal)
+warehouse_service = WarehouseService(warehouse_repo, stock_repo)
+alert_service = AlertService(stock_repo)
@@ -1,10 +1,49 @@
 """Stock movement route handlers."""
+from datetime import datetime, timezone
+
 from flask import Blueprint, request, jsonify
 
+from routes import dependencies
+from routes.pagination import page_limit
+
 movement_bp = Blueprint("movement", __name__)
 
 
+def _parse_time(name: str):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be an ISO 8601 timestamp")
+    # Movements are stamped in naive UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 @movement_bp.route("/", methods=["GET"])
 def list_movements():
-    return jsonify({"movements": [], "message": "Movement listing endpoint"})
+    """List movements oldest first, filtered by item, warehouse, reference and time range.
 
+    ``from`` is inclusive and ``to`` exclusive. Follow ``next_cursor`` for
+    the next page.
+    """
+    try:
+        limit = page_limit()
+        movements, next_cursor = dependencies.stock_service.query_movements(
+            item_id=request.args.get("item_id"),
+            warehouse_id=request.args.get("warehouse_id"),
+            reference_id=request.args.get("reference_id"),
+            start=_parse_time("from"),
+            end=_parse_time("to"),
+            cursor=request.args.get("cursor"),
+            limit=limit,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "movements": [m.to_dict() for m in movements],
+        "next_cursor": next_cursor,
+    })
@@ -0,0 +1,59 @@
+"""Query-string and request-body helpers shared by the route blueprints."""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import request
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def page_limit() -> int:
+    value = request.args.get("limit")
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("'limit' must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def bool_arg(name: str) -> Optional[bool]:
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    return value.lower() in ("1", "true", "yes")
+
+
+def json_body() -> Dict[str, Any]:
+    """The request's JSON object; an empty or missing body counts as ``{}``."""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    return data
+
+
+def bool_field(data: Dict[str, Any], name: str) -> bool:
+    value = data.get(name, False)
+    if not isinstance(value, bool):
+        raise ValueError(f"'{name}' must be true or false")
+    return value
+
+
+def offset_page(fetch: Callable[[int, int], List], limit: int) -> Tuple[List, Optional[str]]:
+    """Page a listing whose cursor is an offset; ``fetch(skip, limit)`` returns a slice."""
+    cursor = request.args.get("cursor")
+    try:
+        skip = int(cursor) if cursor else 0
+    except ValueError:
+        skip = -1
+    if skip < 0:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    page = fetch(skip, limit + 1)
+    if len(page) > limit:
+        return page[:limit], str(skip + limit)
+    return page, None
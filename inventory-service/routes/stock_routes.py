@@ -1,15 +1,295 @@
 """Stock route handlers."""
-from flask import Blueprint, request, jsonify
+import json
+import uuid
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+
+from routes import dependencies
+from routes.pagination import bool_arg, bool_field, json_body, offset_page, page_limit
+from services.stock_service import ConcurrentUpdateError, ReservationNotFoundError
 
 stock_bp = Blueprint("stock", __name__)
 
+STREAM_BATCH_SIZE = 1000
+
 
 @stock_bp.route("/", methods=["GET"])
 def list_stock():
-    return jsonify({"items": [], "message": "Stock listing endpoint"})
+    """List items, optionally by ``warehouse_id`` and/or ``product_id``.
+
+    Follow ``next_cursor`` for the next page. With ``stream=1`` every
+    matching item is streamed as JSON lines instead, for exports.
+    """
+    warehouse_id = request.args.get("warehouse_id")
+    product_id = request.args.get("product_id")
+    if bool_arg("stream"):
+        return _stream_items(warehouse_id, product_id)
+    try:
+        items, next_cursor = dependencies.stock_service.query_items(
+            warehouse_id=warehouse_id,
+            product_id=product_id,
+            cursor=request.args.get("cursor"),
+            limit=page_limit(),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"items": [item.to_dict() for item in items], "next_cursor": next_cursor})
+
+
+def _stream_items(warehouse_id, product_id):
+    batches = dependencies.stock_service.iter_items(
+        warehouse_id=warehouse_id, product_id=product_id, batch_size=STREAM_BATCH_SIZE,
+    )
+
+    def generate():
+        # One chunk per batch: few enough writes to be fast, small enough
+        # that memory stays flat however many items there are.
+        for batch in batches:
+            yield "".join(json.dumps(item.to_dict()) + "\n" for item in batch)
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@stock_bp.route("/", methods=["POST"])
+def add_item():
+    try:
+        data = json_body()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    missing = [name for name in ("product_id", "sku", "warehouse_id") if not data.get(name)]
+    if missing:
+        return jsonify({"error": f"Missing required fields: {', '.join(missing)}"}), 400
+    try:
+        item = dependencies.stock_service.add_inventory_item(
+            product_id=data.get("product_id"),
+            sku=data.get("sku"),
+            warehouse_id=data.get("warehouse_id"),
+            quantity=int(data.get("quantity", 0)),
+            reorder_point=int(data.get("reorder_point", 10)),
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(item.to_dict()), 201
+
+
+def _stock_level_page(fetch):
+    try:
+        items, next_cursor = offset_page(fetch, page_limit())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"items": [item.to_dict() for item in items], "next_cursor": next_cursor})
+
+
+@stock_bp.route("/low-stock", methods=["GET"])
+def list_low_stock():
+    return _stock_level_page(dependencies.stock_service.get_low_stock_items)
+
+
+@stock_bp.route("/out-of-stock", methods=["GET"])
+def list_out_of_stock():
+    return _stock_level_page(dependencies.stock_service.get_out_of_stock_items)
+
+
+def _hold_seconds(data: dict):
+    value = data.get("hold_seconds")
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("'hold_seconds' must be a number")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("'hold_seconds' must be a number")
+
+
+def _order_lines(data: dict) -> list:
+    order_id = data.get("order_id")
+    if not isinstance(order_id, str) or not order_id:
+        raise ValueError("'order_id' must be a non-empty string")
+    items = data.get("items") or []
+    if not isinstance(items, list):
+        raise ValueError("'items' must be a list")
+    lines = []
+    for line in items:
+        item_id = line.get("item_id") if isinstance(line, dict) else None
+        quantity = line.get("quantity") if isinstance(line, dict) else None
+        # bool is an int subclass, but true/false is never a quantity
+        if (not isinstance(item_id, str) or not item_id
+                or not isinstance(quantity, int) or isinstance(quantity, bool)):
+            raise ValueError("Each item needs a string 'item_id' and an integer 'quantity'")
+        lines.append((item_id, quantity))
+    return lines
+
+
+def _reservations_response(order_id: str, reservations: list):
+    return jsonify({"order_id": order_id, "reservations": [r.to_dict() for r in reservations]})
+
+
+@stock_bp.route("/reservations", methods=["POST"])
+def reserve_order():
+    """Reserve all lines of an order atomically.
+
+    Body: {"order_id", "items": [{"item_id", "quantity"}], "hold_seconds"?}
+    """
+    try:
+        data = json_body()
+        lines = _order_lines(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    service = dependencies.stock_service
+    try:
+        items = service.reserve_order(data.get("order_id"), lines, hold_seconds=_hold_seconds(data))
+    except ConcurrentUpdateError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    reservations = service.get_reservations(data["order_id"])
+    return jsonify({
+        "order_id": data["order_id"],
+        "expires_at": reservations[0].expires_at.isoformat() if reservations else None,
+        "items": [item.to_dict() for item in items],
+    }), 201
+
+
+@stock_bp.route("/reservations/<order_id>", methods=["GET"])
+def get_reservations(order_id):
+    reservations = dependencies.stock_service.get_reservations(order_id)
+    if not reservations:
+        return jsonify({"error": f"No open reservation for order '{order_id}'"}), 404
+    return _reservations_response(order_id, reservations)
+
+
+@stock_bp.route("/reservations/<order_id>/extend", methods=["POST"])
+def extend_reservation(order_id):
+    try:
+        hold_seconds = _hold_seconds(json_body())
+        reservations = dependencies.stock_service.extend_reservation(order_id, hold_seconds)
+    except ReservationNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return _reservations_response(order_id, reservations)
+
+
+@stock_bp.route("/reservations/<order_id>/confirm", methods=["POST"])
+def confirm_reservation(order_id):
+    """Ship the order's held stock."""
+    try:
+        reservations = dependencies.stock_service.confirm_reservation(order_id)
+    except ReservationNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ConcurrentUpdateError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return _reservations_response(order_id, reservations)
+
+
+@stock_bp.route("/reservations/<order_id>", methods=["DELETE"])
+def release_order(order_id):
+    try:
+        reservations = dependencies.stock_service.release_order(order_id)
+    except ReservationNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    return _reservations_response(order_id, reservations)
+
+
+@stock_bp.route("/availability", methods=["POST"])
+def bulk_availability():
+    """Available quantity for many products or SKUs in one call.
+
+    Body: {"product_ids": [...]} or {"skus": [...]}, plus "by_warehouse"?
+    """
+    try:
+        data = json_body()
+        availability = dependencies.stock_service.get_availability(
+            product_ids=data.get("product_ids"),
+            skus=data.get("skus"),
+            by_warehouse=bool_field(data, "by_warehouse"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"availability": availability})
+
+
+@stock_bp.route("/products/<product_id>", methods=["GET"])
+def get_product_availability(product_id):
+    totals = dependencies.stock_service.get_product_totals(product_id)
+    return jsonify({"product_id": product_id, **totals.to_dict()})
 
 
 @stock_bp.route("/<item_id>", methods=["GET"])
 def get_stock(item_id):
-    return jsonify({"item_id": item_id, "message": "Stock item endpoint"})
+    item = dependencies.stock_service.get_item(item_id)
+    if not item:
+        return jsonify({"error": f"Inventory item '{item_id}' not found"}), 404
+    return jsonify(item.to_dict())
+
+
+def _quantity(data: dict, name: str = "quantity") -> int:
+    try:
+        return int(data[name])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an integer")
+
+
+def _update_stock(item_id: str, update):
+    service = dependencies.stock_service
+    if not service.get_item(item_id):
+        return jsonify({"error": f"Inventory item '{item_id}' not found"}), 404
+    try:
+        item = update(service, json_body())
+    except ConcurrentUpdateError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(item.to_dict())
+
+
+@stock_bp.route("/<item_id>/receive", methods=["POST"])
+def receive_stock(item_id):
+    return _update_stock(item_id, lambda service, data: service.receive_stock(
+        item_id, _quantity(data), reference_id=data.get("reference_id", "")))
+
+
+@stock_bp.route("/<item_id>/ship", methods=["POST"])
+def ship_stock(item_id):
+    return _update_stock(item_id, lambda service, data: service.ship_stock(
+        item_id, _quantity(data), reference_id=data.get("reference_id", ""),
+        from_reserved=bool_field(data, "from_reserved")))
+
+
+@stock_bp.route("/<item_id>/reserve", methods=["POST"])
+def reserve_stock(item_id):
+    """Hold stock of a single item under a generated order id.
+
+    Kept for older clients; the hold is an ordinary order reservation with
+    the default expiry, so release or confirm it through
+    ``/stock/reservations/<order_id>`` rather than ``/<item_id>/release``.
+    """
+    service = dependencies.stock_service
+    if not service.get_item(item_id):
+        return jsonify({"error": f"Inventory item '{item_id}' not found"}), 404
+    order_id = f"item-{item_id}-{uuid.uuid4().hex}"
+    try:
+        (item,) = service.reserve_order(order_id, [(item_id, _quantity(json_body()))])
+    except ConcurrentUpdateError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    (reservation,) = service.get_reservations(order_id)
+    return jsonify({**item.to_dict(), "order_id": order_id,
+                    "expires_at": reservation.expires_at.isoformat()})
+
+
+@stock_bp.route("/<item_id>/release", methods=["POST"])
+def release_stock(item_id):
+    return _update_stock(item_id, lambda service, data: service.release_reservation(
+        item_id, _quantity(data)))
+
 
+@stock_bp.route("/<item_id>/adjust", methods=["POST"])
+def adjust_stock(item_id):
+    return _update_stock(item_id, lambda service, data: service.adjust_stock(
+        item_id, _quantity(data), notes=data.get("notes", "")))
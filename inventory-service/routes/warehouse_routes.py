@@ -1,15 +1,112 @@
 """Warehouse route handlers."""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify
+
+from routes import dependencies
+from routes.pagination import bool_arg, json_body, offset_page, page_limit
 
 warehouse_bp = Blueprint("warehouse", __name__)
 
+UPDATABLE_FIELDS = ("name", "address", "city", "state", "country", "capacity")
+
+
+def _not_found(warehouse_id):
+    return jsonify({"error": f"Warehouse '{warehouse_id}' not found"}), 404
+
 
 @warehouse_bp.route("/", methods=["GET"])
 def list_warehouses():
-    return jsonify({"warehouses": [], "message": "Warehouse listing endpoint"})
+    warehouses = dependencies.warehouse_service.list_warehouses(active_only=bool(bool_arg("active_only")))
+    try:
+        page, next_cursor = offset_page(lambda skip, limit: warehouses[skip:skip + limit], page_limit())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"warehouses": [w.to_dict() for w in page], "next_cursor": next_cursor})
+
+
+@warehouse_bp.route("/", methods=["POST"])
+def create_warehouse():
+    try:
+        data = json_body()
+        warehouse = dependencies.warehouse_service.create_warehouse(
+            name=data.get("name"),
+            code=data.get("code"),
+            address=data.get("address", ""),
+            city=data.get("city", ""),
+            state=data.get("state", ""),
+            country=data.get("country", "US"),
+            capacity=int(data.get("capacity", 10000)),
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(warehouse.to_dict()), 201
+
+
+@warehouse_bp.route("/utilization", methods=["GET"])
+def utilization_report():
+    report = dependencies.warehouse_service.get_utilization_report(active_only=bool(bool_arg("active_only")))
+    return jsonify({"warehouses": report})
 
 
 @warehouse_bp.route("/<warehouse_id>", methods=["GET"])
 def get_warehouse(warehouse_id):
-    return jsonify({"warehouse_id": warehouse_id, "message": "Warehouse detail endpoint"})
+    warehouse = dependencies.warehouse_service.get_warehouse(warehouse_id)
+    if not warehouse:
+        return _not_found(warehouse_id)
+    return jsonify(warehouse.to_dict())
+
+
+@warehouse_bp.route("/<warehouse_id>", methods=["PATCH"])
+def update_warehouse(warehouse_id):
+    try:
+        data = json_body()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    updates = {key: data.get(key) for key in UPDATABLE_FIELDS}
+    if updates["capacity"] is not None:
+        try:
+            updates["capacity"] = int(updates["capacity"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "'capacity' must be an integer"}), 400
+        if updates["capacity"] <= 0:
+            return jsonify({"error": "Capacity must be positive"}), 400
+    warehouse = dependencies.warehouse_service.update_warehouse(warehouse_id, **updates)
+    if not warehouse:
+        return _not_found(warehouse_id)
+    return jsonify(warehouse.to_dict())
+
+
+@warehouse_bp.route("/<warehouse_id>", methods=["DELETE"])
+def delete_warehouse(warehouse_id):
+    try:
+        deleted = dependencies.warehouse_service.delete_warehouse(warehouse_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not deleted:
+        return _not_found(warehouse_id)
+    return "", 204
+
+
+@warehouse_bp.route("/<warehouse_id>/activate", methods=["POST"])
+def activate_warehouse(warehouse_id):
+    if not dependencies.warehouse_service.activate_warehouse(warehouse_id):
+        return _not_found(warehouse_id)
+    return jsonify(dependencies.warehouse_service.get_warehouse(warehouse_id).to_dict())
+
+
+@warehouse_bp.route("/<warehouse_id>/deactivate", methods=["POST"])
+def deactivate_warehouse(warehouse_id):
+    try:
+        deactivated = dependencies.warehouse_service.deactivate_warehouse(warehouse_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not deactivated:
+        return _not_found(warehouse_id)
+    return jsonify(dependencies.warehouse_service.get_warehouse(warehouse_id).to_dict())
+
 
+@warehouse_bp.route("/<warehouse_id>/utilization", methods=["GET"])
+def get_warehouse_utilization(warehouse_id):
+    try:
+        return jsonify(dependencies.warehouse_service.get_warehouse_utilization(warehouse_id))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
@@ -1,12 +1,16 @@
 """Alert service - monitors stock levels and generates alerts."""
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
+import threading
 import uuid
 
 from models.inventory_item import InventoryItem
 from repositories.stock_repository import StockRepository
 
+ALERT_TYPES = ("out_of_stock", "low_stock", "overstock")
+
 
 @dataclass
 class StockAlert:
@@ -21,6 +25,11 @@ class StockAlert:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = field(default_factory=datetime.utcnow)
     acknowledged: bool = False
+    resolved_at: Optional[datetime] = None
+
+    @property
+    def is_resolved(self) -> bool:
+        return self.resolved_at is not None
 
     def to_dict(self) -> dict:
         return {
@@ -35,53 +44,77 @@ class StockAlert:
             "message": self.message,
             "created_at": self.created_at.isoformat(),
             "acknowledged": self.acknowledged,
+            "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None,
         }
 
 
 class AlertService:
-    def __init__(self, stock_repo: StockRepository):
+    """Raises stock alerts when items cross their thresholds.
+
+    The stock repository reports every saved or deleted item id, which is
+    queued as dirty; ``check_stock_levels`` evaluates only the queued items.
+    Each (item, alert type) has at most one open alert: it is opened when
+    the item crosses into the condition and resolved when the item recovers
+    (or is deleted). Only the newest ``max_resolved_alerts`` resolved
+    alerts are retained.
+    """
+
+    def __init__(self, stock_repo: StockRepository, max_resolved_alerts: int = 1000):
         self._stock_repo = stock_repo
+        self._max_resolved_alerts = max_resolved_alerts
         self._alerts: Dict[str, StockAlert] = {}
+        self._open: Dict[Tuple[str, str], str] = {}  # (item_id, alert_type) -> alert_id
+        self._resolved: "OrderedDict[str, None]" = OrderedDict()  # alert ids, oldest first
+        self._dirty: Dict[str, None] = {}  # dict as an ordered set of item ids
+        self._dirty_lock = threading.Lock()
+        self._lock = threading.Lock()
+        stock_repo.add_listener(self._mark_dirty)
+        for item in stock_repo.get_all():
+            self._mark_dirty(item.id)
 
     def check_stock_levels(self) -> List[StockAlert]:
-        """Scan all inventory and generate alerts for low/out of stock items."""
-        new_alerts = []
+        """Evaluate items changed since the last check.
 
-        all_items = self._stock_repo.get_all()
-        for item in all_items:
-            if item.is_out_of_stock:
-                alert = self._create_alert(
-                    item,
-                    "out_of_stock",
-                    f"CRITICAL: {item.sku} is out of stock in warehouse {item.warehouse_id}",
-                )
-                new_alerts.append(alert)
-            elif item.is_low_stock:
-                alert = self._create_alert(
-                    item,
-                    "low_stock",
-                    f"WARNING: {item.sku} is low on stock ({item.available_quantity} remaining) "
-                    f"in warehouse {item.warehouse_id}. Reorder point: {item.reorder_point}",
-                )
-                new_alerts.append(alert)
-
-            if item.quantity > item.max_quantity:
-                alert = self._create_alert(
-                    item,
-                    "overstock",
-                    f"INFO: {item.sku} exceeds max quantity ({item.quantity}/{item.max_quantity}) "
-                    f"in warehouse {item.warehouse_id}",
-                )
-                new_alerts.append(alert)
+        Returns:
+            The alerts opened by this check
+        """
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, {}
 
+        new_alerts = []
+        with self._lock:
+            for item_id in dirty:
+                item = self._stock_repo.find_by_id(item_id)
+                if item is None:
+                    self._resolve_item(item_id, set())
+                    continue
+                wanted = self._evaluate(item)
+                self._resolve_item(item_id, set(wanted))
+                for alert_type, message in wanted.items():
+                    alert_id = self._open.get((item_id, alert_type))
+                    if alert_id is not None:
+                        self._alerts[alert_id].current_quantity = item.available_quantity
+                    else:
+                        new_alerts.append(self._create_alert(item, alert_type, message))
+            self._trim_resolved()
         return new_alerts
 
-    def get_alerts(self, alert_type: str = None, acknowledged: bool = None) -> List[StockAlert]:
-        alerts = list(self._alerts.values())
+    def pending_count(self) -> int:
+        """Number of changed items waiting to be checked."""
+        return len(self._dirty)
+
+    def get_alerts(self, alert_type: str = None, acknowledged: bool = None,
+                   resolved: bool = None) -> List[StockAlert]:
+        if resolved is False:
+            alerts = [self._alerts[alert_id] for alert_id in list(self._open.values())]
+        else:
+            alerts = list(self._alerts.values())
         if alert_type:
             alerts = [a for a in alerts if a.alert_type == alert_type]
         if acknowledged is not None:
             alerts = [a for a in alerts if a.acknowledged == acknowledged]
+        if resolved:
+            alerts = [a for a in alerts if a.is_resolved]
         return alerts
 
     def acknowledge_alert(self, alert_id: str) -> bool:
@@ -112,6 +145,48 @@ class AlertService:
         suggestions.sort(key=lambda s: 0 if s["priority"] == "high" else 1)
         return suggestions
 
+    def _mark_dirty(self, item_id: str):
+        with self._dirty_lock:
+            self._dirty[item_id] = None
+
+    @staticmethod
+    def _evaluate(item: InventoryItem) -> Dict[str, str]:
+        """Map each alert type the item currently warrants to its message."""
+        wanted = {}
+        if item.is_out_of_stock:
+            wanted["out_of_stock"] = (
+                f"CRITICAL: {item.sku} is out of stock in warehouse {item.warehouse_id}"
+            )
+        elif item.is_low_stock:
+            wanted["low_stock"] = (
+                f"WARNING: {item.sku} is low on stock ({item.available_quantity} remaining) "
+                f"in warehouse {item.warehouse_id}. Reorder point: {item.reorder_point}"
+            )
+
+        if item.quantity > item.max_quantity:
+            wanted["overstock"] = (
+                f"INFO: {item.sku} exceeds max quantity ({item.quantity}/{item.max_quantity}) "
+                f"in warehouse {item.warehouse_id}"
+            )
+        return wanted
+
+    def _resolve_item(self, item_id: str, keep: set):
+        # Caller holds the lock
+        now = datetime.utcnow()
+        for alert_type in ALERT_TYPES:
+            if alert_type in keep:
+                continue
+            alert_id = self._open.pop((item_id, alert_type), None)
+            if alert_id is not None:
+                self._alerts[alert_id].resolved_at = now
+                self._resolved[alert_id] = None
+
+    def _trim_resolved(self):
+        # Caller holds the lock
+        while len(self._resolved) > self._max_resolved_alerts:
+            alert_id, _ = self._resolved.popitem(last=False)
+            del self._alerts[alert_id]
+
     def _create_alert(self, item: InventoryItem, alert_type: str, message: str) -> StockAlert:
         alert = StockAlert(
             item_id=item.id,
@@ -124,5 +199,6 @@ class AlertService:
             message=message,
         )
         self._alerts[alert.id] = alert
+        self._open[(item.id, alert_type)] = alert.id
         return alert
 
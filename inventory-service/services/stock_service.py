@@ -1,18 +1,62 @@
 """Stock service - business logic for inventory management."""
+import logging
+import threading
+import time
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from models.inventory_item import InventoryItem
+from models.stock_totals import StockTotals
+from models.reservation import Reservation, ReservationStatus
 from models.stock_movement import StockMovement, MovementType
+from repositories.movement_journal import MovementJournal
+from repositories.reservation_ledger import ReservationLedger
 from repositories.stock_repository import StockRepository
 from repositories.warehouse_repository import WarehouseRepository
+from utils.striped_lock import StripedLock
+from utils.timing_wheel import TimingWheel
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)  # reservation expiries are naive UTC
+
+
+class ConcurrentUpdateError(ValueError):
+    """Raised when an item update keeps losing compare-and-swap races."""
+
+
+class ReservationNotFoundError(ValueError):
+    """Raised when an order has no open reservation."""
 
 
 class StockService:
-    def __init__(self, stock_repo: StockRepository, warehouse_repo: WarehouseRepository):
+    OPTIMISTIC = "optimistic"  # compare-and-swap with bounded retries
+    LOCKING = "locking"        # per-item locks
+    MAX_UPDATE_ATTEMPTS = 20
+    DEFAULT_HOLD_SECONDS = 15 * 60
+    MAX_HOLD_SECONDS = 24 * 3600
+    MAX_AVAILABILITY_KEYS = 1000
+
+    def __init__(self, stock_repo: StockRepository, warehouse_repo: WarehouseRepository,
+                 movement_journal: Optional[MovementJournal] = None,
+                 concurrency: str = OPTIMISTIC,
+                 reservation_ledger: Optional[ReservationLedger] = None,
+                 clock: Callable[[], float] = time.time):
+        if concurrency not in (self.OPTIMISTIC, self.LOCKING):
+            raise ValueError(f"Unknown concurrency mode '{concurrency}'")
         self._stock_repo = stock_repo
         self._warehouse_repo = warehouse_repo
-        self._movements: List[StockMovement] = []
+        self._concurrency = concurrency
+        self._item_locks = StripedLock(stripes=1024)
+        self.conflicts = 0  # lost compare-and-swap races (approximate, unlocked counter)
+        self.release_failures = 0  # held stock that could not be released
+        self._reservations = reservation_ledger if reservation_ledger is not None else ReservationLedger()
+        self._clock = clock
+        self._expiry_wheel = TimingWheel(tick_seconds=1.0, start=clock())
+        self._expiry_stop = threading.Event()
+        self._expiry_thread: Optional[threading.Thread] = None
+        self._movements = movement_journal if movement_journal is not None else MovementJournal()
 
     def add_inventory_item(self, product_id: str, sku: str, warehouse_id: str,
                            quantity: int = 0, reorder_point: int = 10) -> InventoryItem:
@@ -42,108 +86,328 @@ class StockService:
         if quantity <= 0:
             raise ValueError("Receive quantity must be positive")
 
-        item = self._stock_repo.find_by_id(item_id)
-        if not item:
-            raise ValueError(f"Inventory item '{item_id}' not found")
-
-        if item.quantity + quantity > item.max_quantity:
-            raise ValueError(f"Would exceed max quantity ({item.max_quantity})")
+        def receive(item: InventoryItem):
+            if item.quantity + quantity > item.max_quantity:
+                raise ValueError(f"Would exceed max quantity ({item.max_quantity})")
+            item.quantity += quantity
 
-        item.quantity += quantity
-        item.updated_at = datetime.utcnow()
-
-        movement = StockMovement(
+        item = self._update_item(item_id, receive)
+        self._movements.append(StockMovement(
             inventory_item_id=item_id,
             warehouse_id=item.warehouse_id,
             movement_type=MovementType.INBOUND,
             quantity=quantity,
             reference_id=reference_id,
-        )
-        self._movements.append(movement)
-
-        return self._stock_repo.save(item)
+        ))
+        return item
 
-    def ship_stock(self, item_id: str, quantity: int, reference_id: str = "") -> InventoryItem:
+    def ship_stock(self, item_id: str, quantity: int, reference_id: str = "",
+                   from_reserved: bool = False) -> InventoryItem:
+        """Ship stock; ``from_reserved`` ships units that were previously reserved."""
         if quantity <= 0:
             raise ValueError("Ship quantity must be positive")
 
-        item = self._stock_repo.find_by_id(item_id)
-        if not item:
-            raise ValueError(f"Inventory item '{item_id}' not found")
-
-        if quantity > item.available_quantity:
-            raise ValueError(
-                f"Insufficient stock. Available: {item.available_quantity}, Requested: {quantity}"
-            )
-
-        item.quantity -= quantity
-        item.updated_at = datetime.utcnow()
-
-        movement = StockMovement(
+        def ship(item: InventoryItem):
+            if from_reserved:
+                if quantity > item.reserved_quantity:
+                    raise ValueError("Cannot ship more than reserved quantity")
+                if quantity > item.quantity:
+                    raise ValueError(
+                        f"Insufficient stock. On hand: {item.quantity}, Requested: {quantity}"
+                    )
+                item.reserved_quantity -= quantity
+            elif quantity > item.available_quantity:
+                raise ValueError(
+                    f"Insufficient stock. Available: {item.available_quantity}, Requested: {quantity}"
+                )
+            item.quantity -= quantity
+
+        item = self._update_item(item_id, ship)
+        self._movements.append(StockMovement(
             inventory_item_id=item_id,
             warehouse_id=item.warehouse_id,
             movement_type=MovementType.OUTBOUND,
             quantity=quantity,
             reference_id=reference_id,
-        )
-        self._movements.append(movement)
-
-        return self._stock_repo.save(item)
+        ))
+        return item
 
     def reserve_stock(self, item_id: str, quantity: int) -> InventoryItem:
         if quantity <= 0:
             raise ValueError("Reserve quantity must be positive")
 
-        item = self._stock_repo.find_by_id(item_id)
-        if not item:
-            raise ValueError(f"Inventory item '{item_id}' not found")
-
-        if quantity > item.available_quantity:
-            raise ValueError(
-                f"Insufficient available stock. Available: {item.available_quantity}, Requested: {quantity}"
-            )
-
-        item.reserved_quantity += quantity
-        item.updated_at = datetime.utcnow()
-        return self._stock_repo.save(item)
+        def reserve(item: InventoryItem):
+            if quantity > item.available_quantity:
+                raise ValueError(
+                    f"Insufficient available stock. Available: {item.available_quantity}, Requested: {quantity}"
+                )
+            item.reserved_quantity += quantity
+
+        return self._update_item(item_id, reserve)
+
+    def reserve_order(self, order_id: str, lines: List[Tuple[str, int]],
+                      hold_seconds: Optional[float] = None) -> List[InventoryItem]:
+        """Reserve every (item_id, quantity) line of an order, or nothing at all.
+
+        Item locks are taken in a fixed order, all lines are checked against
+        the current stock, and the updated items are stored in a single
+        atomic compare-and-swap. The hold is released automatically after
+        ``hold_seconds`` unless it is confirmed, released or extended first.
+        """
+        if not order_id:
+            raise ValueError("Order ID is required")
+        if not lines:
+            raise ValueError("An order reservation needs at least one line")
+        hold_seconds = self._check_hold(hold_seconds)
+
+        quantities: Dict[str, int] = {}
+        for item_id, quantity in lines:
+            if quantity <= 0:
+                raise ValueError("Reserve quantity must be positive")
+            quantities[item_id] = quantities.get(item_id, 0) + quantity
+        item_ids = list(quantities)
+
+        if not self._reservations.claim(order_id):
+            raise ValueError(f"Order '{order_id}' already has reservations")
+        try:
+            with self._item_locks.acquire(*item_ids):
+                updated = self._reserve_lines(order_id, item_ids, quantities)
+        except BaseException:
+            self._reservations.unclaim(order_id)
+            raise
+
+        deadline = self._clock() + hold_seconds
+        expires_at = datetime.utcfromtimestamp(deadline)
+        self._reservations.add(order_id, [
+            Reservation(order_id=order_id, item_id=item_id, quantity=quantity, expires_at=expires_at)
+            for item_id, quantity in quantities.items()
+        ])
+        self._expiry_wheel.schedule(order_id, deadline)
+        return updated
+
+    def get_reservations(self, order_id: str) -> List[Reservation]:
+        """Get an order's open reservations."""
+        return self._reservations.find_by_order(order_id)
+
+    def extend_reservation(self, order_id: str, hold_seconds: Optional[float] = None) -> List[Reservation]:
+        """Push an order's hold out to ``hold_seconds`` from now."""
+        hold_seconds = self._check_hold(hold_seconds)
+        deadline = self._clock() + hold_seconds
+        reservations = self._reservations.extend(order_id, datetime.utcfromtimestamp(deadline))
+        if not reservations:
+            raise ReservationNotFoundError(f"No open reservation for order '{order_id}'")
+        self._expiry_wheel.schedule(order_id, deadline)
+        return reservations
+
+    def confirm_reservation(self, order_id: str) -> List[Reservation]:
+        """Ship an order's held stock, turning each reservation into an outbound movement.
+
+        All lines ship in one atomic compare-and-swap, or none do; on failure
+        the order's reservations stay open.
+        """
+        reservations = self._reservations.take(order_id)
+        if not reservations:
+            raise ReservationNotFoundError(f"No open reservation for order '{order_id}'")
+        try:
+            item_ids = [reservation.item_id for reservation in reservations]
+            with self._item_locks.acquire(*item_ids):
+                updated = self._ship_reserved_lines(order_id, reservations)
+        except BaseException:
+            self._reservations.add(order_id, reservations)
+            # The wheel may have fired while the order was taken; re-arm it
+            expires_at = reservations[0].expires_at
+            self._expiry_wheel.schedule(order_id, (expires_at - EPOCH).total_seconds())
+            raise
+        self._reservations.unclaim(order_id)
+        self._expiry_wheel.cancel(order_id)
+
+        for reservation, item in zip(reservations, updated):
+            self._movements.append(StockMovement(
+                inventory_item_id=item.id,
+                warehouse_id=item.warehouse_id,
+                movement_type=MovementType.OUTBOUND,
+                quantity=reservation.quantity,
+                reference_id=order_id,
+            ))
+            reservation.status = ReservationStatus.CONFIRMED
+        return reservations
+
+    def release_order(self, order_id: str) -> List[Reservation]:
+        """Release an order's held stock back to available."""
+        reservations = self._take_reservations(order_id)
+        self._release_holds(reservations, ReservationStatus.RELEASED)
+        return reservations
+
+    def expire_reservations(self) -> List[str]:
+        """Release every hold whose time is up; returns the expired order ids."""
+        now = self._clock()
+        now_dt = datetime.utcfromtimestamp(now)
+        expired = []
+        for order_id in self._expiry_wheel.advance(now):
+            # An extend may have raced with the wheel; the ledger has the final say
+            reservations = self._reservations.pop_expired(order_id, now_dt)
+            if reservations:
+                self._release_holds(reservations, ReservationStatus.EXPIRED)
+                expired.append(order_id)
+        return expired
+
+    def start_reservation_expiry(self, interval_seconds: float = 1.0):
+        """Expire reservations from a background thread every ``interval_seconds``."""
+        if self._expiry_thread is not None:
+            return
+        self._expiry_stop.clear()
+
+        def run():
+            while not self._expiry_stop.wait(interval_seconds):
+                try:
+                    self.expire_reservations()
+                except Exception:
+                    logger.exception("Reservation expiry tick failed")
+
+        self._expiry_thread = threading.Thread(target=run, name="reservation-expiry", daemon=True)
+        self._expiry_thread.start()
+
+    def stop_reservation_expiry(self):
+        if self._expiry_thread is None:
+            return
+        self._expiry_stop.set()
+        self._expiry_thread.join()
+        self._expiry_thread = None
+
+    def _check_hold(self, hold_seconds: Optional[float]) -> float:
+        if hold_seconds is None:
+            return self.DEFAULT_HOLD_SECONDS
+        if not 0 < hold_seconds <= self.MAX_HOLD_SECONDS:
+            raise ValueError(f"Hold must be between 0 and {self.MAX_HOLD_SECONDS} seconds")
+        return hold_seconds
+
+    def _take_reservations(self, order_id: str) -> List[Reservation]:
+        reservations = self._reservations.pop_order(order_id)
+        if not reservations:
+            raise ReservationNotFoundError(f"No open reservation for order '{order_id}'")
+        self._expiry_wheel.cancel(order_id)
+        return reservations
+
+    def _release_holds(self, reservations: List[Reservation], status: ReservationStatus):
+        for reservation in reservations:
+            try:
+                self.release_reservation(reservation.item_id, reservation.quantity)
+            except ValueError as e:
+                # The item was deleted or its stock adjusted directly
+                reservation.release_error = str(e)
+                self.release_failures += 1
+                logger.warning("Could not release %s units of '%s' for order '%s': %s",
+                               reservation.quantity, reservation.item_id, reservation.order_id, e)
+            reservation.status = status
+
+    def _reserve_lines(self, order_id: str, item_ids: List[str],
+                       quantities: Dict[str, int]) -> List[InventoryItem]:
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            currents = []
+            updated = []
+            for item_id in item_ids:
+                current = self._stock_repo.find_by_id(item_id)
+                if not current:
+                    raise ValueError(f"Inventory item '{item_id}' not found")
+                quantity = quantities[item_id]
+                if quantity > current.available_quantity:
+                    raise ValueError(
+                        f"Insufficient available stock for '{item_id}'. "
+                        f"Available: {current.available_quantity}, Requested: {quantity}"
+                    )
+                currents.append(current)
+                updated.append(replace(current, reserved_quantity=current.reserved_quantity + quantity,
+                                       updated_at=datetime.utcnow()))
+            if self._stock_repo.compare_and_save_many(updated, [c.version for c in currents]):
+                return updated
+            self.conflicts += 1
+        raise ConcurrentUpdateError(f"Order '{order_id}' items are being updated concurrently; try again")
+
+    def _ship_reserved_lines(self, order_id: str,
+                             reservations: List[Reservation]) -> List[InventoryItem]:
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            currents = []
+            updated = []
+            for reservation in reservations:
+                current = self._stock_repo.find_by_id(reservation.item_id)
+                if not current:
+                    raise ValueError(f"Inventory item '{reservation.item_id}' not found")
+                quantity = reservation.quantity
+                if quantity > current.reserved_quantity:
+                    raise ValueError(f"Cannot ship more than reserved quantity of '{current.id}'")
+                if quantity > current.quantity:
+                    raise ValueError(f"Cannot ship more than on-hand quantity of '{current.id}'")
+                currents.append(current)
+                updated.append(replace(current, quantity=current.quantity - quantity,
+                                       reserved_quantity=current.reserved_quantity - quantity,
+                                       updated_at=datetime.utcnow()))
+            if self._stock_repo.compare_and_save_many(updated, [c.version for c in currents]):
+                return updated
+            self.conflicts += 1
+        raise ConcurrentUpdateError(f"Order '{order_id}' items are being updated concurrently; try again")
 
     def release_reservation(self, item_id: str, quantity: int) -> InventoryItem:
         if quantity <= 0:
             raise ValueError("Release quantity must be positive")
 
-        item = self._stock_repo.find_by_id(item_id)
-        if not item:
-            raise ValueError(f"Inventory item '{item_id}' not found")
-
-        if quantity > item.reserved_quantity:
-            raise ValueError("Cannot release more than reserved quantity")
+        def release(item: InventoryItem):
+            if quantity > item.reserved_quantity:
+                raise ValueError("Cannot release more than reserved quantity")
+            item.reserved_quantity -= quantity
 
-        item.reserved_quantity -= quantity
-        item.updated_at = datetime.utcnow()
-        return self._stock_repo.save(item)
+        return self._update_item(item_id, release)
 
     def adjust_stock(self, item_id: str, new_quantity: int, notes: str = "") -> InventoryItem:
         if new_quantity < 0:
             raise ValueError("Quantity cannot be negative")
 
-        item = self._stock_repo.find_by_id(item_id)
-        if not item:
-            raise ValueError(f"Inventory item '{item_id}' not found")
+        old_quantities = []
 
-        old_quantity = item.quantity
-        item.quantity = new_quantity
-        item.updated_at = datetime.utcnow()
+        def adjust(item: InventoryItem):
+            if new_quantity < item.reserved_quantity:
+                raise ValueError(
+                    f"Quantity cannot be below reserved quantity ({item.reserved_quantity})"
+                )
+            old_quantities.append(item.quantity)
+            item.quantity = new_quantity
 
-        movement = StockMovement(
+        item = self._update_item(item_id, adjust)
+        self._movements.append(StockMovement(
             inventory_item_id=item_id,
             warehouse_id=item.warehouse_id,
             movement_type=MovementType.ADJUSTMENT,
-            quantity=new_quantity - old_quantity,
+            quantity=new_quantity - old_quantities[-1],
             notes=notes,
+        ))
+        return item
+
+    def _update_item(self, item_id: str, mutate: Callable[[InventoryItem], None]) -> InventoryItem:
+        """Apply ``mutate`` to a copy of the item and store it atomically.
+
+        In optimistic mode the copy is stored with compare-and-swap and the
+        read-check-modify is retried if another writer got in first. In
+        locking mode the item's lock is held throughout, so the swap only
+        fails if something wrote the repository directly.
+        """
+        if self._concurrency == self.LOCKING:
+            with self._item_locks.acquire(item_id):
+                return self._update_with_retries(item_id, mutate)
+        return self._update_with_retries(item_id, mutate)
+
+    def _update_with_retries(self, item_id: str, mutate: Callable[[InventoryItem], None]) -> InventoryItem:
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            current = self._stock_repo.find_by_id(item_id)
+            if not current:
+                raise ValueError(f"Inventory item '{item_id}' not found")
+            item = replace(current)
+            mutate(item)
+            item.updated_at = datetime.utcnow()
+            if self._stock_repo.compare_and_save(item, current.version):
+                return item
+            self.conflicts += 1
+        raise ConcurrentUpdateError(
+            f"Inventory item '{item_id}' is being updated concurrently; try again"
         )
-        self._movements.append(movement)
-
-        return self._stock_repo.save(item)
 
     def get_item(self, item_id: str) -> Optional[InventoryItem]:
         return self._stock_repo.find_by_id(item_id)
@@ -154,17 +418,73 @@ class StockService:
     def get_stock_by_warehouse(self, warehouse_id: str) -> List[InventoryItem]:
         return self._stock_repo.find_by_warehouse(warehouse_id)
 
+    def query_items(self, warehouse_id: str = None, product_id: str = None,
+                    cursor: Optional[str] = None,
+                    limit: int = 100) -> Tuple[List[InventoryItem], Optional[str]]:
+        """Page through inventory items; returns (items, next_cursor)."""
+        return self._stock_repo.query(warehouse_id=warehouse_id, product_id=product_id,
+                                      cursor=cursor, limit=limit)
+
+    def iter_items(self, warehouse_id: str = None, product_id: str = None,
+                   batch_size: int = 1000) -> Iterator[List[InventoryItem]]:
+        """Yield all matching items in batches, without materializing the full listing."""
+        cursor = None
+        while True:
+            items, cursor = self.query_items(warehouse_id=warehouse_id, product_id=product_id,
+                                             cursor=cursor, limit=batch_size)
+            if items:
+                yield items
+            if cursor is None:
+                return
+
     def get_total_available(self, product_id: str) -> int:
         return self._stock_repo.get_total_quantity(product_id)
 
-    def get_low_stock_items(self) -> List[InventoryItem]:
-        return self._stock_repo.find_low_stock()
-
-    def get_out_of_stock_items(self) -> List[InventoryItem]:
-        return self._stock_repo.find_out_of_stock()
+    def get_product_totals(self, product_id: str) -> StockTotals:
+        return self._stock_repo.get_product_totals(product_id)
+
+    def get_availability(self, product_ids: Optional[List[str]] = None,
+                         skus: Optional[List[str]] = None,
+                         by_warehouse: bool = False) -> Dict[str, object]:
+        """Available quantity for many products (or SKUs) at once.
+
+        Returns ``{key: available}``, or with ``by_warehouse``
+        ``{key: {"available": n, "warehouses": {warehouse_id: n}}}``.
+        """
+        if (product_ids is None) == (skus is None):
+            raise ValueError("Provide either 'product_ids' or 'skus'")
+        keys = product_ids if product_ids is not None else skus
+        if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+            raise ValueError("Keys must be a list of strings")
+        if len(keys) > self.MAX_AVAILABILITY_KEYS:
+            raise ValueError(f"At most {self.MAX_AVAILABILITY_KEYS} keys per request")
+
+        by_sku = skus is not None
+        if not by_warehouse:
+            return self._stock_repo.get_available(keys, by_sku=by_sku)
+        breakdown = self._stock_repo.get_available_by_warehouse(keys, by_sku=by_sku)
+        return {
+            key: {"available": sum(warehouses.values()), "warehouses": warehouses}
+            for key, warehouses in breakdown.items()
+        }
+
+    def get_low_stock_items(self, skip: int = 0, limit: Optional[int] = None) -> List[InventoryItem]:
+        return self._stock_repo.find_low_stock(skip=skip, limit=limit)
+
+    def get_out_of_stock_items(self, skip: int = 0, limit: Optional[int] = None) -> List[InventoryItem]:
+        return self._stock_repo.find_out_of_stock(skip=skip, limit=limit)
 
     def get_movements(self, item_id: str = None) -> List[StockMovement]:
         if item_id:
-            return [m for m in self._movements if m.inventory_item_id == item_id]
-        return self._movements
-
+            return self._movements.find_by_item(item_id)
+        return self._movements.get_all()
+
+    def query_movements(self, item_id: str = None, warehouse_id: str = None,
+                        reference_id: str = None, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None, cursor: Optional[str] = None,
+                        limit: int = 100) -> Tuple[List[StockMovement], Optional[str]]:
+        """Page through movements in chronological order; returns (movements, next_cursor)."""
+        return self._movements.query(
+            item_id=item_id, warehouse_id=warehouse_id, reference_id=reference_id,
+            start=start, end=end, cursor=cursor, limit=limit,
+        )
@@ -2,6 +2,7 @@
 from datetime import datetime
 from typing import List, Optional
 
+from models.stock_totals import StockTotals
 from models.warehouse import Warehouse
 from repositories.warehouse_repository import WarehouseRepository
 from repositories.stock_repository import StockRepository
@@ -69,9 +70,7 @@ class WarehouseService:
             return False
 
         # Check if warehouse has stock
-        items = self._stock_repo.find_by_warehouse(warehouse_id)
-        items_with_stock = [i for i in items if i.quantity > 0]
-        if items_with_stock:
+        if self._stock_repo.get_warehouse_totals(warehouse_id).quantity > 0:
             raise ValueError("Cannot deactivate warehouse with existing stock")
 
         warehouse.is_active = False
@@ -93,22 +92,36 @@ class WarehouseService:
         if not warehouse:
             raise ValueError(f"Warehouse '{warehouse_id}' not found")
 
-        items = self._stock_repo.find_by_warehouse(warehouse_id)
-        total_stock = sum(item.quantity for item in items)
+        return self._utilization(warehouse, self._stock_repo.get_warehouse_totals(warehouse_id))
+
+    def get_utilization_report(self, active_only: bool = False) -> List[dict]:
+        """Utilization of every warehouse, most utilized first."""
+        all_totals = self._stock_repo.get_all_warehouse_totals()
+        report = [
+            self._utilization(warehouse, all_totals.get(warehouse.id, StockTotals()))
+            for warehouse in self.list_warehouses(active_only=active_only)
+        ]
+        report.sort(key=lambda r: r["utilization_percent"], reverse=True)
+        return report
+
+    @staticmethod
+    def _utilization(warehouse: Warehouse, totals: StockTotals) -> dict:
+        total_stock = totals.quantity
         utilization = (total_stock / warehouse.capacity * 100) if warehouse.capacity > 0 else 0
 
         return {
-            "warehouse_id": warehouse_id,
+            "warehouse_id": warehouse.id,
             "warehouse_name": warehouse.name,
             "capacity": warehouse.capacity,
             "total_stock": total_stock,
-            "item_count": len(items),
+            "reserved_stock": totals.reserved_quantity,
+            "available_stock": totals.available_quantity,
+            "item_count": totals.item_count,
             "utilization_percent": round(utilization, 2),
         }
 
     def delete_warehouse(self, warehouse_id: str) -> bool:
-        items = self._stock_repo.find_by_warehouse(warehouse_id)
-        if items:
+        if self._stock_repo.get_warehouse_totals(warehouse_id).item_count:
             raise ValueError("Cannot delete warehouse with inventory items")
         return self._warehouse_repo.delete(warehouse_id)
 
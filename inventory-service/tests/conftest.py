@@ -37,3 +37,17 @@ def sample_warehouse(warehouse_repo):
                    address="123 Industrial Pkwy", city="Newark", state="NJ")
     return warehouse_repo.save(wh)
 
+
+@pytest.fixture
+def client(monkeypatch, stock_repo, warehouse_repo, stock_service, warehouse_service, alert_service):
+    """Flask test client whose routes use this test's repositories and services."""
+    from app import create_app
+    from routes import dependencies
+    monkeypatch.setattr(dependencies, "stock_repo", stock_repo)
+    monkeypatch.setattr(dependencies, "warehouse_repo", warehouse_repo)
+    monkeypatch.setattr(dependencies, "stock_service", stock_service)
+    monkeypatch.setattr(dependencies, "warehouse_service", warehouse_service)
+    monkeypatch.setattr(dependencies, "alert_service", alert_service)
+    app = create_app()
+    yield app.test_client()
+    stock_service.stop_reservation_expiry()
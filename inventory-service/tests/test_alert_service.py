@@ -35,6 +35,78 @@ class TestCheckStockLevels:
         assert any(a.alert_type == "overstock" for a in alerts)
 
 
+class TestIncrementalAlerts:
+    def _item(self, stock_repo, warehouse_id, quantity):
+        return stock_repo.save(InventoryItem(product_id="p1", sku="SKU-001", warehouse_id=warehouse_id,
+                                             quantity=quantity, reorder_point=10))
+
+    def test_repeated_checks_do_not_duplicate(self, alert_service, stock_repo, sample_warehouse):
+        item = self._item(stock_repo, sample_warehouse.id, 5)
+        assert len(alert_service.check_stock_levels()) == 1
+        assert alert_service.check_stock_levels() == []
+        stock_repo.save(item)  # still low
+        assert alert_service.check_stock_levels() == []
+        assert len(alert_service.get_alerts()) == 1
+
+    def test_only_changed_items_are_evaluated(self, alert_service, stock_repo, sample_warehouse):
+        self._item(stock_repo, sample_warehouse.id, 5)
+        assert alert_service.pending_count() == 1
+        alert_service.check_stock_levels()
+        assert alert_service.pending_count() == 0
+
+    def test_existing_items_checked_on_startup(self, stock_repo, sample_warehouse):
+        from services.alert_service import AlertService
+        self._item(stock_repo, sample_warehouse.id, 0)
+        alerts = AlertService(stock_repo).check_stock_levels()
+        assert [a.alert_type for a in alerts] == ["out_of_stock"]
+
+    def test_auto_resolves_on_recovery(self, alert_service, stock_service, stock_repo, sample_warehouse):
+        item = self._item(stock_repo, sample_warehouse.id, 5)
+        alert = alert_service.check_stock_levels()[0]
+        stock_service.receive_stock(item.id, 100)
+        assert alert_service.check_stock_levels() == []
+        assert alert.is_resolved
+        assert alert_service.get_alerts(resolved=False) == []
+        assert alert_service.get_alerts(resolved=True) == [alert]
+
+    def test_low_to_out_of_stock_transition(self, alert_service, stock_service, stock_repo, sample_warehouse):
+        item = self._item(stock_repo, sample_warehouse.id, 5)
+        low = alert_service.check_stock_levels()[0]
+        stock_service.ship_stock(item.id, 5)
+        alerts = alert_service.check_stock_levels()
+        assert [a.alert_type for a in alerts] == ["out_of_stock"]
+        assert low.is_resolved
+
+    def test_reopens_after_new_crossing(self, alert_service, stock_service, stock_repo, sample_warehouse):
+        item = self._item(stock_repo, sample_warehouse.id, 5)
+        alert_service.check_stock_levels()
+        stock_service.receive_stock(item.id, 100)
+        alert_service.check_stock_levels()
+        stock_service.ship_stock(item.id, 100)
+        assert [a.alert_type for a in alert_service.check_stock_levels()] == ["low_stock"]
+        assert len(alert_service.get_alerts(resolved=False)) == 1
+
+    def test_deleted_item_resolves_alerts(self, alert_service, stock_repo, sample_warehouse):
+        item = self._item(stock_repo, sample_warehouse.id, 0)
+        alert = alert_service.check_stock_levels()[0]
+        stock_repo.delete(item.id)
+        alert_service.check_stock_levels()
+        assert alert.is_resolved
+
+    def test_resolved_alert_retention_is_bounded(self, stock_service, stock_repo, sample_warehouse):
+        from services.alert_service import AlertService
+        alert_service = AlertService(stock_repo, max_resolved_alerts=2)
+        item = self._item(stock_repo, sample_warehouse.id, 5)
+        for _ in range(5):
+            alert_service.check_stock_levels()
+            stock_service.receive_stock(item.id, 100)
+            alert_service.check_stock_levels()
+            stock_service.ship_stock(item.id, 100)
+        alert_service.check_stock_levels()
+        assert len(alert_service.get_alerts(resolved=True)) == 2
+        assert len(alert_service.get_alerts(resolved=False)) == 1
+
+
 class TestAlertManagement:
     def test_acknowledge_alert(self, alert_service, stock_repo, sample_warehouse):
         item = InventoryItem(product_id="p1", sku="SKU-001", warehouse_id=sample_warehouse.id,
@@ -0,0 +1,91 @@
+"""Tests for MovementJournal."""
+from datetime import datetime, timedelta
+
+import pytest
+from models.stock_movement import StockMovement, MovementType
+from repositories.movement_journal import MovementJournal
+
+T0 = datetime(2024, 1, 1)
+
+
+def _movement(item_id="item-1", warehouse_id="wh-1", minutes=0, reference_id="", **kwargs):
+    return StockMovement(
+        inventory_item_id=item_id,
+        warehouse_id=warehouse_id,
+        movement_type=MovementType.INBOUND,
+        quantity=1,
+        reference_id=reference_id,
+        created_at=T0 + timedelta(minutes=minutes),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def journal():
+    journal = MovementJournal()
+    for minute in range(10):
+        journal.append(_movement(item_id=f"item-{minute % 2}", warehouse_id=f"wh-{minute % 3}",
+                                 minutes=minute, reference_id=f"order-{minute // 4}"))
+    return journal
+
+
+class TestMovementJournal:
+    def test_find_by_item(self, journal):
+        movements = journal.find_by_item("item-1")
+        assert [m.created_at.minute for m in movements] == [1, 3, 5, 7, 9]
+
+    def test_query_by_time_range(self, journal):
+        movements, cursor = journal.query(start=T0 + timedelta(minutes=3), end=T0 + timedelta(minutes=6))
+        assert [m.created_at.minute for m in movements] == [3, 4, 5]
+        assert cursor is None
+
+    def test_query_item_and_time_range(self, journal):
+        movements, _ = journal.query(item_id="item-0", start=T0 + timedelta(minutes=3))
+        assert [m.created_at.minute for m in movements] == [4, 6, 8]
+
+    def test_query_combined_filters(self, journal):
+        movements, _ = journal.query(item_id="item-0", warehouse_id="wh-0")
+        assert [m.created_at.minute for m in movements] == [0, 6]
+
+    def test_query_by_reference(self, journal):
+        movements, _ = journal.query(reference_id="order-2")
+        assert [m.created_at.minute for m in movements] == [8, 9]
+        assert journal.find_by_reference("order-2") == movements
+
+    def test_cursor_pagination(self, journal):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            page, cursor = journal.query(item_id="item-1", cursor=cursor, limit=2)
+            seen.extend(m.created_at.minute for m in page)
+            pages += 1
+            if cursor is None:
+                break
+        assert seen == [1, 3, 5, 7, 9]
+        assert pages == 3
+
+    def test_exact_final_page_has_no_cursor(self, journal):
+        page, cursor = journal.query(limit=10)
+        assert len(page) == 10
+        assert cursor is None
+
+    def test_transfer_indexed_under_destination(self, journal):
+        journal.append(_movement(warehouse_id="wh-1", minutes=20, destination_warehouse_id="wh-9"))
+        movements, _ = journal.query(warehouse_id="wh-9")
+        assert len(movements) == 1
+
+    def test_out_of_order_append_keeps_time_order(self, journal):
+        late = journal.append(_movement(minutes=-5))
+        assert late.created_at == T0 - timedelta(minutes=5)  # the caller's timestamp is kept
+        movements, _ = journal.query(start=T0 + timedelta(minutes=9))
+        assert movements[-1] is late
+        assert len(movements) == 2
+        assert journal.query(end=T0)[0] == []
+
+    def test_invalid_cursor(self, journal):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            journal.query(cursor="abc")
+
+    def test_unknown_item(self, journal):
+        assert journal.query(item_id="missing") == ([], None)
@@ -0,0 +1,193 @@
+"""Tests for the HTTP routes."""
+import json
+
+import pytest
+
+
+@pytest.fixture
+def warehouse_id(client):
+    response = client.post("/warehouses/", json={"name": "East", "code": "WH-EAST-01", "capacity": 1000})
+    assert response.status_code == 201
+    return response.get_json()["id"]
+
+
+@pytest.fixture
+def item_ids(client, warehouse_id):
+    ids = []
+    for n in range(5):
+        response = client.post("/stock/", json={"product_id": f"prod-{n % 2}", "sku": f"SKU-{n:03d}",
+                                                "warehouse_id": warehouse_id, "quantity": 20})
+        assert response.status_code == 201
+        ids.append(response.get_json()["id"])
+    return ids
+
+
+class TestStockRoutes:
+    def test_cursor_round_trip(self, client, item_ids):
+        skus, cursor = [], None
+        while True:
+            url = "/stock/?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            body = client.get(url).get_json()
+            skus += [item["sku"] for item in body["items"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert skus == [f"SKU-{n:03d}" for n in range(5)]
+
+    def test_filtered_listing(self, client, item_ids):
+        body = client.get("/stock/?product_id=prod-1").get_json()
+        assert [item["sku"] for item in body["items"]] == ["SKU-001", "SKU-003"]
+
+    def test_stream_is_json_lines(self, client, item_ids):
+        response = client.get("/stock/?stream=1")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [row["id"] for row in rows] == item_ids
+
+    @pytest.mark.parametrize("query", ["limit=abc", "limit=0", "limit=1001", "cursor=abc"])
+    def test_invalid_paging(self, client, item_ids, query):
+        assert client.get(f"/stock/?{query}").status_code == 400
+
+    def test_get_item(self, client, item_ids):
+        assert client.get(f"/stock/{item_ids[0]}").get_json()["sku"] == "SKU-000"
+        assert client.get("/stock/missing").status_code == 404
+
+    def test_add_item_validation(self, client, warehouse_id):
+        assert client.post("/stock/", json={"sku": "SKU-X"}).status_code == 400
+        assert client.post("/stock/", json={"product_id": "p", "sku": "SKU-X",
+                                            "warehouse_id": "nope"}).status_code == 400
+
+    def test_stock_updates(self, client, item_ids):
+        item_id = item_ids[0]
+        assert client.post(f"/stock/{item_id}/receive", json={"quantity": 5}).get_json()["quantity"] == 25
+        assert client.post(f"/stock/{item_id}/reserve", json={"quantity": 4}).get_json()["reserved_quantity"] == 4
+        assert client.post(f"/stock/{item_id}/ship", json={"quantity": 100}).status_code == 400
+        assert client.post(f"/stock/{item_id}/ship", json={"quantity": "x"}).status_code == 400
+        assert client.post("/stock/missing/ship", json={"quantity": 1}).status_code == 404
+
+    def test_item_reserve_is_a_tracked_hold(self, client, item_ids):
+        body = client.post(f"/stock/{item_ids[0]}/reserve", json={"quantity": 4}).get_json()
+        assert body["expires_at"] is not None
+        (reservation,) = client.get(f"/stock/reservations/{body['order_id']}").get_json()["reservations"]
+        assert (reservation["item_id"], reservation["quantity"]) == (item_ids[0], 4)
+        assert client.delete(f"/stock/reservations/{body['order_id']}").status_code == 200
+        assert client.get(f"/stock/{item_ids[0]}").get_json()["reserved_quantity"] == 0
+        assert client.post(f"/stock/{item_ids[0]}/reserve", json={"quantity": 0}).status_code == 400
+        assert client.post("/stock/missing/reserve", json={"quantity": 1}).status_code == 404
+
+    def test_array_body_is_rejected(self, client, item_ids):
+        assert client.post(f"/stock/{item_ids[0]}/receive", json=[{"quantity": 5}]).status_code == 400
+        assert client.post("/stock/", json=["SKU-X"]).status_code == 400
+        assert client.post("/stock/availability", json=["prod-0"]).status_code == 400
+        assert client.post("/warehouses/", json=[]).status_code == 400
+
+    def test_availability(self, client, item_ids, warehouse_id):
+        body = client.post("/stock/availability", json={"product_ids": ["prod-0"]}).get_json()
+        assert body["availability"] == {"prod-0": 60}
+        body = client.post("/stock/availability", json={"product_ids": ["prod-0"], "by_warehouse": True}).get_json()
+        assert body["availability"] == {"prod-0": {"available": 60, "warehouses": {warehouse_id: 60}}}
+
+    @pytest.mark.parametrize("flag", ["false", 0, None])
+    def test_availability_flag_must_be_bool(self, client, item_ids, flag):
+        response = client.post("/stock/availability", json={"product_ids": ["prod-0"], "by_warehouse": flag})
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "'by_warehouse' must be true or false"
+
+    def test_low_stock_paging(self, client, item_ids):
+        for item_id in item_ids[:3]:
+            client.post(f"/stock/{item_id}/adjust", json={"quantity": 1})
+        first = client.get("/stock/low-stock?limit=2").get_json()
+        second = client.get(f"/stock/low-stock?limit=2&cursor={first['next_cursor']}").get_json()
+        assert len(first["items"]) == 2
+        assert len(second["items"]) == 1
+        assert second["next_cursor"] is None
+
+    def test_reservation_lifecycle(self, client, item_ids):
+        body = {"order_id": "order-1", "items": [{"item_id": item_ids[0], "quantity": 3}]}
+        assert client.post("/stock/reservations", json=body).status_code == 201
+        assert client.post("/stock/reservations", json=body).status_code == 400
+        assert client.get("/stock/reservations/order-1").status_code == 200
+        assert client.post("/stock/reservations/order-1/confirm").status_code == 200
+        assert client.delete("/stock/reservations/order-1").status_code == 404
+
+    @pytest.mark.parametrize("order_id", [["order-1"], "", 7, None])
+    def test_reservation_order_id_must_be_string(self, client, item_ids, order_id):
+        body = {"order_id": order_id, "items": [{"item_id": item_ids[0], "quantity": 3}]}
+        response = client.post("/stock/reservations", json=body)
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "'order_id' must be a non-empty string"
+
+    @pytest.mark.parametrize("line", [
+        {"item_id": ["x"], "quantity": 3},
+        {"item_id": "", "quantity": 3},
+        {"quantity": 3},
+        {"item_id": "ITEM", "quantity": True},
+        {"item_id": "ITEM", "quantity": 2.5},
+        {"item_id": "ITEM", "quantity": "3"},
+        ["ITEM", 3],
+    ])
+    def test_reservation_lines_are_type_checked(self, client, item_ids, line):
+        if isinstance(line, dict) and line.get("item_id") == "ITEM":
+            line = {**line, "item_id": item_ids[0]}
+        response = client.post("/stock/reservations", json={"order_id": "order-1", "items": [line]})
+        assert response.status_code == 400
+        assert client.get("/stock/reservations/order-1").status_code == 404
+
+    def test_reservation_hold_rejects_bool(self, client, item_ids):
+        body = {"order_id": "order-1", "items": [{"item_id": item_ids[0], "quantity": 3}], "hold_seconds": True}
+        response = client.post("/stock/reservations", json=body)
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "'hold_seconds' must be a number"
+
+
+class TestWarehouseRoutes:
+    def test_crud(self, client, warehouse_id):
+        assert client.get(f"/warehouses/{warehouse_id}").get_json()["code"] == "WH-EAST-01"
+        assert client.patch(f"/warehouses/{warehouse_id}", json={"name": "Renamed"}).get_json()["name"] == "Renamed"
+        assert client.patch(f"/warehouses/{warehouse_id}", json={"capacity": 0}).status_code == 400
+        assert client.post(f"/warehouses/{warehouse_id}/deactivate").get_json()["is_active"] is False
+        assert client.delete(f"/warehouses/{warehouse_id}").status_code == 204
+        assert client.get(f"/warehouses/{warehouse_id}").status_code == 404
+
+    def test_cannot_deactivate_with_stock(self, client, warehouse_id, item_ids):
+        assert client.post(f"/warehouses/{warehouse_id}/deactivate").status_code == 400
+
+    def test_utilization(self, client, warehouse_id, item_ids):
+        report = client.get("/warehouses/utilization").get_json()["warehouses"]
+        assert report[0]["total_stock"] == 100
+        assert client.get(f"/warehouses/{warehouse_id}/utilization").get_json()["utilization_percent"] == 10.0
+        assert client.get("/warehouses/missing/utilization").status_code == 404
+
+
+class TestAlertRoutes:
+    def test_listing_does_not_evaluate_changes(self, client, item_ids):
+        client.post(f"/stock/{item_ids[0]}/adjust", json={"quantity": 0})
+        body = client.get("/alerts/").get_json()
+        assert body["alerts"] == []
+        assert body["pending_changes"] > 0
+
+        opened = client.post("/alerts/check").get_json()["alerts"]
+        assert [alert["alert_type"] for alert in opened] == ["out_of_stock"]
+        assert client.get("/alerts/").get_json()["pending_changes"] == 0
+
+    def test_acknowledge(self, client, item_ids):
+        client.post(f"/stock/{item_ids[0]}/adjust", json={"quantity": 0})
+        (alert,) = client.post("/alerts/check").get_json()["alerts"]
+        assert client.post(f"/alerts/{alert['id']}/acknowledge").status_code == 200
+        assert client.get("/alerts/?acknowledged=true").get_json()["alerts"][0]["id"] == alert["id"]
+        assert client.post("/alerts/missing/acknowledge").status_code == 404
+
+
+class TestMovementRoutes:
+    def test_cursor_round_trip(self, client, item_ids):
+        for item_id in item_ids:
+            client.post(f"/stock/{item_id}/receive", json={"quantity": 1})
+        first = client.get("/movements/?limit=3").get_json()
+        second = client.get(f"/movements/?limit=3&cursor={first['next_cursor']}").get_json()
+        ids = [m["inventory_item_id"] for m in first["movements"] + second["movements"]]
+        assert ids == item_ids
+        assert second["next_cursor"] is None
+
+    def test_invalid_limit(self, client):
+        assert client.get("/movements/?limit=abc").status_code == 400
@@ -0,0 +1,33 @@
+"""Tests for SequenceIndex."""
+from utils.sequence_index import SequenceIndex
+
+
+def _index(n: int) -> SequenceIndex:
+    index = SequenceIndex()
+    for seq in range(n):
+        index.append(seq * 2, f"id-{seq}")
+    return index
+
+
+class TestSequenceIndex:
+    def test_after_seeks_past_cursor(self):
+        index = _index(5)
+        assert list(index.after(-1))[0] == (0, "id-0")
+        assert [item_id for _, item_id in index.after(3)] == ["id-2", "id-3", "id-4"]
+        assert list(index.after(8)) == []
+
+    def test_remove(self):
+        index = _index(5)
+        assert index.remove(4) is True
+        assert index.remove(4) is False
+        assert index.remove(5) is False  # never appended
+        assert list(index) == ["id-0", "id-1", "id-3", "id-4"]
+        assert len(index) == 4
+
+    def test_holes_are_compacted(self):
+        index = _index(100)
+        for seq in range(0, 120, 2):
+            index.remove(seq)
+        assert len(index) == 40
+        assert len(index._ids) < 80
+        assert [item_id for _, item_id in index.after(150)] == [f"id-{n}" for n in range(76, 100)]
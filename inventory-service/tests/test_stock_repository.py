@@ -0,0 +1,198 @@
+"""Tests for StockRepository."""
+from dataclasses import replace
+
+import pytest
+from models.inventory_item import InventoryItem
+
+
+def _item(n: int, quantity: int, reorder_point: int = 10, warehouse_id: str = "wh-1") -> InventoryItem:
+    return InventoryItem(product_id=f"prod-{n}", sku=f"SKU-{n:03d}", warehouse_id=warehouse_id,
+                         quantity=quantity, reorder_point=reorder_point)
+
+
+class TestStockLevelSets:
+    def test_sets_follow_saves(self, stock_repo):
+        healthy = stock_repo.save(_item(1, 100))
+        low = stock_repo.save(_item(2, 5))
+        out = stock_repo.save(_item(3, 0))
+
+        assert {i.id for i in stock_repo.find_low_stock()} == {low.id, out.id}
+        assert [i.id for i in stock_repo.find_out_of_stock()] == [out.id]
+
+        healthy.quantity = 3
+        stock_repo.save(healthy)
+        out.quantity = 50
+        stock_repo.save(out)
+        assert {i.id for i in stock_repo.find_low_stock()} == {low.id, healthy.id}
+        assert stock_repo.find_out_of_stock() == []
+
+    def test_reservations_count_towards_low_stock(self, stock_service, stock_repo, sample_warehouse):
+        item = stock_service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=20)
+        assert stock_repo.count_low_stock() == 0
+        stock_service.reserve_stock(item.id, 15)
+        assert stock_repo.count_low_stock() == 1
+        stock_service.reserve_stock(item.id, 5)
+        assert stock_repo.count_out_of_stock() == 1
+        stock_service.release_reservation(item.id, 20)
+        assert (stock_repo.count_low_stock(), stock_repo.count_out_of_stock()) == (0, 0)
+
+    def test_delete_removes_from_sets(self, stock_repo):
+        item = stock_repo.save(_item(1, 0))
+        stock_repo.delete(item.id)
+        assert stock_repo.find_low_stock() == []
+        assert stock_repo.count_out_of_stock() == 0
+
+    def test_pagination(self, stock_repo):
+        items = [stock_repo.save(_item(n, 1)) for n in range(5)]
+        assert [i.id for i in stock_repo.find_low_stock(skip=1, limit=2)] == [items[1].id, items[2].id]
+        assert [i.id for i in stock_repo.find_low_stock(skip=4, limit=10)] == [items[4].id]
+        assert stock_repo.find_low_stock(skip=5) == []
+
+
+class TestRunningTotals:
+    def test_totals_follow_saves_and_deletes(self, stock_repo):
+        a = stock_repo.save(_item(1, 100))
+        b = stock_repo.save(InventoryItem(product_id="prod-1", sku="SKU-001", warehouse_id="wh-2",
+                                          quantity=30, reserved_quantity=10))
+        totals = stock_repo.get_product_totals("prod-1")
+        assert (totals.quantity, totals.reserved_quantity, totals.available_quantity,
+                totals.item_count) == (130, 10, 120, 2)
+
+        a.quantity = 40  # mutated in place, then saved
+        stock_repo.save(a)
+        assert stock_repo.get_total_quantity("prod-1") == 60
+        assert stock_repo.get_warehouse_totals("wh-1").quantity == 40
+
+        stock_repo.delete(b.id)
+        assert stock_repo.get_product_totals("prod-1").item_count == 1
+        assert stock_repo.get_warehouse_totals("wh-2").item_count == 0
+
+    def test_available_is_clamped_per_item(self, stock_repo):
+        stock_repo.save(_item(1, 5))
+        stock_repo.save(InventoryItem(product_id="prod-1", sku="SKU-002", warehouse_id="wh-1",
+                                      quantity=5, reserved_quantity=8))
+        assert stock_repo.get_total_quantity("prod-1") == 5
+
+    def test_totals_match_service_updates(self, stock_service, stock_repo, sample_warehouse):
+        item = stock_service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=50)
+        stock_service.reserve_stock(item.id, 20)
+        stock_service.ship_stock(item.id, 10)
+        stock_service.receive_stock(item.id, 5)
+        current = stock_repo.find_by_id(item.id)
+        totals = stock_repo.get_warehouse_totals(sample_warehouse.id)
+        assert totals.quantity == current.quantity
+        assert totals.reserved_quantity == current.reserved_quantity
+        assert totals.available_quantity == current.available_quantity
+
+    def test_totals_are_copies(self, stock_repo):
+        stock_repo.save(_item(1, 10))
+        stock_repo.get_product_totals("prod-1").quantity = 999
+        assert stock_repo.get_product_totals("prod-1").quantity == 10
+
+
+class TestVersioning:
+    def test_save_rejects_stale_copy(self, stock_repo):
+        item = stock_repo.save(_item(1, 10))
+        stale = replace(item)
+        assert stock_repo.compare_and_save(replace(item, quantity=20), item.version)
+        stale.quantity = 5
+        with pytest.raises(ValueError, match="modified concurrently"):
+            stock_repo.save(stale)
+        assert stock_repo.find_by_id(item.id).quantity == 20
+
+    def test_save_of_current_copy_bumps_version(self, stock_repo):
+        item = stock_repo.save(_item(1, 10))
+        current = replace(item, quantity=15)
+        stock_repo.save(current)
+        assert stock_repo.find_by_id(item.id).version == item.version + 1
+
+
+class TestSecondaryIndexes:
+    def test_delete_removes_from_indexes(self, stock_repo):
+        a = stock_repo.save(_item(1, 10))
+        b = stock_repo.save(InventoryItem(product_id="prod-1", sku="SKU-002", warehouse_id="wh-1"))
+        stock_repo.delete(a.id)
+        assert stock_repo.find_by_product("prod-1") == [b]
+        assert stock_repo.find_by_warehouse("wh-1") == [b]
+        stock_repo.delete(b.id)
+        assert stock_repo._product_idx == {}
+        assert stock_repo._warehouse_idx == {}
+
+    def test_resave_keeps_one_entry_in_order(self, stock_repo):
+        items = [stock_repo.save(_item(n, 10)) for n in range(3)]
+        stock_repo.save(items[0])
+        assert stock_repo.find_by_warehouse("wh-1") == items
+
+    def test_moved_item_is_reindexed(self, stock_repo):
+        item = stock_repo.save(_item(1, 10))
+        item.warehouse_id = "wh-2"
+        stock_repo.save(item)
+        assert stock_repo.find_by_warehouse("wh-1") == []
+        assert stock_repo.find_by_warehouse("wh-2") == [item]
+
+    def test_changed_sku_frees_old_key(self, stock_repo):
+        item = stock_repo.save(_item(1, 10))
+        item.sku = "SKU-NEW"
+        stock_repo.save(item)
+        assert stock_repo.find_by_sku_and_warehouse("SKU-001", "wh-1") is None
+        assert stock_repo.get_available(["SKU-001", "SKU-NEW"], by_sku=True) == {"SKU-001": 0, "SKU-NEW": 10}
+        stock_repo.save(_item(1, 5))  # the old SKU can be reused
+
+
+class TestQuery:
+    def _pages(self, stock_repo, **filters):
+        pages, cursor = [], None
+        while True:
+            items, cursor = stock_repo.query(cursor=cursor, limit=2, **filters)
+            pages.append([item.sku for item in items])
+            if cursor is None:
+                return pages
+
+    def test_pages_in_insertion_order(self, stock_repo):
+        for n in range(5):
+            stock_repo.save(_item(n, 10))
+        assert self._pages(stock_repo) == [["SKU-000", "SKU-001"], ["SKU-002", "SKU-003"], ["SKU-004"]]
+
+    def test_filters(self, stock_repo):
+        for n in range(6):
+            stock_repo.save(InventoryItem(product_id=f"prod-{n % 2}", sku=f"SKU-{n:03d}",
+                                          warehouse_id=f"wh-{n % 3}"))
+        assert self._pages(stock_repo, product_id="prod-0") == [["SKU-000", "SKU-002"], ["SKU-004"]]
+        assert self._pages(stock_repo, warehouse_id="wh-0", product_id="prod-1") == [["SKU-003"]]
+        assert self._pages(stock_repo, warehouse_id="wh-9") == [[]]
+
+    def test_cursor_survives_deletes(self, stock_repo):
+        items = [stock_repo.save(_item(n, 10)) for n in range(5)]
+        page, cursor = stock_repo.query(limit=2)
+        stock_repo.delete(items[1].id)
+        stock_repo.delete(items[2].id)
+        page, cursor = stock_repo.query(cursor=cursor, limit=2)
+        assert [item.sku for item in page] == ["SKU-003", "SKU-004"]
+        assert cursor is None
+
+    def test_moved_item_listed_once(self, stock_repo):
+        items = [stock_repo.save(_item(n, 10)) for n in range(3)]
+        items[0].warehouse_id = "wh-2"
+        stock_repo.save(items[0])
+        assert self._pages(stock_repo) == [["SKU-001", "SKU-002"], ["SKU-000"]]
+
+    def test_invalid_cursor(self, stock_repo):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            stock_repo.query(cursor="abc")
+
+    def test_iter_items_batches(self, stock_service, sample_warehouse):
+        for n in range(5):
+            stock_service.add_inventory_item(f"prod-{n}", f"SKU-{n:03d}", sample_warehouse.id)
+        batches = list(stock_service.iter_items(warehouse_id=sample_warehouse.id, batch_size=2))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    def test_deleted_items_do_not_slow_later_pages(self, stock_repo):
+        items = [stock_repo.save(_item(n, 10)) for n in range(100)]
+        for item in items[:90]:
+            stock_repo.delete(item.id)
+        assert len(stock_repo._ordered._ids) < 50
+        page, cursor = stock_repo.query(warehouse_id="wh-1", limit=5)
+        assert [item.sku for item in page] == [f"SKU-{n:03d}" for n in range(90, 95)]
+        page, cursor = stock_repo.query(warehouse_id="wh-1", cursor=cursor, limit=5)
+        assert [item.sku for item in page] == [f"SKU-{n:03d}" for n in range(95, 100)]
+        assert cursor is None
@@ -1,5 +1,11 @@
 """Tests for StockService."""
+import sys
+import threading
+
 import pytest
+from services.stock_service import StockService, ConcurrentUpdateError, ReservationNotFoundError
+from models.reservation import ReservationStatus
+from models.warehouse import Warehouse
 
 
 class TestAddInventoryItem:
@@ -103,3 +109,303 @@ class TestStockQueries:
         movements = stock_service.get_movements(item.id)
         assert len(movements) == 2
 
+
+
+class TestConcurrentUpdates:
+    @pytest.mark.parametrize("mode", [StockService.OPTIMISTIC, StockService.LOCKING])
+    def test_concurrent_reservations_never_oversell(self, stock_repo, warehouse_repo,
+                                                    sample_warehouse, mode):
+        service = StockService(stock_repo, warehouse_repo, concurrency=mode)
+        item = service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=100)
+        successes = []
+
+        def worker():
+            for _ in range(25):
+                try:
+                    service.reserve_stock(item.id, 1)
+                    successes.append(1)
+                except ValueError as e:
+                    assert "Insufficient" in str(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # force frequent thread switches
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        stored = service.get_item(item.id)
+        assert len(successes) == 100
+        assert stored.reserved_quantity == 100
+        assert stored.version == item.version + 100
+
+    def test_stale_compare_and_save_rejected(self, stock_service, stock_repo, sample_warehouse):
+        from dataclasses import replace
+        item = stock_service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=10)
+        first, second = replace(item), replace(item)
+        first.quantity = 5
+        second.quantity = 7
+        assert stock_repo.compare_and_save(first, item.version) is True
+        assert stock_repo.compare_and_save(second, item.version) is False
+        assert stock_repo.find_by_id(item.id).quantity == 5
+
+    def test_update_gives_up_after_bounded_retries(self, stock_repo, warehouse_repo, sample_warehouse):
+        service = StockService(stock_repo, warehouse_repo)
+        item = service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=10)
+        stock_repo.compare_and_save = lambda item, expected_version: False
+        with pytest.raises(ConcurrentUpdateError):
+            service.reserve_stock(item.id, 1)
+        assert service.conflicts == StockService.MAX_UPDATE_ATTEMPTS
+
+    def test_failed_check_leaves_item_untouched(self, stock_service, sample_warehouse):
+        item = stock_service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=10)
+        with pytest.raises(ValueError):
+            stock_service.reserve_stock(item.id, 20)
+        stored = stock_service.get_item(item.id)
+        assert stored.reserved_quantity == 0
+        assert stored.version == item.version
+
+    def test_unknown_concurrency_mode(self, stock_repo, warehouse_repo):
+        with pytest.raises(ValueError, match="concurrency mode"):
+            StockService(stock_repo, warehouse_repo, concurrency="yolo")
+
+
+class TestReserveOrder:
+    def _items(self, stock_service, warehouse_id, *quantities):
+        return [
+            stock_service.add_inventory_item(f"prod-{n}", f"SKU-{n}", warehouse_id, quantity=q)
+            for n, q in enumerate(quantities)
+        ]
+
+    def test_reserve_order(self, stock_service, sample_warehouse):
+        a, b = self._items(stock_service, sample_warehouse.id, 10, 20)
+        items = stock_service.reserve_order("order-1", [(a.id, 3), (b.id, 5), (a.id, 2)])
+        assert [(i.id, i.reserved_quantity) for i in items] == [(a.id, 5), (b.id, 5)]
+        assert stock_service.get_item(a.id).available_quantity == 5
+
+    def test_reserve_order_is_all_or_nothing(self, stock_service, sample_warehouse):
+        a, b = self._items(stock_service, sample_warehouse.id, 10, 2)
+        with pytest.raises(ValueError, match="Insufficient"):
+            stock_service.reserve_order("order-1", [(a.id, 5), (b.id, 3)])
+        assert stock_service.get_item(a.id).reserved_quantity == 0
+        assert stock_service.get_item(b.id).reserved_quantity == 0
+
+    def test_unknown_item_reserves_nothing(self, stock_service, sample_warehouse):
+        (a,) = self._items(stock_service, sample_warehouse.id, 10)
+        with pytest.raises(ValueError, match="not found"):
+            stock_service.reserve_order("order-1", [(a.id, 5), ("missing", 1)])
+        assert stock_service.get_item(a.id).reserved_quantity == 0
+
+    def test_failed_order_can_be_retried(self, stock_service, sample_warehouse):
+        (a,) = self._items(stock_service, sample_warehouse.id, 10)
+        with pytest.raises(ValueError):
+            stock_service.reserve_order("order-1", [(a.id, 50)])
+        stock_service.reserve_order("order-1", [(a.id, 5)])
+
+    def test_duplicate_order_rejected(self, stock_service, sample_warehouse):
+        (a,) = self._items(stock_service, sample_warehouse.id, 10)
+        stock_service.reserve_order("order-1", [(a.id, 1)])
+        with pytest.raises(ValueError, match="already has reservations"):
+            stock_service.reserve_order("order-1", [(a.id, 1)])
+        assert stock_service.get_item(a.id).reserved_quantity == 1
+
+    def test_invalid_lines(self, stock_service, sample_warehouse):
+        (a,) = self._items(stock_service, sample_warehouse.id, 10)
+        with pytest.raises(ValueError, match="positive"):
+            stock_service.reserve_order("order-1", [(a.id, 0)])
+        with pytest.raises(ValueError, match="at least one line"):
+            stock_service.reserve_order("order-1", [])
+
+    def test_concurrent_overlapping_orders(self, stock_service, sample_warehouse):
+        items = self._items(stock_service, sample_warehouse.id, 50, 50, 50)
+        results = []
+
+        def place(n):
+            # Each order takes the items in a different order
+            lines = [(items[(n + k) % 3].id, 1) for k in range(3)]
+            try:
+                stock_service.reserve_order(f"order-{n}", lines)
+                results.append(True)
+            except ValueError:
+                results.append(False)
+
+        threads = [threading.Thread(target=place, args=(n,)) for n in range(80)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results.count(True) == 50
+        assert all(stock_service.get_item(i.id).reserved_quantity == 50 for i in items)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestReservationHolds:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def service(self, stock_repo, warehouse_repo, clock):
+        return StockService(stock_repo, warehouse_repo, clock=clock)
+
+    @pytest.fixture
+    def item(self, service, sample_warehouse):
+        return service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=10)
+
+    def test_hold_expires(self, service, item, clock):
+        service.reserve_order("order-1", [(item.id, 4)], hold_seconds=60)
+        clock.now += 59
+        assert service.expire_reservations() == []
+        assert service.get_item(item.id).reserved_quantity == 4
+
+        clock.now += 1
+        assert service.expire_reservations() == ["order-1"]
+        assert service.get_item(item.id).reserved_quantity == 0
+        assert service.get_reservations("order-1") == []
+
+    def test_extend_postpones_expiry(self, service, item, clock):
+        service.reserve_order("order-1", [(item.id, 4)], hold_seconds=60)
+        clock.now += 50
+        (reservation,) = service.extend_reservation("order-1", hold_seconds=60)
+        clock.now += 30
+        assert service.expire_reservations() == []
+        assert reservation.status == ReservationStatus.HELD
+        clock.now += 30
+        assert service.expire_reservations() == ["order-1"]
+        assert reservation.status == ReservationStatus.EXPIRED
+
+    def test_confirm_ships_held_stock(self, service, item, clock):
+        service.reserve_order("order-1", [(item.id, 4)])
+        (reservation,) = service.confirm_reservation("order-1")
+        stored = service.get_item(item.id)
+        assert reservation.status == ReservationStatus.CONFIRMED
+        assert (stored.quantity, stored.reserved_quantity) == (6, 0)
+        movements = service.get_movements(item.id)
+        assert movements[-1].reference_id == "order-1"
+
+        clock.now += service.DEFAULT_HOLD_SECONDS + 1
+        assert service.expire_reservations() == []
+        assert service.get_item(item.id).quantity == 6
+
+    def test_failed_confirm_ships_nothing(self, service, sample_warehouse):
+        items = [service.add_inventory_item(f"prod-{n}", f"SKU-00{n}", sample_warehouse.id, quantity=10)
+                 for n in range(3)]
+        service.reserve_order("order-1", [(item.id, 3) for item in items])
+        service.release_reservation(items[1].id, 3)
+        with pytest.raises(ValueError, match="reserved quantity"):
+            service.confirm_reservation("order-1")
+        assert [service.get_item(item.id).quantity for item in items] == [10, 10, 10]
+        assert len(service.get_reservations("order-1")) == 3
+
+        service.release_order("order-1")
+        assert service.get_item(items[0].id).reserved_quantity == 0
+        assert service.get_item(items[2].id).reserved_quantity == 0
+
+    def test_failed_confirm_keeps_expiry(self, service, item, clock):
+        service.reserve_order("order-1", [(item.id, 4)], hold_seconds=60)
+        service.release_reservation(item.id, 4)
+        with pytest.raises(ValueError):
+            service.confirm_reservation("order-1")
+        clock.now += 61
+        assert service.expire_reservations() == ["order-1"]
+
+    def test_adjust_cannot_go_below_reserved(self, service, item):
+        service.reserve_order("order-1", [(item.id, 3)])
+        with pytest.raises(ValueError, match="below reserved"):
+            service.adjust_stock(item.id, 1)
+        assert service.get_item(item.id).quantity == 10
+
+    def test_ship_reserved_never_goes_negative(self, service, stock_repo, item):
+        service.reserve_stock(item.id, 3)
+        stored = stock_repo.find_by_id(item.id)
+        stored.quantity = 1  # written directly, bypassing adjust_stock's check
+        stock_repo.save(stored)
+        with pytest.raises(ValueError, match="Insufficient stock"):
+            service.ship_stock(item.id, 3, from_reserved=True)
+        assert service.get_item(item.id).quantity == 1
+
+    def test_failed_release_is_recorded(self, service, stock_repo, item):
+        service.reserve_order("order-1", [(item.id, 4)])
+        stock_repo.delete(item.id)
+        (reservation,) = service.release_order("order-1")
+        assert reservation.status == ReservationStatus.RELEASED
+        assert "not found" in reservation.release_error
+        assert service.release_failures == 1
+
+    def test_release_order(self, service, item):
+        service.reserve_order("order-1", [(item.id, 4)])
+        (reservation,) = service.release_order("order-1")
+        assert reservation.status == ReservationStatus.RELEASED
+        assert service.get_item(item.id).reserved_quantity == 0
+        with pytest.raises(ReservationNotFoundError):
+            service.release_order("order-1")
+        with pytest.raises(ReservationNotFoundError):
+            service.confirm_reservation("order-1")
+
+    def test_invalid_hold(self, service, item):
+        with pytest.raises(ValueError, match="Hold must be"):
+            service.reserve_order("order-1", [(item.id, 1)], hold_seconds=0)
+        assert service.get_item(item.id).reserved_quantity == 0
+
+    def test_background_expiry(self, stock_repo, warehouse_repo, sample_warehouse):
+        clock = FakeClock()
+        service = StockService(stock_repo, warehouse_repo, clock=clock)
+        item = service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=10)
+        service.reserve_order("order-1", [(item.id, 4)], hold_seconds=1)
+        clock.now += 2
+        service.start_reservation_expiry(interval_seconds=0.01)
+        try:
+            for _ in range(200):
+                if service.get_item(item.id).reserved_quantity == 0:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            service.stop_reservation_expiry()
+        assert service.get_item(item.id).reserved_quantity == 0
+
+
+class TestAvailability:
+    @pytest.fixture
+    def stocked(self, stock_service, warehouse_repo, sample_warehouse):
+        west = warehouse_repo.save(Warehouse(name="West", code="WH-WEST-01", address="1 Main St",
+                                             city="Reno", state="NV"))
+        east_item = stock_service.add_inventory_item("prod-1", "SKU-001", sample_warehouse.id, quantity=30)
+        stock_service.add_inventory_item("prod-1", "SKU-001", west.id, quantity=20)
+        stock_service.add_inventory_item("prod-2", "SKU-002", west.id, quantity=5)
+        stock_service.reserve_stock(east_item.id, 10)
+        return sample_warehouse, west
+
+    def test_by_product(self, stock_service, stocked):
+        assert stock_service.get_availability(product_ids=["prod-1", "prod-2", "nope"]) == {
+            "prod-1": 40, "prod-2": 5, "nope": 0,
+        }
+
+    def test_by_sku_per_warehouse(self, stock_service, stocked):
+        east, west = stocked
+        result = stock_service.get_availability(skus=["SKU-001"], by_warehouse=True)
+        assert result == {"SKU-001": {"available": 40, "warehouses": {east.id: 20, west.id: 20}}}
+
+    def test_tracks_updates(self, stock_service, stock_repo, stocked):
+        item = stock_repo.find_by_sku_and_warehouse("SKU-002", stocked[1].id)
+        stock_service.ship_stock(item.id, 5)
+        assert stock_service.get_availability(skus=["SKU-002"]) == {"SKU-002": 0}
+
+    def test_requires_exactly_one_key_list(self, stock_service):
+        with pytest.raises(ValueError, match="either"):
+            stock_service.get_availability()
+        with pytest.raises(ValueError, match="either"):
+            stock_service.get_availability(product_ids=["a"], skus=["b"])
+        with pytest.raises(ValueError, match="list of strings"):
+            stock_service.get_availability(product_ids="prod-1")
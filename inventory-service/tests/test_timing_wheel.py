@@ -0,0 +1,65 @@
+"""Tests for TimingWheel."""
+import math
+import random
+
+import pytest
+from utils.timing_wheel import TimingWheel
+
+
+class TestTimingWheel:
+    def test_fires_at_deadline(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=8, levels=2)
+        wheel.schedule("a", 5)
+        assert wheel.advance(4) == []
+        assert wheel.advance(5) == ["a"]
+        assert len(wheel) == 0
+
+    def test_long_deadlines_cascade(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=4, levels=3)
+        wheel.schedule("a", 37)
+        assert wheel.advance(36) == []
+        assert wheel.advance(37) == ["a"]
+
+    def test_deadline_beyond_range_is_parked(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=4, levels=2)  # range is 16 ticks
+        wheel.schedule("a", 50)
+        assert wheel.advance(49) == []
+        assert wheel.advance(50) == ["a"]
+
+    def test_cancel_and_reschedule(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=8, levels=2)
+        wheel.schedule("a", 5)
+        wheel.schedule("b", 5)
+        assert wheel.cancel("a") is True
+        assert wheel.cancel("a") is False
+        wheel.schedule("b", 20)
+        assert wheel.advance(10) == []
+        assert "b" in wheel
+        assert wheel.advance(20) == ["b"]
+
+    def test_past_deadline_fires_on_next_tick(self):
+        wheel = TimingWheel(tick_seconds=1.0, start=100)
+        wheel.schedule("a", 50)
+        assert wheel.advance(101) == ["a"]
+
+    def test_invalid_dimensions(self):
+        with pytest.raises(ValueError):
+            TimingWheel(tick_seconds=0)
+
+    def test_randomized_against_deadlines(self):
+        rng = random.Random(7)
+        wheel = TimingWheel(tick_seconds=0.5, slots=4, levels=3)
+        deadlines = {key: rng.uniform(0, 200) for key in range(300)}
+        for key, deadline in deadlines.items():
+            wheel.schedule(key, deadline)
+
+        fired = {}
+        now = 0.0
+        while now < 210:
+            now += rng.choice([0.5, 0.5, 3, 11])
+            for key in wheel.advance(now):
+                fired[key] = now
+        assert fired.keys() == deadlines.keys()
+        for key, at in fired.items():
+            due = math.ceil(deadlines[key] / 0.5) * 0.5
+            assert at >= due
@@ -62,6 +62,23 @@ class TestWarehouseUtilization:
         with pytest.raises(ValueError, match="not found"):
             warehouse_service.get_warehouse_utilization("bad-id")
 
+    def test_utilization_report(self, warehouse_service, stock_service):
+        wh1 = warehouse_service.create_warehouse("WH1", "WH-01", "St1", "City", "ST", capacity=1000)
+        wh2 = warehouse_service.create_warehouse("WH2", "WH-02", "St2", "City", "ST", capacity=1000)
+        stock_service.add_inventory_item("prod-1", "SKU-001", wh1.id, quantity=100)
+        item = stock_service.add_inventory_item("prod-1", "SKU-001", wh2.id, quantity=500)
+        stock_service.reserve_stock(item.id, 200)
+        report = warehouse_service.get_utilization_report()
+        assert [r["warehouse_id"] for r in report] == [wh2.id, wh1.id]
+        assert report[0]["utilization_percent"] == 50.0
+        assert report[0]["available_stock"] == 300
+
+    def test_deactivate_after_stock_shipped(self, warehouse_service, stock_service):
+        wh = warehouse_service.create_warehouse("WH", "WH-01", "123 St", "City", "ST")
+        item = stock_service.add_inventory_item("prod-1", "SKU-001", wh.id, quantity=50)
+        stock_service.ship_stock(item.id, 50)
+        assert warehouse_service.deactivate_warehouse(wh.id) is True
+
 
 class TestWarehouseQueries:
     def test_list_active_only(self, warehouse_service):
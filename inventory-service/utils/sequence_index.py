@@ -0,0 +1,55 @@
+"""Sequence-ordered id lists with O(log n) cursor seeks."""
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+
+class SequenceIndex:
+    """Ids kept in ascending sequence-number order.
+
+    Ids must be appended with increasing sequence numbers, so both lists
+    stay sorted and a cursor (the last sequence number seen) is found by
+    binary search. Removing an id leaves a hole; holes are compacted away
+    once they outnumber live entries, so removal is amortized O(log n) and
+    a full walk never skips more holes than there are live ids.
+    """
+
+    __slots__ = ("_seqs", "_ids", "_holes")
+
+    def __init__(self):
+        self._seqs: List[int] = []
+        self._ids: List[Optional[str]] = []
+        self._holes = 0
+
+    def append(self, seq: int, item_id: str):
+        self._seqs.append(seq)
+        self._ids.append(item_id)
+
+    def remove(self, seq: int) -> bool:
+        index = bisect_left(self._seqs, seq)
+        if index == len(self._seqs) or self._seqs[index] != seq or self._ids[index] is None:
+            return False
+        self._ids[index] = None
+        self._holes += 1
+        if self._holes * 2 > len(self._ids):
+            self._compact()
+        return True
+
+    def after(self, seq: int) -> Iterator[Tuple[int, str]]:
+        """Yield (seq, id) for the live entries with a sequence number above ``seq``."""
+        seqs, ids = self._seqs, self._ids
+        for index in range(bisect_right(seqs, seq), len(ids)):
+            item_id = ids[index]
+            if item_id is not None:
+                yield seqs[index], item_id
+
+    def __iter__(self) -> Iterator[str]:
+        return (item_id for item_id in self._ids if item_id is not None)
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._holes
+
+    def _compact(self):
+        live = [(seq, item_id) for seq, item_id in zip(self._seqs, self._ids) if item_id is not None]
+        self._seqs = [seq for seq, _ in live]
+        self._ids = [item_id for _, item_id in live]
+        self._holes = 0
@@ -0,0 +1,102 @@
+"""Hierarchical timing wheel for expiring many deadlines cheaply."""
+import math
+import threading
+from typing import Dict, Hashable, List, Tuple
+
+
+class TimingWheel:
+    """Schedules keys to expire at deadlines, with O(1) schedule and cancel.
+
+    Level 0 has one slot per tick; each higher level has slots spanning a
+    whole turn of the level below. A deadline is placed on the lowest level
+    whose range covers it and cascades down a level each time the wheel
+    below completes a turn, so every entry is touched at most once per
+    level before it fires. Deadlines beyond the top level's range are parked
+    on the top level and re-placed when their slot comes round.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 64, levels: int = 4,
+                 start: float = 0.0):
+        if tick_seconds <= 0 or slots < 2 or levels < 1:
+            raise ValueError("Invalid timing wheel dimensions")
+        self._tick_seconds = tick_seconds
+        self._slots = slots
+        self._levels = levels
+        self._wheels: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._where: Dict[Hashable, Tuple[int, int]] = {}  # key -> (level, slot)
+        self._now_tick = int(start // tick_seconds)
+        self._lock = threading.Lock()
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Expire ``key`` at ``deadline`` (seconds), replacing any earlier schedule."""
+        with self._lock:
+            self._remove(key)
+            due_tick = max(math.ceil(deadline / self._tick_seconds), self._now_tick + 1)
+            self._insert(key, due_tick)
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel forward to ``now`` and return the keys that expired."""
+        expired = []
+        target = int(now // self._tick_seconds)
+        with self._lock:
+            while self._now_tick < target:
+                self._now_tick += 1
+                self._cascade()
+                slot = self._wheels[0][self._now_tick % self._slots]
+                if slot:
+                    entries = list(slot.items())
+                    slot.clear()
+                    for key, due_tick in entries:
+                        if due_tick <= self._now_tick:
+                            del self._where[key]
+                            expired.append(key)
+                        else:  # parked beyond the wheel's range
+                            self._insert(key, due_tick)
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _cascade(self):
+        # Caller holds the lock. Higher levels first, so entries can fall
+        # more than one level in a single tick.
+        for level in range(self._levels - 1, 0, -1):
+            span = self._slots ** level
+            if self._now_tick % span:
+                continue
+            slot = self._wheels[level][(self._now_tick // span) % self._slots]
+            if slot:
+                entries = list(slot.items())
+                slot.clear()
+                for key, due_tick in entries:
+                    self._insert(key, due_tick)
+
+    def _insert(self, key: Hashable, due_tick: int):
+        # Caller holds the lock
+        delta = due_tick - self._now_tick
+        level = 0
+        while level < self._levels - 1 and delta >= self._slots ** (level + 1):
+            level += 1
+        index = (due_tick // self._slots ** level) % self._slots
+        if delta < 0:
+            index = self._now_tick % self._slots  # overdue: fire on this tick
+        self._wheels[level][index][key] = due_tick
+        self._where[key] = (level, index)
+
+    def _remove(self, key: Hashable) -> bool:
+        # Caller holds the lock
+        location = self._where.pop(key, None)
+        if location is None:
+            return False
+        level, index = location
+        del self._wheels[level][index][key]
+        return True
@@ -2,7 +2,11 @@
 from fastapi import FastAPI
 from routes.auth_routes import router as auth_router
 from routes.user_routes import router as user_router
-from routes.address_routes import router as address_router
+from routes.address_routes import router as address_router, validation_router as address_validation_router
+from routes.profile_routes import router as profile_router
+from routes.cache_routes import router as cache_router
+from routes import dependencies
+from utils.request_profiler import install_profiler
 
 
 def create_app() -> FastAPI:
@@ -15,11 +19,19 @@ def create_app() -> FastAPI:
     app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
     app.include_router(user_router, prefix="/users", tags=["Users"])
     app.include_router(address_router, prefix="/users/{user_id}/addresses", tags=["Addresses"])
+    app.include_router(address_validation_router, prefix="/addresses", tags=["Addresses"])
 
     @app.get("/health")
     def health_check():
         return {"status": "healthy", "service": "user-service"}
 
+    if dependencies.user_cache is not None:
+        app.include_router(cache_router, prefix="/debug/user-cache", tags=["Caching"])
+
+    if dependencies.profiler is not None:
+        app.include_router(profile_router, prefix="/debug/profiles", tags=["Profiling"])
+        install_profiler(app, dependencies.profiler)
+
     return app
 
 
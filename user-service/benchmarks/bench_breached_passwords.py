@@ -0,0 +1,69 @@
+"""Lookup-latency benchmark for the memory-mapped breached-password corpus.
+
+Builds a synthetic corpus of random digests and times hit and miss lookups.
+
+    python benchmarks/bench_breached_passwords.py --records 5000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.breached_passwords import HEADER, MAGIC, BreachedPasswordChecker  # noqa: E402
+
+
+def write_synthetic_corpus(path: str, records: int, record_size: int) -> list:
+    """Write random sorted records directly (skipping the text format) and return samples."""
+    data = sorted({os.urandom(record_size) for _ in range(records)})
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, record_size, 0))
+        f.write(b"".join(data))
+    step = max(1, len(data) // 1000)
+    return data[::step]
+
+
+def time_lookups(checker: BreachedPasswordChecker, digests: list) -> list:
+    timings = []
+    for digest in digests:
+        started = time.perf_counter_ns()
+        checker.contains_digest(digest)
+        timings.append(time.perf_counter_ns() - started)
+    return timings
+
+
+def report(label: str, timings: list):
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(
+        f"{label:>6}: median {statistics.median(timings) / 1000:.1f} us, "
+        f"p99 {p99 / 1000:.1f} us over {len(timings)} lookups"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--record-size", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.bin")
+        started = time.perf_counter()
+        samples = write_synthetic_corpus(path, args.records, args.record_size)
+        print(f"built {args.records} records in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        checker = BreachedPasswordChecker(path)
+        print(f"opened corpus in {(time.perf_counter() - started) * 1e6:.0f} us")
+        with checker:
+            report("hits", time_lookups(checker, samples))
+            misses = [os.urandom(args.record_size) for _ in range(len(samples))]
+            report("misses", time_lookups(checker, misses))
+
+
+if __name__ == "__main__":
+    main()
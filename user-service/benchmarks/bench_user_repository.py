@@ -0,0 +1,66 @@
+"""Write-throughput benchmark for the striped-lock UserRepository.
+
+Runs concurrent creates and email/username renames across threads and
+reports operations per second.
+
+    python benchmarks/bench_user_repository.py --threads 16 --ops 2000
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.user import User  # noqa: E402
+from repositories.user_repository import UserRepository  # noqa: E402
+
+
+def _make_user(name: str) -> User:
+    return User(
+        email=f"user{name}@example.com",
+        username=f"user{name}",
+        hashed_password="x",
+        first_name="Bench",
+        last_name="User",
+    )
+
+
+def run(threads: int, ops: int) -> float:
+    """Create and rename ``ops`` users on each of ``threads`` threads; return seconds taken."""
+    repo = UserRepository()
+    barrier = threading.Barrier(threads + 1)
+
+    def hammer(index: int):
+        barrier.wait()
+        for n in range(ops):
+            user = repo.create(_make_user(f"{index}-{n}"))
+            user.email = f"moved{index}-{n}@example.com"
+            user.username = f"moved{index}-{n}"
+            repo.update(user)
+
+    workers = [threading.Thread(target=hammer, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    elapsed = run(args.threads, args.ops)
+    total_ops = args.threads * args.ops * 2
+    print(f"{total_ops} writes on {args.threads} threads in {elapsed:.2f}s "
+          f"({total_ops / elapsed:,.0f} ops/s)")
+
+
+if __name__ == "__main__":
+    main()
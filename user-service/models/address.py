@@ -1,6 +1,6 @@
 """Address model definitions."""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 import uuid
 
@@ -56,3 +56,23 @@ class AddressResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+
+
+class PostalAddress(BaseModel):
+    postal_code: str
+    country: str = "US"
+
+
+class AddressValidationRequest(BaseModel):
+    addresses: List[PostalAddress]
+
+
+class AddressValidationResult(BaseModel):
+    valid: bool
+    error: Optional[str] = None
+
+
+class AddressValidationResponse(BaseModel):
+    valid: int
+    invalid: int
+    results: List[AddressValidationResult]  # in request order
@@ -1,5 +1,6 @@
 """Session model definitions."""
 from datetime import datetime, timedelta
+from typing import Optional
 from pydantic import BaseModel, Field
 import uuid
 
@@ -8,8 +9,11 @@ class Session(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     token: str
+    generation: int = 0
+    device: Optional[str] = None
     is_active: bool = True
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_seen_at: datetime = Field(default_factory=datetime.utcnow)
     expires_at: datetime = Field(
         default_factory=lambda: datetime.utcnow() + timedelta(hours=24)
     )
@@ -38,3 +42,11 @@ class TokenPayload(BaseModel):
     exp: datetime
     iat: datetime = Field(default_factory=datetime.utcnow)
 
+
+class SessionSummary(BaseModel):
+    id: str
+    device: Optional[str] = None
+    created_at: datetime
+    last_seen_at: datetime
+    expires_at: datetime
+    current: bool = False
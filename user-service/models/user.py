@@ -1,6 +1,7 @@
 """User model definitions."""
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, List, Optional
 from pydantic import BaseModel, EmailStr, Field
 import uuid
 
@@ -17,6 +18,7 @@ class User(BaseModel):
     is_verified: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    last_login_at: Optional[datetime] = None
 
 
 class UserCreate(BaseModel):
@@ -47,3 +49,35 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+
+class BulkAction(str, Enum):
+    ACTIVATE = "activate"
+    DEACTIVATE = "deactivate"
+    VERIFY = "verify"
+    DELETE = "delete"
+
+
+class BulkActionRequest(BaseModel):
+    action: BulkAction
+    user_ids: List[str]
+
+
+class BulkActionResult(BaseModel):
+    user_id: str
+    applied: bool
+
+
+class BulkActionResponse(BaseModel):
+    action: BulkAction
+    succeeded: int
+    failed: int
+    results: List[BulkActionResult]  # in request order, duplicates removed
+
+
+class UserStats(BaseModel):
+    total: int
+    active: int
+    inactive: int
+    verified: int
+    unverified: int
+    signups_per_day: Dict[date, int]
@@ -70,6 +70,18 @@ class AddressRepository:
         self._user_addresses[user_id] = []
         return count
 
+    def delete_all_for_users(self, user_ids: List[str]) -> int:
+        """Delete every address belonging to any of the given users."""
+        count = 0
+        for user_id in user_ids:
+            for aid in self._user_addresses.pop(user_id, []):
+                if self._addresses.pop(aid, None) is not None:
+                    count += 1
+        return count
+
+    def count(self) -> int:
+        return len(self._addresses)
+
     def _unset_other_defaults(self, user_id: str, exclude_id: str):
         addresses = self.get_by_user_id(user_id)
         for addr in addresses:
@@ -0,0 +1,221 @@
+"""Two-tier user repository: a hot in-process LRU over a backing store."""
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from models.user import User
+from repositories.user_repository import UserRepository
+
+
+class CachedUserRepository:
+    """Bounded LRU of hot ``User`` records in front of a persistent repository.
+
+    Point reads by id and email are served from memory when possible; every
+    write goes to the backing store first and is then written through to
+    (or invalidated from) the cache. Queries that scan or aggregate
+    (``find``, ``stats``, ``count``, ``list_all``) always go to the backing
+    store, which owns the secondary indexes.
+
+    A read that misses only fills the cache if no write happened while it
+    was reading from the backing store, so a slow read cannot reinstate a
+    record that a concurrent write has just replaced.
+    """
+
+    def __init__(self, backing: UserRepository, max_size: int = 10000):
+        self._backing = backing
+        self._max_size = max_size
+        self._users: "OrderedDict[str, User]" = OrderedDict()
+        self._email_ids: Dict[str, str] = {}  # email -> user_id, for cached users only
+        # user_id -> email as indexed above. Callers mutate records in place,
+        # so the previous email cannot be read back from the record itself.
+        self._indexed_emails: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._epoch = 0  # bumped by every write; guards fills after a miss
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -- reads ---------------------------------------------------------------
+
+    def get_by_id(self, user_id: str) -> Optional[User]:
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is not None:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                return user
+            self.misses += 1
+            epoch = self._epoch
+        return self._fill(self._backing.get_by_id(user_id), epoch)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        with self._lock:
+            user_id = self._email_ids.get(email)
+            if user_id is not None:
+                user = self._users[user_id]
+                # Skip records whose email was changed in place but not yet saved
+                if user.email == email:
+                    self._users.move_to_end(user_id)
+                    self.hits += 1
+                    return user
+            self.misses += 1
+            epoch = self._epoch
+        return self._fill(self._backing.get_by_email(email), epoch)
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        return self._backing.get_by_username(username)
+
+    def list_all(self, skip: int = 0, limit: int = 100) -> List[User]:
+        return self._backing.list_all(skip=skip, limit=limit)
+
+    def find(
+        self,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[User]:
+        return self._backing.find(
+            is_active=is_active,
+            is_verified=is_verified,
+            created_from=created_from,
+            created_to=created_to,
+            skip=skip,
+            limit=limit,
+        )
+
+    def stats(self, since: Optional[date] = None) -> dict:
+        return self._backing.stats(since=since)
+
+    def count(self, is_active: Optional[bool] = None, is_verified: Optional[bool] = None) -> int:
+        return self._backing.count(is_active=is_active, is_verified=is_verified)
+
+    def recent_logins(self, limit: int) -> List[User]:
+        return self._backing.recent_logins(limit)
+
+    # -- writes --------------------------------------------------------------
+
+    def create(self, user: User) -> User:
+        created = self._backing.create(user)
+        self._write_through([created])
+        return created
+
+    def create_many(self, users: List[User]) -> List[User]:
+        # Bulk imports are not a sign of hotness; don't flush the cache for them
+        return self._backing.create_many(users)
+
+    def update(self, user: User) -> User:
+        try:
+            updated = self._backing.update(user)
+        except ValueError:
+            self._invalidate([user.id])
+            raise
+        self._write_through([updated])
+        return updated
+
+    def record_login(self, user_id: str, at: Optional[datetime] = None) -> Optional[User]:
+        user = self._backing.record_login(user_id, at)
+        if user is not None:
+            self._write_through([user])
+        return user
+
+    def delete(self, user_id: str) -> bool:
+        deleted = self._backing.delete(user_id)
+        self._invalidate([user_id])
+        return deleted
+
+    def bulk_set_flags(
+        self,
+        user_ids: List[str],
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+    ) -> List[str]:
+        updated = self._backing.bulk_set_flags(user_ids, is_active=is_active, is_verified=is_verified)
+        self._invalidate(updated)
+        return updated
+
+    def delete_many(self, user_ids: List[str]) -> List[str]:
+        deleted = self._backing.delete_many(user_ids)
+        self._invalidate(deleted)
+        return deleted
+
+    # -- cache management ----------------------------------------------------
+
+    def warm_up(self, limit: Optional[int] = None) -> int:
+        """Preload the most recently logged-in users, e.g. at startup.
+
+        Returns:
+            The number of users loaded.
+        """
+        users = self._backing.recent_logins(min(limit or self._max_size, self._max_size))
+        # Oldest first, so the most recent logins end up most recently used
+        with self._lock:
+            for user in reversed(users):
+                self._put(user)
+        return len(users)
+
+    def clear(self):
+        """Drop all cached users and reset the metrics."""
+        with self._lock:
+            self._epoch += 1
+            self._users.clear()
+            self._email_ids.clear()
+            self._indexed_emails.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def metrics(self) -> dict:
+        """Get cache size and hit-rate counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._users),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def _fill(self, user: Optional[User], epoch: int) -> Optional[User]:
+        if user is not None:
+            with self._lock:
+                if self._epoch == epoch:
+                    self._put(user)
+        return user
+
+    def _write_through(self, users: List[User]):
+        with self._lock:
+            self._epoch += 1
+            for user in users:
+                self._put(user)
+
+    def _invalidate(self, user_ids: List[str]):
+        with self._lock:
+            self._epoch += 1
+            for user_id in user_ids:
+                self._drop(user_id)
+
+    def _put(self, user: User):
+        # Caller holds the lock
+        old_email = self._indexed_emails.get(user.id)
+        if old_email is not None and old_email != user.email:
+            del self._email_ids[old_email]
+        self._users[user.id] = user
+        self._users.move_to_end(user.id)
+        self._email_ids[user.email] = user.id
+        self._indexed_emails[user.id] = user.email
+        while len(self._users) > self._max_size:
+            evicted_id, _ = self._users.popitem(last=False)
+            del self._email_ids[self._indexed_emails.pop(evicted_id)]
+            self.evictions += 1
+
+    def _drop(self, user_id: str):
+        # Caller holds the lock
+        if self._users.pop(user_id, None) is not None:
+            del self._email_ids[self._indexed_emails.pop(user_id)]
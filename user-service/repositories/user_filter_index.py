@@ -0,0 +1,253 @@
+"""Secondary indexes for filtered user listing."""
+import bisect
+import heapq
+import threading
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from models.user import User
+
+# Bits of a user's flag combination
+ACTIVE = 1
+VERIFIED = 2
+
+
+class UserFilterIndex:
+    """Per-flag-combination indexes over users.
+
+    Each user holds a slot number, and slots freed by deletes are reused.
+    Users are kept in one sorted list of ``(created_at, slot)`` pairs per
+    combination of the ``is_active`` and ``is_verified`` flags. Counts are
+    list lengths, and a query merges only the lists matching its flags from
+    the start of its creation-date range, stopping once it has
+    ``skip + limit`` results. A per-day signup histogram is maintained
+    alongside, so statistics never need a scan.
+    """
+
+    def __init__(self):
+        self._slots: Dict[str, int] = {}  # user_id -> slot
+        self._slot_users: List[Optional[str]] = []  # slot -> user_id
+        self._slot_created: List[Optional[datetime]] = []  # slot -> indexed created_at
+        self._slot_flags = bytearray()  # slot -> flag combination
+        self._free_slots: List[int] = []
+        # flag combination -> sorted (created_at, slot) pairs
+        self._by_flags: List[List[Tuple[datetime, int]]] = [[] for _ in range(4)]
+        self._signups_by_day: Dict[date, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _combination(is_active: bool, is_verified: bool) -> int:
+        return (ACTIVE if is_active else 0) | (VERIFIED if is_verified else 0)
+
+    @staticmethod
+    def _combinations(is_active: Optional[bool], is_verified: Optional[bool]) -> List[int]:
+        return [
+            flags for flags in range(4)
+            if (is_active is None or bool(flags & ACTIVE) == is_active)
+            and (is_verified is None or bool(flags & VERIFIED) == is_verified)
+        ]
+
+    def add(self, user: User):
+        with self._lock:
+            self._add(user)
+
+    def add_many(self, users: Iterable[User]):
+        with self._lock:
+            added: Dict[int, List[Tuple[datetime, int]]] = {}
+            for user in users:
+                flags, key = self._assign_slot(user)
+                added.setdefault(flags, []).append(key)
+            # Bulk loads usually arrive in creation order and just extend
+            # each list; otherwise one sort per list beats an insort per user.
+            for flags, keys in added.items():
+                entries = self._by_flags[flags]
+                keys.sort()
+                if entries and keys[0] < entries[-1]:
+                    entries.extend(keys)
+                    entries.sort()
+                else:
+                    entries.extend(keys)
+
+    def _add(self, user: User):
+        flags, key = self._assign_slot(user)
+        bisect.insort(self._by_flags[flags], key)
+
+    def _assign_slot(self, user: User) -> Tuple[int, Tuple[datetime, int]]:
+        """Give a user a slot; returns its flag combination and list entry."""
+        flags = self._combination(user.is_active, user.is_verified)
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_users[slot] = user.id
+            self._slot_created[slot] = user.created_at
+            self._slot_flags[slot] = flags
+        else:
+            slot = len(self._slot_users)
+            self._slot_users.append(user.id)
+            self._slot_created.append(user.created_at)
+            self._slot_flags.append(flags)
+        self._slots[user.id] = slot
+        self._count_signup(user.created_at, 1)
+        return flags, (user.created_at, slot)
+
+    def update(self, user: User):
+        with self._lock:
+            entry = self._update(user)
+            if entry is not None:
+                old, new = entry
+                self._delete_entry(*old)
+                bisect.insort(self._by_flags[new[0]], new[1])
+
+    def update_many(self, users: Iterable[User]):
+        with self._lock:
+            removed: Dict[int, Set[int]] = {}
+            added: Dict[int, List[Tuple[datetime, int]]] = {}
+            for user in users:
+                entry = self._update(user)
+                if entry is not None:
+                    (old_flags, old_key), (new_flags, new_key) = entry
+                    removed.setdefault(old_flags, set()).add(old_key[1])
+                    added.setdefault(new_flags, []).append(new_key)
+            # One rebuild per changed list instead of a list move per user.
+            for flags in removed.keys() | added.keys():
+                drop = removed.get(flags)
+                entries = self._by_flags[flags]
+                if drop:
+                    entries = [e for e in entries if e[1] not in drop]
+                entries.extend(added.get(flags, ()))
+                entries.sort()
+                self._by_flags[flags] = entries
+
+    def _update(self, user: User):
+        """Record a user's new flags and creation date.
+
+        Returns the ``(flags, key)`` pairs to move the user's list entry from
+        and to, or None if it stays where it is.
+        """
+        slot = self._slots.get(user.id)
+        if slot is None:
+            return None
+        old_flags, old_created = self._slot_flags[slot], self._slot_created[slot]
+        flags = self._combination(user.is_active, user.is_verified)
+        if flags == old_flags and user.created_at == old_created:
+            return None
+        if user.created_at != old_created:
+            self._count_signup(old_created, -1)
+            self._count_signup(user.created_at, 1)
+            self._slot_created[slot] = user.created_at
+        self._slot_flags[slot] = flags
+        return (old_flags, (old_created, slot)), (flags, (user.created_at, slot))
+
+    def remove(self, user_id: str):
+        with self._lock:
+            slot = self._slots.get(user_id)
+            if slot is not None:
+                self._delete_entry(self._slot_flags[slot], (self._slot_created[slot], slot))
+                self._remove(user_id)
+
+    def remove_many(self, user_ids: Iterable[str]):
+        with self._lock:
+            removed: Dict[int, Set[int]] = {}
+            for user_id in user_ids:
+                slot = self._slots.get(user_id)
+                if slot is not None:
+                    removed.setdefault(self._slot_flags[slot], set()).add(slot)
+                    self._remove(user_id)
+            # One filtering pass per list instead of a list deletion per user.
+            for flags, slots in removed.items():
+                self._by_flags[flags] = [e for e in self._by_flags[flags] if e[1] not in slots]
+
+    def _remove(self, user_id: str):
+        slot = self._slots.pop(user_id)
+        self._count_signup(self._slot_created[slot], -1)
+        self._slot_users[slot] = None
+        self._slot_created[slot] = None
+        self._free_slots.append(slot)
+
+    def _delete_entry(self, flags: int, key: Tuple[datetime, int]):
+        entries = self._by_flags[flags]
+        pos = bisect.bisect_left(entries, key)
+        if pos < len(entries) and entries[pos] == key:
+            del entries[pos]
+
+    def _count_signup(self, created_at: datetime, delta: int):
+        day = created_at.date()
+        remaining = self._signups_by_day.get(day, 0) + delta
+        if remaining:
+            self._signups_by_day[day] = remaining
+        else:
+            self._signups_by_day.pop(day, None)
+
+    def _count_flags(self, flag: int, value: bool) -> int:
+        return sum(len(entries) for flags, entries in enumerate(self._by_flags)
+                   if bool(flags & flag) == value)
+
+    def count(self, is_active: Optional[bool] = None, is_verified: Optional[bool] = None) -> int:
+        """Count users matching the flag filters."""
+        return sum(len(self._by_flags[flags]) for flags in self._combinations(is_active, is_verified))
+
+    def stats(self, since: Optional[date] = None) -> dict:
+        """Snapshot the maintained counters.
+
+        Returns totals by flag and signups per day, limited to days on or
+        after ``since`` when given.
+        """
+        with self._lock:
+            total = len(self._slots)
+            active = self._count_flags(ACTIVE, True)
+            verified = self._count_flags(VERIFIED, True)
+            if since is None:
+                signups = dict(self._signups_by_day)
+            else:
+                # Walk the requested window rather than the whole histogram
+                signups = {}
+                day, today = since, datetime.utcnow().date()
+                while day <= today:
+                    if day in self._signups_by_day:
+                        signups[day] = self._signups_by_day[day]
+                    day += timedelta(days=1)
+            return {
+                "total": total,
+                "active": active,
+                "inactive": total - active,
+                "verified": verified,
+                "unverified": total - verified,
+                "signups_per_day": dict(sorted(signups.items())),
+            }
+
+    def find_ids(
+        self,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[str]:
+        """Find user ids matching all filters.
+
+        Results are in creation order. ``created_from`` is inclusive and
+        ``created_to`` exclusive.
+        """
+        with self._lock:
+            ranges = [
+                self._created_range(self._by_flags[flags], created_from, created_to)
+                for flags in self._combinations(is_active, is_verified)
+            ]
+            matches = islice(heapq.merge(*ranges), skip, skip + limit)
+            return [self._slot_users[slot] for _, slot in matches]
+
+    @staticmethod
+    def _created_range(
+        entries: List[Tuple[datetime, int]],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+    ) -> Iterator[Tuple[datetime, int]]:
+        lo = 0
+        hi = len(entries)
+        if created_from is not None:
+            lo = bisect.bisect_left(entries, (created_from, -1))
+        if created_to is not None:
+            hi = bisect.bisect_left(entries, (created_to, -1))
+        for i in range(lo, hi):
+            yield entries[i]
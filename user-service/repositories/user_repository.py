@@ -1,27 +1,75 @@
 """In-memory user repository."""
-from typing import Dict, List, Optional
+import heapq
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
 from models.user import User
+from repositories.user_filter_index import UserFilterIndex
+from utils.striped_lock import StripedLock
 
 
 class UserRepository:
-    """Repository for user data access with in-memory storage."""
+    """Repository for user data access with in-memory storage.
 
-    def __init__(self):
+    Writes lock the stripes for the user id, email and username they touch,
+    so concurrent writes to unrelated users proceed in parallel while
+    conflicting registrations and renames serialize.
+    """
+
+    def __init__(self, lock_stripes: int = 64):
         self._users: Dict[str, User] = {}
         self._email_index: Dict[str, str] = {}  # email -> user_id
         self._username_index: Dict[str, str] = {}  # username -> user_id
+        # user_id -> (email, username) as currently indexed. Callers mutate
+        # stored records in place, so the previous keys cannot be read back
+        # from the record itself.
+        self._indexed_keys: Dict[str, Tuple[str, str]] = {}
+        self._filters = UserFilterIndex()
+        self._locks = StripedLock(lock_stripes)
+
+    @staticmethod
+    def _lock_keys(user_id: str, email: str, username: str) -> tuple:
+        return ("id:" + user_id, "email:" + email, "username:" + username)
 
     def create(self, user: User) -> User:
-        if user.email in self._email_index:
-            raise ValueError(f"User with email '{user.email}' already exists")
-        if user.username in self._username_index:
-            raise ValueError(f"User with username '{user.username}' already exists")
-
-        self._users[user.id] = user
-        self._email_index[user.email] = user.id
-        self._username_index[user.username] = user.id
+        with self._locks.acquire(*self._lock_keys(user.id, user.email, user.username)):
+            if user.email in self._email_index:
+                raise ValueError(f"User with email '{user.email}' already exists")
+            if user.username in self._username_index:
+                raise ValueError(f"User with username '{user.username}' already exists")
+
+            self._users[user.id] = user
+            self._email_index[user.email] = user.id
+            self._username_index[user.username] = user.id
+            self._indexed_keys[user.id] = (user.email, user.username)
+            self._filters.add(user)
         return user
 
+    def create_many(self, users: List[User]) -> List[User]:
+        """Insert many users in one transaction, for imports and bulk loads.
+
+        Either every user is inserted or, if any email or username is already
+        taken (or repeated within the batch), none are.
+        """
+        with self._locks.acquire_all():
+            emails = set()
+            usernames = set()
+            for user in users:
+                if user.email in self._email_index or user.email in emails:
+                    raise ValueError(f"User with email '{user.email}' already exists")
+                if user.username in self._username_index or user.username in usernames:
+                    raise ValueError(f"User with username '{user.username}' already exists")
+                emails.add(user.email)
+                usernames.add(user.username)
+
+            for user in users:
+                self._users[user.id] = user
+                self._email_index[user.email] = user.id
+                self._username_index[user.username] = user.id
+                self._indexed_keys[user.id] = (user.email, user.username)
+            self._filters.add_many(users)
+        return users
+
     def get_by_id(self, user_id: str) -> Optional[User]:
         return self._users.get(user_id)
 
@@ -38,37 +86,155 @@ class UserRepository:
         return None
 
     def update(self, user: User) -> User:
-        if user.id not in self._users:
-            raise ValueError(f"User with id '{user.id}' not found")
-
-        old_user = self._users[user.id]
-
-        # Update indexes if email or username changed
-        if old_user.email != user.email:
-            del self._email_index[old_user.email]
-            self._email_index[user.email] = user.id
-
-        if old_user.username != user.username:
-            del self._username_index[old_user.username]
-            self._username_index[user.username] = user.id
-
-        self._users[user.id] = user
-        return user
+        while True:
+            indexed = self._indexed_keys.get(user.id)
+            if indexed is None:
+                raise ValueError(f"User with id '{user.id}' not found")
+            old_email, old_username = indexed
+
+            with self._locks.acquire(
+                *self._lock_keys(user.id, old_email, old_username),
+                "email:" + user.email,
+                "username:" + user.username,
+            ):
+                # Another writer renamed this user while we waited; retry
+                # with the fresh keys.
+                if self._indexed_keys.get(user.id) != indexed:
+                    continue
+
+                if old_email != user.email and user.email in self._email_index:
+                    raise ValueError(f"User with email '{user.email}' already exists")
+                if old_username != user.username and user.username in self._username_index:
+                    raise ValueError(f"User with username '{user.username}' already exists")
+
+                # Update indexes if email or username changed
+                if old_email != user.email:
+                    del self._email_index[old_email]
+                    self._email_index[user.email] = user.id
+
+                if old_username != user.username:
+                    del self._username_index[old_username]
+                    self._username_index[user.username] = user.id
+
+                self._users[user.id] = user
+                self._indexed_keys[user.id] = (user.email, user.username)
+                self._filters.update(user)
+                return user
 
     def delete(self, user_id: str) -> bool:
-        user = self._users.get(user_id)
-        if not user:
-            return False
-
-        del self._email_index[user.email]
-        del self._username_index[user.username]
-        del self._users[user_id]
-        return True
+        while True:
+            indexed = self._indexed_keys.get(user_id)
+            if indexed is None:
+                return False
+            email, username = indexed
+
+            with self._locks.acquire(*self._lock_keys(user_id, email, username)):
+                if self._indexed_keys.get(user_id) != indexed:
+                    continue
+                del self._email_index[email]
+                del self._username_index[username]
+                del self._indexed_keys[user_id]
+                del self._users[user_id]
+                self._filters.remove(user_id)
+                return True
 
     def list_all(self, skip: int = 0, limit: int = 100) -> List[User]:
         users = list(self._users.values())
         return users[skip: skip + limit]
 
-    def count(self) -> int:
-        return len(self._users)
+    def record_login(self, user_id: str, at: Optional[datetime] = None) -> Optional[User]:
+        """Stamp a user's last successful login time."""
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        # Not an indexed field, so no stripe locks are needed
+        user.last_login_at = at or datetime.utcnow()
+        return user
 
+    def recent_logins(self, limit: int) -> List[User]:
+        """Get the most recently logged-in users, newest first."""
+        return heapq.nlargest(
+            limit,
+            (u for u in self._users.values() if u.last_login_at is not None),
+            key=attrgetter("last_login_at"),
+        )
+
+    def bulk_set_flags(
+        self,
+        user_ids: List[str],
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+    ) -> List[str]:
+        """Set status flags on many users in one transaction.
+
+        Returns the ids that were found and updated.
+        """
+        changes = {"updated_at": datetime.utcnow()}
+        if is_active is not None:
+            changes["is_active"] = is_active
+        if is_verified is not None:
+            changes["is_verified"] = is_verified
+
+        updated = []
+        with self._locks.acquire_all():
+            users = []
+            for uid in user_ids:
+                user = self._users.get(uid)
+                if user is None:
+                    continue
+                # The values are already valid field types, so a copy skips
+                # re-validation without bypassing the model
+                user = user.model_copy(update=changes)
+                self._users[uid] = user
+                users.append(user)
+                updated.append(uid)
+            self._filters.update_many(users)
+        return updated
+
+    def delete_many(self, user_ids: List[str]) -> List[str]:
+        """Delete many users in one transaction.
+
+        Returns the ids that were found and deleted.
+        """
+        deleted = []
+        with self._locks.acquire_all():
+            for user_id in user_ids:
+                indexed = self._indexed_keys.pop(user_id, None)
+                if indexed is None:
+                    continue
+                email, username = indexed
+                del self._email_index[email]
+                del self._username_index[username]
+                del self._users[user_id]
+                deleted.append(user_id)
+            self._filters.remove_many(deleted)
+        return deleted
+
+    def find(
+        self,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[User]:
+        """List users matching flag and creation-date filters via the secondary indexes."""
+        user_ids = self._filters.find_ids(
+            is_active=is_active,
+            is_verified=is_verified,
+            created_from=created_from,
+            created_to=created_to,
+            skip=skip,
+            limit=limit,
+        )
+        return [self._users[uid] for uid in user_ids if uid in self._users]
+
+    def stats(self, since: Optional[date] = None) -> dict:
+        """Get maintained user counters and the per-day signup histogram."""
+        return self._filters.stats(since=since)
+
+    def count(self, is_active: Optional[bool] = None, is_verified: Optional[bool] = None) -> int:
+        if is_active is None and is_verified is None:
+            return len(self._users)
+        return self._filters.count(is_active=is_active, is_verified=is_verified)
@@ -1,18 +1,23 @@
 """Address route handlers."""
-from fastapi import APIRouter, HTTPException
-from typing import List
-
-from models.address import AddressCreate, AddressUpdate, AddressResponse
+from fastapi import APIRouter, Header, HTTPException, Request
+from typing import List, Optional
+
+from models.address import (
+    AddressCreate,
+    AddressUpdate,
+    AddressResponse,
+    AddressValidationRequest,
+    AddressValidationResponse,
+)
 from services.address_service import AddressService
-from repositories.address_repository import AddressRepository
-from repositories.user_repository import UserRepository
+from routes import dependencies
+from routes.idempotency import run_idempotent
 
 router = APIRouter()
+# Address operations that are not scoped to a user, mounted at /addresses
+validation_router = APIRouter()
 
-# Initialize dependencies
-_address_repo = AddressRepository()
-_user_repo = UserRepository()
-_address_service = AddressService(_address_repo, _user_repo)
+_address_service = dependencies.address_service
 
 
 def get_address_service() -> AddressService:
@@ -20,12 +25,22 @@ def get_address_service() -> AddressService:
 
 
 @router.post("/", response_model=AddressResponse, status_code=201)
-def add_address(user_id: str, address_data: AddressCreate):
+def add_address(
+    request: Request,
+    user_id: str,
+    address_data: AddressCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     """Add a new address for a user."""
-    try:
-        return _address_service.add_address(user_id, address_data)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    def handler():
+        try:
+            return _address_service.add_address(user_id, address_data)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(
+        request, idempotency_key, f"POST /users/{user_id}/addresses", address_data, handler
+    )
 
 
 @router.get("/", response_model=List[AddressResponse])
@@ -80,3 +95,11 @@ def set_default_address(user_id: str, address_id: str):
         raise HTTPException(status_code=404, detail="Address not found")
     return address
 
+
+@validation_router.post("/validate-batch", response_model=AddressValidationResponse)
+def validate_batch(request: AddressValidationRequest):
+    """Validate the postal codes of many addresses in one call."""
+    try:
+        return _address_service.validate_addresses(request.addresses)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,20 +1,14 @@
 """Authentication route handlers."""
 from fastapi import APIRouter, HTTPException, Header
-from typing import Optional
+from typing import List, Optional
 
-from models.session import LoginRequest, LoginResponse
+from models.session import LoginRequest, LoginResponse, SessionSummary
 from services.auth_service import AuthService
-from repositories.user_repository import UserRepository
-from utils.password_hasher import PasswordHasher
-from utils.token_manager import TokenManager
+from routes import dependencies
 
 router = APIRouter()
 
-# Initialize dependencies (in production, use proper DI)
-_user_repo = UserRepository()
-_hasher = PasswordHasher()
-_token_manager = TokenManager()
-_auth_service = AuthService(_user_repo, _hasher, _token_manager)
+_auth_service = dependencies.auth_service
 
 
 def get_auth_service() -> AuthService:
@@ -22,9 +16,9 @@ def get_auth_service() -> AuthService:
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(login_data: LoginRequest):
+def login(login_data: LoginRequest, user_agent: Optional[str] = Header(None)):
     """Authenticate a user and return an access token."""
-    result = _auth_service.login(login_data)
+    result = _auth_service.login(login_data, device=user_agent)
     if not result:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     return result
@@ -67,3 +61,29 @@ def change_password(
         raise HTTPException(status_code=400, detail="Invalid old password")
     return {"message": "Password changed successfully"}
 
+
+def _authenticate(authorization: Optional[str]) -> tuple:
+    """Resolve a Bearer header to (token, user_id) or raise 401."""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing authorization header")
+
+    token = authorization.replace("Bearer ", "")
+    user_id = _auth_service.validate_token(token)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return token, user_id
+
+
+@router.get("/sessions", response_model=List[SessionSummary])
+def list_sessions(authorization: Optional[str] = Header(None)):
+    """List the current user's active sessions."""
+    token, user_id = _authenticate(authorization)
+    return _auth_service.list_sessions(user_id, current_token=token)
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+def revoke_session(session_id: str, authorization: Optional[str] = Header(None)):
+    """Log out one of the current user's sessions."""
+    _, user_id = _authenticate(authorization)
+    if not _auth_service.revoke_session(user_id, session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
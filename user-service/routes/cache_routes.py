@@ -0,0 +1,14 @@
+"""Route handlers for inspecting the hot user cache."""
+from fastapi import APIRouter, HTTPException
+
+from routes import dependencies
+
+router = APIRouter()
+
+
+@router.get("/", response_model=dict)
+def get_user_cache_metrics():
+    """Get hot user cache size and hit-rate counters."""
+    if dependencies.user_cache is None:
+        raise HTTPException(status_code=404, detail="User cache is disabled")
+    return dependencies.user_cache.metrics()
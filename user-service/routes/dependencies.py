@@ -0,0 +1,74 @@
+"""Shared service instances for the route modules.
+
+All routers must see the same repositories and caches; otherwise a user
+registered through ``/users`` could not log in through ``/auth``, and cache
+invalidation from one router would not reach another.
+"""
+import os
+
+from repositories.user_repository import UserRepository
+from repositories.address_repository import AddressRepository
+from repositories.cached_user_repository import CachedUserRepository
+from services.user_service import UserService
+from services.auth_service import AuthService
+from services.address_service import AddressService
+from utils.breached_passwords import BreachedPasswordChecker
+from utils.password_hasher import PasswordHasher
+from utils.principal_cache import PrincipalCache
+from utils.token_manager import TokenManager
+from utils.token_generations import TokenGenerationTable
+from utils.revoked_sessions import RevokedSessionTable
+from utils.idempotency_store import IdempotencyStore
+from utils.request_profiler import RequestProfiler
+from utils.user_projection import UserProjector
+
+# Initialize dependencies (in production, use proper DI)
+user_repo = UserRepository()
+# Optional hot-user LRU in front of the repository, warmed from recent logins.
+# Worth enabling once the repository is backed by durable storage.
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "0"))
+user_cache = None
+if USER_CACHE_SIZE > 0:
+    user_cache = CachedUserRepository(user_repo, max_size=USER_CACHE_SIZE)
+    user_cache.warm_up()
+    user_repo = user_cache
+address_repo = AddressRepository()
+# Optional local breached-password corpus, built with `python -m utils.breached_passwords`
+BREACHED_PASSWORDS_FILE = os.environ.get("BREACHED_PASSWORDS_FILE")
+breached_checker = (
+    BreachedPasswordChecker(BREACHED_PASSWORDS_FILE) if BREACHED_PASSWORDS_FILE else None
+)
+hasher = PasswordHasher(breached_checker=breached_checker)
+token_manager = TokenManager()
+principal_cache = PrincipalCache()
+token_generations = TokenGenerationTable()
+revoked_sessions = RevokedSessionTable()
+idempotency_store = IdempotencyStore()
+
+user_service = UserService(
+    user_repo,
+    hasher,
+    principal_cache,
+    address_repository=address_repo,
+    token_generations=token_generations,
+)
+auth_service = AuthService(
+    user_repo,
+    hasher,
+    token_manager,
+    token_generations=token_generations,
+    principal_cache=principal_cache,
+    revoked_sessions=revoked_sessions,
+)
+address_service = AddressService(address_repo, user_repo)
+user_projector = UserProjector()
+
+# Opt-in request profiling; disabled (None) unless a token or sample rate is set
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/user-service-profiles")
+profiler = (
+    RequestProfiler(PROFILE_DIR, sample_rate=PROFILE_SAMPLE_RATE, token=PROFILE_TOKEN)
+    if PROFILE_TOKEN or PROFILE_SAMPLE_RATE > 0
+    else None
+)
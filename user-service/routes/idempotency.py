@@ -0,0 +1,71 @@
+"""Idempotency-Key support for POST route handlers."""
+import hashlib
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+
+from routes import dependencies
+from utils.idempotency_store import IdempotencyKeyMismatch, IdempotencyKeyInProgress
+
+
+# Never part of a request fingerprint, so the store holds no digest of them
+SECRET_FIELDS = {"password"}
+
+
+class _StoredHTTPError(NamedTuple):
+    """An HTTPException outcome, stored as data and rebuilt for every replay."""
+
+    status_code: int
+    detail: Any
+    headers: Optional[Dict[str, str]]
+
+
+def _caller(request: Request) -> str:
+    """Namespace for a request's idempotency keys: its user, else its client address."""
+    authorization = request.headers.get("Authorization")
+    if authorization and authorization.startswith("Bearer "):
+        user_id = dependencies.auth_service.validate_token(authorization.replace("Bearer ", ""))
+        if user_id:
+            return f"user:{user_id}"
+    return f"client:{request.client.host if request.client else ''}"
+
+
+def run_idempotent(
+    request: Request,
+    idempotency_key: Optional[str],
+    scope: str,
+    payload: BaseModel,
+    handler: Callable[[], Any],
+) -> Any:
+    """Run a handler once per Idempotency-Key, replaying the stored outcome on retries.
+
+    ``scope`` identifies the endpoint (including path parameters) so that a
+    key reused against a different resource is rejected rather than replayed.
+    Keys are namespaced per caller, so callers cannot replay each other's
+    responses by guessing a key.
+    """
+    if not idempotency_key:
+        return handler()
+
+    fingerprint = payload.model_dump_json(exclude=SECRET_FIELDS & set(type(payload).model_fields))
+    request_hash = hashlib.sha256(f"{scope}\n{fingerprint}".encode("utf-8")).hexdigest()
+
+    def outcome():
+        # HTTP errors are deterministic outcomes and are replayed like successes
+        try:
+            return handler()
+        except HTTPException as e:
+            return _StoredHTTPError(e.status_code, e.detail, e.headers)
+
+    try:
+        result = dependencies.idempotency_store.run(
+            idempotency_key, request_hash, outcome, namespace=_caller(request)
+        )
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyKeyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if isinstance(result, _StoredHTTPError):
+        raise HTTPException(status_code=result.status_code, detail=result.detail, headers=result.headers)
+    return result
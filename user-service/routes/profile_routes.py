@@ -0,0 +1,31 @@
+"""Route handlers for browsing recorded request profiles."""
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import FileResponse
+from typing import List, Optional
+
+from routes import dependencies
+from utils.request_profiler import RequestProfiler
+
+router = APIRouter()
+
+
+def _require_token(token: Optional[str]):
+    profiler = dependencies.profiler
+    if profiler is None or not profiler.is_authorized(token):
+        raise HTTPException(status_code=403, detail="Profiling access denied")
+    return profiler
+
+
+@router.get("/", response_model=List[dict])
+def list_profiles(x_profile: Optional[str] = Header(None, alias=RequestProfiler.HEADER)):
+    """List recent request profiles, newest first."""
+    return _require_token(x_profile).list_profiles()
+
+
+@router.get("/{name}")
+def download_profile(name: str, x_profile: Optional[str] = Header(None, alias=RequestProfiler.HEADER)):
+    """Download a profile in pstats format."""
+    path = _require_token(x_profile).profile_path(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
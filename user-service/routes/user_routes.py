@@ -1,18 +1,24 @@
 """User route handlers."""
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
-
-from models.user import UserCreate, UserUpdate, UserResponse
+from datetime import datetime
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from typing import Optional
+
+from models.user import (
+    UserCreate,
+    UserUpdate,
+    UserResponse,
+    BulkActionRequest,
+    BulkActionResponse,
+    UserStats,
+)
 from services.user_service import UserService
-from repositories.user_repository import UserRepository
-from utils.password_hasher import PasswordHasher
+from routes import dependencies
+from routes.idempotency import run_idempotent
 
 router = APIRouter()
 
-# Initialize dependencies
-_user_repo = UserRepository()
-_hasher = PasswordHasher()
-_user_service = UserService(_user_repo, _hasher)
+_user_service = dependencies.user_service
+_user_projector = dependencies.user_projector
 
 
 def get_user_service() -> UserService:
@@ -20,18 +26,72 @@ def get_user_service() -> UserService:
 
 
 @router.post("/", response_model=UserResponse, status_code=201)
-def create_user(user_data: UserCreate):
+def create_user(
+    request: Request,
+    user_data: UserCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     """Register a new user."""
+    def handler():
+        try:
+            return _user_service.create_user(user_data)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(request, idempotency_key, "POST /users", user_data, handler)
+
+
+@router.post("/bulk-actions", response_model=BulkActionResponse)
+def bulk_action(request: BulkActionRequest):
+    """Activate, deactivate, verify or delete many users in one call."""
     try:
-        return _user_service.create_user(user_data)
+        return _user_service.bulk_action(request.action, request.user_ids)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/", response_model=List[UserResponse])
-def list_users(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
-    """List all users with pagination."""
-    return _user_service.list_users(skip=skip, limit=limit)
+@router.get("/", response_class=Response)
+def list_users(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,email"),
+):
+    """List users with pagination, optionally filtered by status and signup date.
+
+    Users are serialized straight from storage, restricted to ``fields``
+    when given.
+    """
+    try:
+        selected = _user_projector.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    users = _user_service.list_user_records(
+        skip=skip,
+        limit=limit,
+        is_active=is_active,
+        is_verified=is_verified,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    response = Response(
+        content=_user_projector.dump_json(users, selected), media_type="application/json"
+    )
+    if created_from is None and created_to is None:
+        response.headers["X-Total-Count"] = str(
+            _user_service.count_users(is_active=is_active, is_verified=is_verified)
+        )
+    return response
+
+
+@router.get("/stats", response_model=UserStats)
+def get_stats(days: int = Query(30, ge=1, le=366)):
+    """Get user totals and recent signups per day from maintained counters."""
+    return _user_service.get_stats(days=days)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
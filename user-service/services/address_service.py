@@ -2,16 +2,25 @@
 from datetime import datetime
 from typing import List, Optional
 
-from models.address import Address, AddressCreate, AddressUpdate, AddressResponse
+from models.address import (
+    Address,
+    AddressCreate,
+    AddressUpdate,
+    AddressResponse,
+    PostalAddress,
+    AddressValidationResult,
+    AddressValidationResponse,
+)
 from repositories.address_repository import AddressRepository
 from repositories.user_repository import UserRepository
-from utils.validators import validate_postal_code, validate_name
+from utils.validators import validate_postal_code, validate_postal_codes, validate_name
 
 
 class AddressService:
     """Handles address-related business logic."""
 
     MAX_ADDRESSES_PER_USER = 10
+    MAX_VALIDATION_BATCH = 10000
 
     def __init__(self, address_repository: AddressRepository, user_repository: UserRepository):
         self._address_repo = address_repository
@@ -61,6 +70,21 @@ class AddressService:
         created = self._address_repo.create(address)
         return self._to_response(created)
 
+    def validate_addresses(self, addresses: List[PostalAddress]) -> AddressValidationResponse:
+        """Validate a batch of postal codes, e.g. for checkout or import."""
+        if len(addresses) > self.MAX_VALIDATION_BATCH:
+            raise ValueError(
+                f"Cannot validate more than {self.MAX_VALIDATION_BATCH} addresses per request"
+            )
+        outcomes = validate_postal_codes([(a.postal_code, a.country) for a in addresses])
+        results = [
+            AddressValidationResult(valid=valid, error=msg or None) for valid, msg in outcomes
+        ]
+        valid_count = sum(1 for valid, _ in outcomes if valid)
+        return AddressValidationResponse(
+            valid=valid_count, invalid=len(outcomes) - valid_count, results=results
+        )
+
     def get_address(self, user_id: str, address_id: str) -> Optional[AddressResponse]:
         """Get a specific address."""
         address = self._address_repo.get_by_id(address_id)
@@ -1,28 +1,56 @@
 """Authentication service - handles login, logout, and token management."""
-from typing import Optional
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 from models.user import User
-from models.session import Session, LoginRequest, LoginResponse
+from models.session import Session, SessionSummary, LoginRequest, LoginResponse
 from repositories.user_repository import UserRepository
 from utils.password_hasher import PasswordHasher
 from utils.token_manager import TokenManager
+from utils.token_generations import TokenGenerationTable
+from utils.principal_cache import PrincipalCache
+from utils.login_coalescer import LoginCoalescer
+from utils.revoked_sessions import RevokedSessionTable
 
 
 class AuthService:
     """Handles authentication business logic."""
 
+    # last_seen_at is only rewritten when it is older than this, so the
+    # validate_token hot path is read-only for almost every request.
+    LAST_SEEN_RESOLUTION = timedelta(seconds=60)
+    MAX_DEVICE_LENGTH = 200
+
     def __init__(
         self,
         user_repository: UserRepository,
         password_hasher: PasswordHasher,
         token_manager: TokenManager,
+        token_generations: Optional[TokenGenerationTable] = None,
+        principal_cache: Optional[PrincipalCache] = None,
+        login_coalescer: Optional[LoginCoalescer] = None,
+        revoked_sessions: Optional[RevokedSessionTable] = None,
     ):
         self._user_repo = user_repository
         self._hasher = password_hasher
         self._token_manager = token_manager
-        self._sessions: dict[str, Session] = {}  # token -> Session
-
-    def login(self, login_data: LoginRequest) -> Optional[LoginResponse]:
+        self._generations = (
+            token_generations if token_generations is not None else TokenGenerationTable()
+        )
+        self._principals = principal_cache if principal_cache is not None else PrincipalCache()
+        self._login_coalescer = (
+            login_coalescer if login_coalescer is not None else LoginCoalescer(password_hasher)
+        )
+        self._revoked = revoked_sessions if revoked_sessions is not None else RevokedSessionTable()
+        # Sessions created by this worker, for listing and last_seen tracking.
+        # Validation does not depend on them; see validate_token.
+        self._sessions: Dict[str, Session] = {}  # session_id -> Session
+        self._user_sessions: Dict[str, Dict[str, Session]] = {}  # user_id -> {session_id: Session}
+
+    def login(
+        self, login_data: LoginRequest, device: Optional[str] = None
+    ) -> Optional[LoginResponse]:
         """Authenticate a user and create a session."""
         user = self._user_repo.get_by_email(login_data.email)
         if not user:
@@ -31,13 +59,27 @@ class AuthService:
         if not user.is_active:
             return None
 
-        if not self._hasher.verify_password(login_data.password, user.hashed_password):
+        # Identical concurrent attempts share one verification
+        if not self._login_coalescer.verify(user.id, login_data.password, user.hashed_password):
             return None
+        self._user_repo.record_login(user.id)
 
-        # Create token and session
-        token = self._token_manager.create_access_token(user.id)
-        session = Session(user_id=user.id, token=token)
-        self._sessions[token] = session
+        # Create token and session, stamped with the user's token generation
+        generation = self._generations.current(user.id)
+        session_id = str(uuid.uuid4())
+        token = self._token_manager.create_access_token(
+            user.id, {"gen": generation, "sid": session_id}
+        )
+        session = Session(
+            id=session_id,
+            user_id=user.id,
+            token=token,
+            generation=generation,
+            device=device[: self.MAX_DEVICE_LENGTH] if device else None,
+        )
+        self._prune_user_sessions(user.id)
+        self._sessions[session_id] = session
+        self._user_sessions.setdefault(user.id, {})[session_id] = session
 
         return LoginResponse(
             access_token=token,
@@ -47,21 +89,36 @@ class AuthService:
 
     def logout(self, token: str) -> bool:
         """Invalidate a session."""
-        session = self._sessions.get(token)
-        if session:
-            session.is_active = False
-            return True
-        return False
+        payload = self._token_manager.decode_token(token)
+        if not payload or "sid" not in payload:
+            return False
+        self._remove_session(payload["sid"])
+        return self._revoked.revoke(payload["sid"], datetime.fromisoformat(payload["exp"]))
 
     def validate_token(self, token: str) -> Optional[str]:
         """Validate a token and return the user_id if valid."""
-        # Check session store
-        session = self._sessions.get(token)
-        if session and not session.is_valid():
+        # Verify token signature and expiration
+        payload = self._token_manager.decode_token(token)
+        if not payload:
             return None
 
-        # Verify token signature and expiration
-        user_id = self._token_manager.get_user_id_from_token(token)
+        # Reject tokens issued before the user's generation was bumped
+        user_id = payload.get("user_id")
+        if not user_id or not self._generations.is_current(user_id, payload.get("gen", 0)):
+            return None
+
+        # Tokens bound to a session die with it (logout, remote logout). The
+        # revocation table is replicated, so sessions created by another
+        # worker validate on signature and generation alone.
+        session_id = payload.get("sid")
+        if session_id is not None:
+            if self._revoked.is_revoked(session_id):
+                return None
+            session = self._sessions.get(session_id)
+            if session is not None:
+                now = datetime.utcnow()
+                if now - session.last_seen_at >= self.LAST_SEEN_RESOLUTION:
+                    session.last_seen_at = now
         return user_id
 
     def get_current_user(self, token: str) -> Optional[User]:
@@ -69,7 +126,17 @@ class AuthService:
         user_id = self.validate_token(token)
         if not user_id:
             return None
-        return self._user_repo.get_by_id(user_id)
+
+        user = self._principals.get(user_id)
+        if user is None:
+            user = self._user_repo.get_by_id(user_id)
+            if not user:
+                return None
+            self._principals.put(user)
+
+        if not user.is_active:
+            return None
+        return user
 
     def change_password(self, user_id: str, old_password: str, new_password: str) -> bool:
         """Change a user's password."""
@@ -80,27 +147,92 @@ class AuthService:
         if not self._hasher.verify_password(old_password, user.hashed_password):
             return False
 
-        valid, msg = PasswordHasher.is_strong_password(new_password)
+        valid, msg = self._hasher.validate_new_password(new_password)
         if not valid:
             raise ValueError(msg)
 
         user.hashed_password = self._hasher.hash_password(new_password)
         self._user_repo.update(user)
+        self._principals.invalidate(user_id)
 
-        # Invalidate all existing sessions for this user
-        self._invalidate_user_sessions(user_id)
+        # Invalidate all existing tokens for this user
+        self.revoke_all_tokens(user_id)
         return True
 
-    def _invalidate_user_sessions(self, user_id: str):
-        """Invalidate all sessions for a user."""
-        for session in self._sessions.values():
-            if session.user_id == user_id:
-                session.is_active = False
+    def revoke_all_tokens(self, user_id: str) -> int:
+        """Revoke every token issued to a user by bumping their token generation."""
+        return self._generations.bump(user_id)
 
     def get_active_sessions_count(self, user_id: str) -> int:
         """Get the number of active sessions for a user."""
-        return sum(
-            1 for s in self._sessions.values()
-            if s.user_id == user_id and s.is_valid()
-        )
+        return len(self._live_sessions(user_id))
+
+    def list_sessions(self, user_id: str, current_token: Optional[str] = None) -> List[SessionSummary]:
+        """List a user's active sessions, most recently seen first.
+
+        Session details live in this process, so with several workers only
+        the sessions issued by this worker are listed.
+        """
+        current_id = None
+        if current_token:
+            payload = self._token_manager.decode_token(current_token)
+            current_id = payload.get("sid") if payload else None
+
+        sessions = sorted(self._live_sessions(user_id), key=lambda s: s.last_seen_at, reverse=True)
+        return [
+            SessionSummary(
+                id=s.id,
+                device=s.device,
+                created_at=s.created_at,
+                last_seen_at=s.last_seen_at,
+                expires_at=s.expires_at,
+                current=s.id == current_id,
+            )
+            for s in sessions
+        ]
+
+    def revoke_session(self, user_id: str, session_id: str) -> bool:
+        """Log out one of a user's sessions, e.g. from another device.
+
+        A session issued by another worker is unknown here; its id is revoked
+        for a full token lifetime, which covers any token it can carry.
+        Returns False only for a session that belongs to another user.
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            self._revoked.revoke(session_id, datetime.utcnow() + self._token_manager.lifetime)
+            return True
+        if session.user_id != user_id:
+            return False
+        payload = self._token_manager.decode_token(session.token)
+        if payload is not None:
+            self._revoked.revoke(session_id, datetime.fromisoformat(payload["exp"]))
+        self._remove_session(session_id)
+        return True
 
+    def _live_sessions(self, user_id: str) -> List[Session]:
+        self._prune_user_sessions(user_id)
+        return list(self._user_sessions.get(user_id, {}).values())
+
+    def _prune_user_sessions(self, user_id: str):
+        """Drop a user's expired, logged-out and revoked-generation sessions."""
+        sessions = self._user_sessions.get(user_id)
+        if not sessions:
+            return
+        for session_id, session in list(sessions.items()):
+            if not session.is_valid() or not self._generations.is_current(
+                user_id, session.generation
+            ):
+                self._remove_session(session_id)
+
+    def _remove_session(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.is_active = False
+        user_sessions = self._user_sessions.get(session.user_id)
+        if user_sessions is not None:
+            user_sessions.pop(session_id, None)
+            if not user_sessions:
+                self._user_sessions.pop(session.user_id, None)
+        return True
@@ -1,19 +1,43 @@
 """User service - business logic for user management."""
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
-from models.user import User, UserCreate, UserUpdate, UserResponse
+from models.user import (
+    User,
+    UserCreate,
+    UserUpdate,
+    UserResponse,
+    BulkAction,
+    BulkActionResponse,
+    BulkActionResult,
+    UserStats,
+)
+from repositories.address_repository import AddressRepository
 from repositories.user_repository import UserRepository
 from utils.password_hasher import PasswordHasher
+from utils.principal_cache import PrincipalCache
+from utils.token_generations import TokenGenerationTable
 from utils.validators import validate_email, validate_username, validate_phone, validate_name
 
 
 class UserService:
     """Handles user-related business logic."""
 
-    def __init__(self, user_repository: UserRepository, password_hasher: PasswordHasher):
+    MAX_BULK_USER_IDS = 10000
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_hasher: PasswordHasher,
+        principal_cache: Optional[PrincipalCache] = None,
+        address_repository: Optional[AddressRepository] = None,
+        token_generations: Optional[TokenGenerationTable] = None,
+    ):
         self._repo = user_repository
         self._hasher = password_hasher
+        self._principals = principal_cache
+        self._address_repo = address_repository
+        self._generations = token_generations
 
     def create_user(self, user_data: UserCreate) -> UserResponse:
         """Register a new user."""
@@ -39,7 +63,7 @@ class UserService:
             if not valid:
                 raise ValueError(msg)
 
-        valid, msg = PasswordHasher.is_strong_password(user_data.password)
+        valid, msg = self._hasher.validate_new_password(user_data.password)
         if not valid:
             raise ValueError(msg)
 
@@ -113,6 +137,7 @@ class UserService:
 
         user.updated_at = datetime.utcnow()
         updated = self._repo.update(user)
+        self._invalidate_principal(user_id)
         return self._to_response(updated)
 
     def deactivate_user(self, user_id: str) -> bool:
@@ -123,6 +148,8 @@ class UserService:
         user.is_active = False
         user.updated_at = datetime.utcnow()
         self._repo.update(user)
+        self._invalidate_principal(user_id)
+        self._revoke_tokens(user_id)
         return True
 
     def activate_user(self, user_id: str) -> bool:
@@ -133,6 +160,7 @@ class UserService:
         user.is_active = True
         user.updated_at = datetime.utcnow()
         self._repo.update(user)
+        self._invalidate_principal(user_id)
         return True
 
     def verify_user(self, user_id: str) -> bool:
@@ -143,16 +171,129 @@ class UserService:
         user.is_verified = True
         user.updated_at = datetime.utcnow()
         self._repo.update(user)
+        self._invalidate_principal(user_id)
         return True
 
-    def list_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
-        """List all users with pagination."""
-        users = self._repo.list_all(skip=skip, limit=limit)
+    def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[UserResponse]:
+        """List users with pagination, optionally filtered by status and signup date."""
+        users = self.list_user_records(
+            skip=skip,
+            limit=limit,
+            is_active=is_active,
+            is_verified=is_verified,
+            created_from=created_from,
+            created_to=created_to,
+        )
         return [self._to_response(u) for u in users]
 
+    def list_user_records(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[User]:
+        """Like ``list_users``, but return the stored records for direct serialization.
+
+        The records include ``hashed_password``; callers must project them
+        to public fields before they leave the service.
+        """
+        if is_active is None and is_verified is None and created_from is None and created_to is None:
+            return self._repo.list_all(skip=skip, limit=limit)
+        return self._repo.find(
+            is_active=is_active,
+            is_verified=is_verified,
+            created_from=self._to_naive_utc(created_from),
+            created_to=self._to_naive_utc(created_to),
+            skip=skip,
+            limit=limit,
+        )
+
+    def count_users(
+        self, is_active: Optional[bool] = None, is_verified: Optional[bool] = None
+    ) -> int:
+        """Count users, optionally filtered by status."""
+        return self._repo.count(is_active=is_active, is_verified=is_verified)
+
     def delete_user(self, user_id: str) -> bool:
         """Permanently delete a user."""
-        return self._repo.delete(user_id)
+        deleted = self._repo.delete(user_id)
+        if deleted:
+            if self._address_repo is not None:
+                self._address_repo.delete_all_for_users([user_id])
+            self._revoke_tokens(user_id)
+        self._invalidate_principal(user_id)
+        return deleted
+
+    def get_stats(self, days: int = 30) -> UserStats:
+        """Get user totals and signups per day over the last ``days`` days."""
+        since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+        return UserStats(**self._repo.stats(since=since))
+
+    def bulk_action(self, action: BulkAction, user_ids: List[str]) -> BulkActionResponse:
+        """Apply an administrative action to many users at once.
+
+        Repository changes are applied in a single transaction. Deactivation
+        and deletion also revoke the users' tokens, and deletion removes their
+        addresses.
+        """
+        if len(user_ids) > self.MAX_BULK_USER_IDS:
+            raise ValueError(
+                f"At most {self.MAX_BULK_USER_IDS} user ids can be processed per request"
+            )
+        unique_ids = list(dict.fromkeys(user_ids))
+
+        if action == BulkAction.DELETE:
+            done = self._repo.delete_many(unique_ids)
+            if self._address_repo is not None:
+                self._address_repo.delete_all_for_users(done)
+        elif action == BulkAction.ACTIVATE:
+            done = self._repo.bulk_set_flags(unique_ids, is_active=True)
+        elif action == BulkAction.DEACTIVATE:
+            done = self._repo.bulk_set_flags(unique_ids, is_active=False)
+        else:
+            done = self._repo.bulk_set_flags(unique_ids, is_verified=True)
+
+        if self._principals is not None:
+            self._principals.invalidate_many(done)
+        if action in (BulkAction.DEACTIVATE, BulkAction.DELETE) and self._generations is not None:
+            self._generations.bump_many(done)
+
+        done_ids = set(done)
+        results = [BulkActionResult(user_id=uid, applied=uid in done_ids) for uid in unique_ids]
+        return BulkActionResponse(
+            action=action,
+            succeeded=len(done),
+            failed=len(unique_ids) - len(done),
+            results=results,
+        )
+
+    def _invalidate_principal(self, user_id: str):
+        """Drop a user from the authentication cache after a change."""
+        if self._principals is not None:
+            self._principals.invalidate(user_id)
+
+    def _revoke_tokens(self, user_id: str):
+        """Revoke all of a user's outstanding tokens."""
+        if self._generations is not None:
+            self._generations.bump(user_id)
+
+    @staticmethod
+    def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+        # Stored timestamps are naive UTC; normalize aware query bounds to match.
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
 
     @staticmethod
     def _to_response(user: User) -> UserResponse:
@@ -10,6 +10,8 @@ from repositories.user_repository import UserRepository
 from repositories.address_repository import AddressRepository
 from utils.password_hasher import PasswordHasher
 from utils.token_manager import TokenManager
+from utils.principal_cache import PrincipalCache
+from utils.token_generations import TokenGenerationTable
 from services.user_service import UserService
 from services.auth_service import AuthService
 from services.address_service import AddressService
@@ -37,13 +39,39 @@ def token_manager():
 
 
 @pytest.fixture
-def user_service(user_repository, password_hasher):
-    return UserService(user_repository, password_hasher)
+def principal_cache():
+    return PrincipalCache()
 
 
 @pytest.fixture
-def auth_service(user_repository, password_hasher, token_manager):
-    return AuthService(user_repository, password_hasher, token_manager)
+def token_generations():
+    return TokenGenerationTable()
+
+
+@pytest.fixture
+def user_service(
+    user_repository, password_hasher, principal_cache, address_repository, token_generations
+):
+    return UserService(
+        user_repository,
+        password_hasher,
+        principal_cache,
+        address_repository=address_repository,
+        token_generations=token_generations,
+    )
+
+
+@pytest.fixture
+def auth_service(
+    user_repository, password_hasher, token_manager, principal_cache, token_generations
+):
+    return AuthService(
+        user_repository,
+        password_hasher,
+        token_manager,
+        token_generations=token_generations,
+        principal_cache=principal_cache,
+    )
 
 
 @pytest.fixture
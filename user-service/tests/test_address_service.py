@@ -1,7 +1,7 @@
 """Tests for AddressService."""
 import pytest
 from models.user import User
-from models.address import AddressCreate, AddressUpdate
+from models.address import AddressCreate, AddressUpdate, PostalAddress
 from utils.password_hasher import PasswordHasher
 
 
@@ -216,3 +216,24 @@ class TestAddressServiceSetDefault:
         assert result is not None
         assert result.is_default is True
 
+
+
+class TestAddressServiceValidateBatch:
+    def test_validate_addresses(self, address_service):
+        result = address_service.validate_addresses([
+            PostalAddress(postal_code="62701"),
+            PostalAddress(postal_code="ABC"),
+            PostalAddress(postal_code="k1a 0b1", country="CA"),
+            PostalAddress(postal_code="", country="DE"),
+        ])
+        assert result.valid == 2
+        assert result.invalid == 2
+        assert [r.valid for r in result.results] == [True, False, True, False]
+        assert result.results[1].error == "Invalid postal code format for US"
+        assert result.results[3].error == "Postal code is required"
+        assert result.results[0].error is None
+
+    def test_validate_addresses_rejects_oversized_batch(self, address_service):
+        addresses = [PostalAddress(postal_code="62701")] * (address_service.MAX_VALIDATION_BATCH + 1)
+        with pytest.raises(ValueError, match="Cannot validate more than"):
+            address_service.validate_addresses(addresses)
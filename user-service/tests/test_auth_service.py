@@ -1,8 +1,10 @@
 """Tests for AuthService."""
 import pytest
-from models.user import User, UserCreate
+from models.user import User, UserCreate, UserUpdate
 from models.session import LoginRequest
 from utils.password_hasher import PasswordHasher
+from utils.principal_cache import PrincipalCache
+from services.auth_service import AuthService
 
 
 class TestAuthServiceLogin:
@@ -27,6 +29,12 @@ class TestAuthServiceLogin:
         assert result.user_id == user.id
         assert result.access_token is not None
 
+    def test_login_records_last_login(self, auth_service, password_hasher):
+        user = self._create_test_user(auth_service, password_hasher)
+        assert user.last_login_at is None
+        auth_service.login(LoginRequest(email="test@example.com", password="SecurePass1!"))
+        assert user.last_login_at is not None
+
     def test_login_wrong_password(self, auth_service, password_hasher):
         self._create_test_user(auth_service, password_hasher)
         login_data = LoginRequest(email="test@example.com", password="WrongPass1!")
@@ -146,3 +154,260 @@ class TestAuthServiceChangePassword:
         with pytest.raises(ValueError, match="Password"):
             auth_service.change_password(user.id, "SecurePass1!", "weak")
 
+
+
+class TestAuthServiceTokenGenerations:
+    def _login(self, auth_service, password_hasher):
+        hashed = password_hasher.hash_password("SecurePass1!")
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            hashed_password=hashed,
+            first_name="Test",
+            last_name="User",
+        )
+        auth_service._user_repo.create(user)
+        login_data = LoginRequest(email="test@example.com", password="SecurePass1!")
+        return user, auth_service.login(login_data)
+
+    def test_change_password_revokes_existing_tokens(self, auth_service, password_hasher):
+        user, login_result = self._login(auth_service, password_hasher)
+        auth_service.change_password(user.id, "SecurePass1!", "NewSecure2@")
+        assert auth_service.validate_token(login_result.access_token) is None
+        assert auth_service.get_active_sessions_count(user.id) == 0
+
+    def test_revoke_covers_tokens_without_session(self, auth_service, password_hasher, token_manager):
+        user, _ = self._login(auth_service, password_hasher)
+        orphan = token_manager.create_access_token(user.id, {"gen": 0})
+        assert auth_service.validate_token(orphan) == user.id
+        auth_service.revoke_all_tokens(user.id)
+        assert auth_service.validate_token(orphan) is None
+
+    def test_token_without_generation_rejected_after_revoke(self, auth_service, token_manager):
+        legacy = token_manager.create_access_token("user-1")
+        assert auth_service.validate_token(legacy) == "user-1"
+        auth_service.revoke_all_tokens("user-1")
+        assert auth_service.validate_token(legacy) is None
+
+    def test_new_login_after_revoke_is_valid(self, auth_service, password_hasher):
+        user, _ = self._login(auth_service, password_hasher)
+        auth_service.revoke_all_tokens(user.id)
+        login_data = LoginRequest(email="test@example.com", password="SecurePass1!")
+        fresh = auth_service.login(login_data)
+        assert auth_service.validate_token(fresh.access_token) == user.id
+
+
+class TestAuthServicePrincipalCache:
+    def _login(self, auth_service, user_service, sample_user_data):
+        created = user_service.create_user(sample_user_data)
+        login_data = LoginRequest(email=sample_user_data.email, password=sample_user_data.password)
+        return created, auth_service.login(login_data).access_token
+
+    def test_get_current_user_populates_cache(
+        self, auth_service, user_service, sample_user_data, principal_cache
+    ):
+        created, token = self._login(auth_service, user_service, sample_user_data)
+        auth_service.get_current_user(token)
+        assert principal_cache.get(created.id) is not None
+
+    def test_cached_user_served_without_repository(
+        self, auth_service, user_service, sample_user_data, user_repository
+    ):
+        created, token = self._login(auth_service, user_service, sample_user_data)
+        auth_service.get_current_user(token)
+        user_repository._users.clear()
+        current = auth_service.get_current_user(token)
+        assert current is not None
+        assert current.id == created.id
+
+    def test_deactivate_takes_effect_immediately(
+        self, auth_service, user_service, sample_user_data, principal_cache
+    ):
+        created, token = self._login(auth_service, user_service, sample_user_data)
+        auth_service.get_current_user(token)
+        user_service.deactivate_user(created.id)
+        assert principal_cache.get(created.id) is None
+        assert auth_service.get_current_user(token) is None
+
+    def test_update_invalidates_cache(
+        self, auth_service, user_service, sample_user_data, principal_cache
+    ):
+        created, token = self._login(auth_service, user_service, sample_user_data)
+        auth_service.get_current_user(token)
+        user_service.update_user(created.id, UserUpdate(first_name="Jonathan"))
+        assert principal_cache.get(created.id) is None
+        assert auth_service.get_current_user(token).first_name == "Jonathan"
+
+    def test_delete_invalidates_cache(self, auth_service, user_service, sample_user_data):
+        created, token = self._login(auth_service, user_service, sample_user_data)
+        auth_service.get_current_user(token)
+        user_service.delete_user(created.id)
+        assert auth_service.get_current_user(token) is None
+
+
+class TestAuthServiceSessions:
+    def _login(self, auth_service, password_hasher, device=None):
+        if auth_service._user_repo.get_by_email("test@example.com") is None:
+            user = User(
+                email="test@example.com",
+                username="testuser",
+                hashed_password=password_hasher.hash_password("SecurePass1!"),
+                first_name="Test",
+                last_name="User",
+            )
+            auth_service._user_repo.create(user)
+        login_data = LoginRequest(email="test@example.com", password="SecurePass1!")
+        return auth_service.login(login_data, device=device)
+
+    def test_list_sessions_marks_current(self, auth_service, password_hasher):
+        laptop = self._login(auth_service, password_hasher, device="laptop")
+        self._login(auth_service, password_hasher, device="phone")
+
+        sessions = auth_service.list_sessions(laptop.user_id, current_token=laptop.access_token)
+        assert sorted(s.device for s in sessions) == ["laptop", "phone"]
+        assert [s.device for s in sessions if s.current] == ["laptop"]
+
+    def test_revoke_session_invalidates_its_token_only(self, auth_service, password_hasher):
+        laptop = self._login(auth_service, password_hasher, device="laptop")
+        phone = self._login(auth_service, password_hasher, device="phone")
+        phone_session = next(
+            s for s in auth_service.list_sessions(phone.user_id) if s.device == "phone"
+        )
+
+        assert auth_service.revoke_session(laptop.user_id, phone_session.id) is True
+        assert auth_service.validate_token(phone.access_token) is None
+        assert auth_service.validate_token(laptop.access_token) == laptop.user_id
+        assert auth_service.get_active_sessions_count(laptop.user_id) == 1
+
+    def test_revoke_session_of_other_user(self, auth_service, password_hasher):
+        result = self._login(auth_service, password_hasher)
+        session = auth_service.list_sessions(result.user_id)[0]
+        assert auth_service.revoke_session("other-user", session.id) is False
+        assert auth_service.validate_token(result.access_token) == result.user_id
+
+    def test_revoke_session_from_another_worker(
+        self, auth_service, password_hasher, user_repository, token_manager, token_generations
+    ):
+        result = self._login(auth_service, password_hasher)
+        session_id = auth_service.list_sessions(result.user_id)[0].id
+        other_worker = AuthService(
+            user_repository, password_hasher, token_manager, token_generations=token_generations
+        )
+        assert other_worker.list_sessions(result.user_id) == []
+        assert other_worker.revoke_session(result.user_id, session_id) is True
+        assert other_worker.validate_token(result.access_token) is None
+
+        auth_service._revoked.merge(other_worker._revoked.snapshot())
+        assert auth_service.validate_token(result.access_token) is None
+
+    def test_logout_removes_session(self, auth_service, password_hasher):
+        result = self._login(auth_service, password_hasher)
+        auth_service.logout(result.access_token)
+        assert auth_service.list_sessions(result.user_id) == []
+        assert auth_service.validate_token(result.access_token) is None
+
+    def test_last_seen_is_coalesced(self, auth_service, password_hasher):
+        result = self._login(auth_service, password_hasher)
+        session = next(iter(auth_service._user_sessions[result.user_id].values()))
+        first_seen = session.last_seen_at
+
+        auth_service.validate_token(result.access_token)
+        assert session.last_seen_at == first_seen
+
+        session.last_seen_at = first_seen - auth_service.LAST_SEEN_RESOLUTION
+        auth_service.validate_token(result.access_token)
+        assert session.last_seen_at > first_seen
+
+    def test_token_from_another_worker_is_accepted(
+        self, auth_service, password_hasher, user_repository, token_manager, token_generations
+    ):
+        result = self._login(auth_service, password_hasher)
+        other_worker = AuthService(
+            user_repository, password_hasher, token_manager, token_generations=token_generations
+        )
+        assert other_worker.validate_token(result.access_token) == result.user_id
+
+    def test_replicated_logout_rejects_token_on_other_worker(
+        self, auth_service, password_hasher, user_repository, token_manager, token_generations
+    ):
+        result = self._login(auth_service, password_hasher)
+        other_worker = AuthService(
+            user_repository, password_hasher, token_manager, token_generations=token_generations
+        )
+        assert other_worker.logout(result.access_token) is True
+        assert other_worker.logout(result.access_token) is False
+        assert other_worker.validate_token(result.access_token) is None
+
+        assert auth_service.validate_token(result.access_token) == result.user_id
+        auth_service._revoked.merge(other_worker._revoked.snapshot())
+        assert auth_service.validate_token(result.access_token) is None
+
+    def test_revoked_generation_sessions_are_pruned(self, auth_service, password_hasher):
+        result = self._login(auth_service, password_hasher)
+        auth_service.revoke_all_tokens(result.user_id)
+        assert auth_service.list_sessions(result.user_id) == []
+        assert result.user_id not in auth_service._user_sessions
+
+
+class TestPrincipalCache:
+    def _user(self, n):
+        return User(
+            email=f"user{n}@example.com",
+            username=f"user{n}",
+            hashed_password="x",
+            first_name="Test",
+            last_name="User",
+        )
+
+    def test_evicts_least_recently_used(self):
+        cache = PrincipalCache(max_size=2)
+        first, second, third = self._user(1), self._user(2), self._user(3)
+        cache.put(first)
+        cache.put(second)
+        cache.get(first.id)
+        cache.put(third)
+        assert cache.get(first.id) is first
+        assert cache.get(second.id) is None
+        assert len(cache) == 2
+
+    def test_expired_entries_are_dropped(self):
+        cache = PrincipalCache(ttl_seconds=0)
+        user = self._user(1)
+        cache.put(user)
+        assert cache.get(user.id) is None
+        assert len(cache) == 0
+
+
+class TestRevokedSessionTable:
+    def test_expired_entries_are_purged(self):
+        from datetime import datetime, timedelta
+        from utils.revoked_sessions import RevokedSessionTable
+
+        table = RevokedSessionTable()
+        now = datetime.utcnow()
+        table.revoke("old", now - timedelta(seconds=1))
+        assert table.revoke("new", now + timedelta(hours=1)) is True
+        assert not table.is_revoked("old")
+        assert table.is_revoked("new")
+        assert len(table) == 1
+
+
+class TestTokenGenerationTable:
+    def test_bump_outranks_earlier_tokens_and_expires(self):
+        from utils.token_generations import TokenGenerationTable
+
+        now = [1000.0]
+        table = TokenGenerationTable(ttl_seconds=60, clock=lambda: now[0])
+        first = table.bump("u1")
+        assert not table.is_current("u1", 0)
+        assert table.is_current("u1", first)
+
+        now[0] += 61
+        table.bump("u2")  # purges u1, whose pre-bump tokens have all expired
+        assert len(table) == 1
+        assert table.current("u1") == 0
+        assert table.is_current("u1", first)
+
+        second = table.bump("u1")
+        assert second > first
+        assert not table.is_current("u1", first)
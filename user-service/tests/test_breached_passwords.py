@@ -0,0 +1,81 @@
+"""Tests for the breached-password corpus and checker."""
+import hashlib
+
+import pytest
+from utils.breached_passwords import BreachedPasswordChecker, build_corpus, main
+from utils.password_hasher import PasswordHasher
+
+BREACHED = ["Password1!", "Summer2024!", "Qwerty123$", "Welcome1@"]
+
+
+def _sha1_hex(password):
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    source = tmp_path / "hashes.txt"
+    # Unsorted, with a duplicate and Pwned-Passwords style counts
+    lines = [f"{_sha1_hex(p)}:{i + 1}" for i, p in enumerate(reversed(BREACHED))]
+    lines.append(f"{_sha1_hex(BREACHED[0])}:7")
+    source.write_text("\n".join(lines) + "\n")
+    dest = tmp_path / "corpus.bin"
+    build_corpus(str(source), str(dest), record_size=10)
+    return str(dest)
+
+
+class TestBuildCorpus:
+    def test_build_sorts_and_deduplicates(self, corpus_path):
+        with BreachedPasswordChecker(corpus_path) as checker:
+            assert len(checker) == len(BREACHED)
+            assert checker.record_size == 10
+
+    def test_build_sorted_input_streams(self, tmp_path):
+        source = tmp_path / "sorted.txt"
+        source.write_text("\n".join(sorted(_sha1_hex(p) for p in BREACHED)))
+        dest = tmp_path / "corpus.bin"
+        assert build_corpus(str(source), str(dest), record_size=20) == len(BREACHED)
+
+    def test_build_rejects_malformed_hash(self, tmp_path):
+        source = tmp_path / "bad.txt"
+        source.write_text("not-a-hash\n")
+        with pytest.raises(ValueError, match="Line 1"):
+            build_corpus(str(source), str(tmp_path / "corpus.bin"))
+
+    def test_cli_build(self, tmp_path, capsys):
+        source = tmp_path / "hashes.txt"
+        source.write_text(_sha1_hex("Password1!") + "\n")
+        dest = tmp_path / "corpus.bin"
+        assert main(["build", str(source), str(dest)]) == 0
+        assert "Wrote 1 records" in capsys.readouterr().out
+
+
+class TestBreachedPasswordChecker:
+    def test_known_breached_passwords_found(self, corpus_path):
+        with BreachedPasswordChecker(corpus_path) as checker:
+            assert all(checker.is_breached(p) for p in BREACHED)
+
+    def test_unknown_password_not_found(self, corpus_path):
+        with BreachedPasswordChecker(corpus_path) as checker:
+            assert checker.is_breached("Unbreached-Passphrase-42!") is False
+
+    def test_rejects_non_corpus_file(self, tmp_path):
+        path = tmp_path / "random.bin"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError, match="not a breached password corpus"):
+            BreachedPasswordChecker(str(path))
+
+    def test_hasher_rejects_breached_password(self, corpus_path):
+        with BreachedPasswordChecker(corpus_path) as checker:
+            hasher = PasswordHasher(breached_checker=checker)
+            valid, msg = hasher.validate_new_password("Password1!")
+            assert valid is False
+            assert "breach" in msg
+            assert hasher.validate_new_password("SecurePass1!") == (True, "")
+
+    def test_hasher_still_enforces_strength(self, corpus_path):
+        with BreachedPasswordChecker(corpus_path) as checker:
+            hasher = PasswordHasher(breached_checker=checker)
+            valid, msg = hasher.validate_new_password("weak")
+            assert valid is False
+            assert "at least 8" in msg
@@ -0,0 +1,140 @@
+"""Tests for CachedUserRepository."""
+from datetime import datetime, timedelta
+
+import pytest
+from models.user import User
+from repositories.cached_user_repository import CachedUserRepository
+from repositories.user_repository import UserRepository
+
+
+class CountingRepository(UserRepository):
+    """Backing repository that counts point reads."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_by_id(self, user_id):
+        self.reads += 1
+        return super().get_by_id(user_id)
+
+    def get_by_email(self, email):
+        self.reads += 1
+        return super().get_by_email(email)
+
+
+def _user(n: int) -> User:
+    return User(
+        email=f"user{n}@example.com",
+        username=f"user{n}",
+        hashed_password="hashed",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+@pytest.fixture
+def backing():
+    return CountingRepository()
+
+
+@pytest.fixture
+def cache(backing):
+    return CachedUserRepository(backing, max_size=3)
+
+
+class TestCachedUserRepository:
+    def test_reads_hit_cache_after_miss(self, backing, cache):
+        user = backing.create(_user(1))
+        assert cache.get_by_id(user.id) is user
+        assert cache.get_by_id(user.id) is user
+        assert cache.get_by_email(user.email) is user
+        assert backing.reads == 1
+        metrics = cache.metrics()
+        assert (metrics["hits"], metrics["misses"]) == (2, 1)
+        assert metrics["hit_rate"] == pytest.approx(2 / 3)
+
+    def test_create_and_update_write_through(self, backing, cache):
+        user = cache.create(_user(1))
+        user.email = "renamed@example.com"
+        cache.update(user)
+
+        assert cache.get_by_email("renamed@example.com") is user
+        assert cache.get_by_email("user1@example.com") is None
+        assert backing.get_by_email("renamed@example.com") is user
+
+    def test_delete_invalidates(self, backing, cache):
+        user = cache.create(_user(1))
+        assert cache.delete(user.id) is True
+        assert cache.get_by_id(user.id) is None
+        assert cache.get_by_email(user.email) is None
+        assert len(cache) == 0
+
+    def test_bulk_writes_invalidate(self, backing, cache):
+        users = [cache.create(_user(n)) for n in range(3)]
+        cache.bulk_set_flags([users[0].id], is_active=False)
+        cache.delete_many([users[1].id])
+        assert len(cache) == 1
+        assert cache.get_by_id(users[0].id).is_active is False
+        assert cache.get_by_id(users[1].id) is None
+
+    def test_failed_update_invalidates(self, backing, cache):
+        first = cache.create(_user(1))
+        second = cache.create(_user(2))
+        second.email = first.email
+        with pytest.raises(ValueError):
+            cache.update(second)
+        second.email = "user2@example.com"
+        assert cache.get_by_email(first.email) is first
+
+    def test_lru_eviction(self, backing, cache):
+        users = [cache.create(_user(n)) for n in range(3)]
+        cache.get_by_id(users[0].id)  # most recently used
+        cache.create(_user(3))
+
+        assert len(cache) == 3
+        assert cache.metrics()["evictions"] == 1
+        reads = backing.reads
+        cache.get_by_id(users[0].id)
+        assert backing.reads == reads
+        cache.get_by_id(users[1].id)
+        assert backing.reads == reads + 1
+
+    def test_stale_fill_is_discarded(self, backing, cache):
+        user = backing.create(_user(1))
+        original_read = backing.get_by_id
+
+        def racing_read(user_id):
+            found = original_read(user_id)
+            cache.delete(user_id)  # a concurrent write lands mid-read
+            return found
+
+        backing.get_by_id = racing_read
+        cache.get_by_id(user.id)
+        assert len(cache) == 0
+
+    def test_warm_up_from_recent_logins(self, backing, cache):
+        now = datetime.utcnow()
+        users = [backing.create(_user(n)) for n in range(5)]
+        for n, user in enumerate(users[:4]):
+            backing.record_login(user.id, at=now - timedelta(minutes=10 - n))
+
+        assert cache.warm_up() == 3
+        reads = backing.reads
+        for user in users[1:4]:
+            cache.get_by_id(user.id)
+        assert backing.reads == reads
+        assert cache.metrics()["hits"] == 3
+
+    def test_record_login_writes_through(self, backing, cache):
+        user = backing.create(_user(1))
+        cache.record_login(user.id)
+        assert user.last_login_at is not None
+        assert len(cache) == 1
+
+    def test_scans_delegate_to_backing(self, backing, cache):
+        for n in range(5):
+            cache.create(_user(n))
+        assert cache.count() == 5
+        assert len(cache.find(limit=10)) == 5
+        assert cache.stats()["total"] == 5
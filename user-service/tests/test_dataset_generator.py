@@ -0,0 +1,50 @@
+"""Tests for the synthetic dataset generator."""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from generate_dataset import DatasetGenerator, load_into_repositories, write_ndjson  # noqa: E402
+from utils.password_hasher import PasswordHasher  # noqa: E402
+from utils.validators import validate_email, validate_username, validate_postal_code  # noqa: E402
+
+
+class TestDatasetGenerator:
+    def test_same_seed_same_data(self):
+        first = [u.model_dump() for u, _, _ in DatasetGenerator(seed=3).generate(50)]
+        second = [u.model_dump() for u, _, _ in DatasetGenerator(seed=3).generate(50)]
+        other = [u.model_dump() for u, _, _ in DatasetGenerator(seed=4).generate(50)]
+        assert first == second
+        assert first != other
+
+    def test_records_pass_service_validation(self):
+        for user, addresses, sessions in DatasetGenerator(seed=1).generate(200):
+            assert validate_email(user.email)[0]
+            assert validate_username(user.username)[0]
+            for address in addresses:
+                assert address.user_id == user.id
+                assert validate_postal_code(address.postal_code, address.country)[0]
+            assert all(s.user_id == user.id for s in sessions)
+
+    def test_signups_in_order(self):
+        users = [u for u, _, _ in DatasetGenerator(seed=1).generate(100)]
+        assert users == sorted(users, key=lambda u: u.created_at)
+
+    def test_password_hashes_verify(self):
+        user, _, _ = next(DatasetGenerator(seed=1).generate(1))
+        assert PasswordHasher().verify_password("Synthetic-0!A1", user.hashed_password)
+
+    def test_load_into_repositories(self, user_repository, address_repository):
+        sessions = load_into_repositories(
+            DatasetGenerator(seed=2), 500, user_repository, address_repository
+        )
+        assert user_repository.count() == 500
+        assert address_repository.count() > 0
+        assert len(sessions) > 0
+
+    def test_write_ndjson(self, tmp_path):
+        counts = write_ndjson(DatasetGenerator(seed=2), 20, str(tmp_path))
+        lines = (tmp_path / "users.ndjson").read_text().splitlines()
+        assert counts["users"] == len(lines) == 20
+        assert json.loads(lines[0])["id"]
@@ -0,0 +1,137 @@
+"""Tests for IdempotencyStore."""
+import threading
+
+import pytest
+from utils.idempotency_store import (
+    IdempotencyStore,
+    IdempotencyKeyMismatch,
+    IdempotencyKeyInProgress,
+)
+
+
+class TestIdempotencyStore:
+    def test_replay_returns_stored_result(self):
+        store = IdempotencyStore()
+        calls = []
+        first = store.run("key", "hash", lambda: calls.append(1) or "created")
+        second = store.run("key", "hash", lambda: calls.append(1) or "created-again")
+        assert first == second == "created"
+        assert len(calls) == 1
+
+    def test_reuse_with_different_request_rejected(self):
+        store = IdempotencyStore()
+        store.run("key", "hash-a", lambda: "created")
+        with pytest.raises(IdempotencyKeyMismatch):
+            store.run("key", "hash-b", lambda: "other")
+
+    def test_stored_errors_are_replayed(self):
+        store = IdempotencyStore(stored_errors=(ValueError,))
+        calls = []
+
+        def handler():
+            calls.append(1)
+            raise ValueError("already exists")
+
+        raised = []
+        for _ in range(3):
+            with pytest.raises(ValueError, match="already exists") as info:
+                store.run("key", "hash", handler)
+            raised.append(info.value)
+        assert len(calls) == 1
+        # Each replay raises its own exception rather than re-raising one object
+        assert raised[1] is not raised[2]
+
+    def test_unexpected_errors_are_not_stored(self):
+        store = IdempotencyStore(stored_errors=(ValueError,))
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            store.run("key", "hash", failing)
+        assert store.run("key", "hash", lambda: "recovered") == "recovered"
+
+    def test_concurrent_duplicates_share_in_flight_result(self):
+        store = IdempotencyStore()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow_handler():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "created"
+
+        owner = threading.Thread(target=lambda: results.append(store.run("key", "hash", slow_handler)))
+        owner.start()
+        started.wait(5)
+        waiters = [
+            threading.Thread(target=lambda: results.append(store.run("key", "hash", slow_handler)))
+            for _ in range(4)
+        ]
+        for t in waiters:
+            t.start()
+        release.set()
+        for t in [owner] + waiters:
+            t.join(5)
+
+        assert results == ["created"] * 5
+        assert len(calls) == 1
+
+    def test_waiter_times_out_on_stuck_request(self):
+        store = IdempotencyStore(wait_timeout=0.01)
+        release = threading.Event()
+        started = threading.Event()
+
+        def stuck():
+            started.set()
+            release.wait(5)
+            return "created"
+
+        owner = threading.Thread(target=lambda: store.run("key", "hash", stuck))
+        owner.start()
+        started.wait(5)
+        with pytest.raises(IdempotencyKeyInProgress):
+            store.run("key", "hash", stuck)
+        release.set()
+        owner.join(5)
+
+    def test_expired_entries_run_again(self):
+        store = IdempotencyStore(ttl_seconds=0)
+        store.run("key", "hash", lambda: "first")
+        assert store.run("key", "hash-b", lambda: "second") == "second"
+
+    def test_bounded_size_evicts_oldest(self):
+        store = IdempotencyStore(max_entries=2)
+        for key in ("a", "b", "c"):
+            store.run(key, "hash", lambda: key)
+        assert len(store) == 2
+        assert store.run("a", "other-hash", lambda: "fresh") == "fresh"
+
+    def test_eviction_skips_in_flight_entries(self):
+        store = IdempotencyStore(max_entries=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def stuck():
+            started.set()
+            release.wait(5)
+            return "slow"
+
+        owner = threading.Thread(target=lambda: store.run("slow", "hash", stuck))
+        owner.start()
+        started.wait(5)
+        store.run("a", "hash", lambda: "a")
+        store.run("b", "hash", lambda: "b")
+        release.set()
+        owner.join(5)
+        assert store.run("slow", "hash", lambda: "again") == "slow"
+        assert store.run("a", "other-hash", lambda: "fresh") == "fresh"
+
+    def test_namespaces_are_isolated(self):
+        store = IdempotencyStore()
+        assert store.run("key", "hash", lambda: "alice", namespace="user:alice") == "alice"
+        assert store.run("key", "hash", lambda: "bob", namespace="user:bob") == "bob"
+        assert store.run("key", "hash", lambda: "again", namespace="user:alice") == "alice"
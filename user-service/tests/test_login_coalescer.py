@@ -0,0 +1,103 @@
+"""Tests for LoginCoalescer."""
+import threading
+import time
+
+import pytest
+from utils.login_coalescer import LoginCoalescer
+from utils.password_hasher import PasswordHasher
+
+
+class SlowHasher(PasswordHasher):
+    """Hasher that counts verifications and holds each one open until released."""
+
+    def __init__(self):
+        super().__init__(iterations=1000)
+        self.calls = 0
+        self.release = threading.Event()
+
+    def verify_password(self, password: str, hashed: str) -> bool:
+        self.calls += 1
+        self.release.wait(5)
+        return super().verify_password(password, hashed)
+
+
+@pytest.fixture
+def hasher():
+    hasher = SlowHasher()
+    hasher.release.set()
+    return hasher
+
+
+class TestLoginCoalescer:
+    def test_concurrent_identical_attempts_share_one_verification(self, hasher):
+        hashed = hasher.hash_password("SecurePass1!")
+        hasher.release.clear()
+        coalescer = LoginCoalescer(hasher)
+        results = []
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(coalescer.verify("u1", "SecurePass1!", hashed))
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        while coalescer.coalesced < 7:
+            time.sleep(0.001)
+        hasher.release.set()
+        for t in threads:
+            t.join()
+
+        assert results == [True] * 8
+        assert hasher.calls == 1
+        assert coalescer.verifications == 1
+
+    def test_successes_are_not_cached(self, hasher):
+        hashed = hasher.hash_password("SecurePass1!")
+        coalescer = LoginCoalescer(hasher)
+        assert coalescer.verify("u1", "SecurePass1!", hashed) is True
+        assert coalescer.verify("u1", "SecurePass1!", hashed) is True
+        assert hasher.calls == 2
+
+    def test_repeated_failures_hit_negative_cache(self, hasher):
+        hashed = hasher.hash_password("SecurePass1!")
+        coalescer = LoginCoalescer(hasher)
+        for _ in range(5):
+            assert coalescer.verify("u1", "WrongPass1!", hashed) is False
+        assert hasher.calls == 1
+        assert coalescer.negative_hits == 4
+
+        # A different wrong password is verified on its own
+        assert coalescer.verify("u1", "OtherPass1!", hashed) is False
+        assert hasher.calls == 2
+
+    def test_negative_cache_expires(self, hasher):
+        hashed = hasher.hash_password("SecurePass1!")
+        coalescer = LoginCoalescer(hasher, negative_ttl_seconds=0.01)
+        coalescer.verify("u1", "WrongPass1!", hashed)
+        time.sleep(0.02)
+        coalescer.verify("u1", "WrongPass1!", hashed)
+        assert hasher.calls == 2
+
+    def test_password_change_bypasses_cached_failure(self, hasher):
+        old_hash = hasher.hash_password("SecurePass1!")
+        coalescer = LoginCoalescer(hasher)
+        assert coalescer.verify("u1", "NewSecure1!", old_hash) is False
+
+        new_hash = hasher.hash_password("NewSecure1!")
+        assert coalescer.verify("u1", "NewSecure1!", new_hash) is True
+
+    def test_negative_cache_is_bounded(self, hasher):
+        hashed = hasher.hash_password("SecurePass1!")
+        coalescer = LoginCoalescer(hasher, max_negative_entries=3)
+        for i in range(10):
+            coalescer.verify("u1", f"Wrong{i}", hashed)
+        assert len(coalescer._failures) == 3
+
+    def test_plaintext_is_not_retained(self, hasher):
+        hashed = hasher.hash_password("SecurePass1!")
+        coalescer = LoginCoalescer(hasher)
+        coalescer.verify("u1", "WrongPass1!", hashed)
+        (key,) = coalescer._failures
+        assert "WrongPass1!" not in key
@@ -0,0 +1,54 @@
+"""Tests for RequestProfiler."""
+import os
+import pstats
+
+from utils.request_profiler import RequestProfiler
+
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+
+class TestRequestProfiler:
+    def test_token_selects_request(self, tmp_path):
+        profiler = RequestProfiler(str(tmp_path), token="secret")
+        assert profiler.should_profile("secret") is True
+        assert profiler.should_profile("wrong") is False
+        assert profiler.should_profile(None) is False
+
+    def test_sample_rate_selects_requests(self, tmp_path):
+        assert RequestProfiler(str(tmp_path), sample_rate=1.0).should_profile(None) is True
+        assert RequestProfiler(str(tmp_path), sample_rate=0.0).should_profile(None) is False
+
+    def test_unselected_requests_run_unprofiled(self, tmp_path):
+        profiler = RequestProfiler(str(tmp_path), token="secret")
+        wrapped = profiler.wrap_endpoint(_busy)
+        assert wrapped(10) == _busy(10)
+        assert profiler.list_profiles() == []
+
+    def test_selected_request_writes_profile(self, tmp_path):
+        profiler = RequestProfiler(str(tmp_path), token="secret")
+        wrapped = profiler.wrap_endpoint(_busy)
+        token = profiler.start_request("POST", "/users/")
+        assert wrapped(1000) == _busy(1000)
+        name = profiler.finish_request(token, 12.3)
+
+        assert name.endswith("_POST_users_12ms.prof")
+        stats = pstats.Stats(profiler.profile_path(name))
+        assert any(func[2] == "_busy" for func in stats.stats)
+
+    def test_rotation_keeps_newest(self, tmp_path):
+        profiler = RequestProfiler(str(tmp_path), token="secret", max_profiles=2)
+        wrapped = profiler.wrap_endpoint(_busy)
+        for _ in range(4):
+            token = profiler.start_request("GET", "/health")
+            wrapped(10)
+            profiler.finish_request(token, 1)
+        assert len(profiler.list_profiles()) == 2
+
+    def test_profile_path_rejects_traversal(self, tmp_path):
+        profiler = RequestProfiler(str(tmp_path / "profiles"), token="secret")
+        (tmp_path / "secret.prof").write_text("x")
+        assert profiler.profile_path("../secret.prof") is None
+        assert profiler.profile_path("missing.prof") is None
+        assert os.path.isdir(profiler.directory)
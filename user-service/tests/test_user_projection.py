@@ -0,0 +1,61 @@
+"""Tests for UserProjector."""
+import json
+
+import pytest
+
+from models.user import User, UserResponse
+from utils.user_projection import PUBLIC_FIELDS, UserProjector
+
+
+@pytest.fixture
+def projector():
+    return UserProjector()
+
+
+@pytest.fixture
+def users():
+    return [
+        User(
+            email=f"user{i}@example.com",
+            username=f"user{i}",
+            hashed_password="secret-hash",
+            first_name="Test",
+            last_name="User",
+        )
+        for i in range(3)
+    ]
+
+
+class TestUserProjector:
+    def test_parse_fields_defaults_to_public_fields(self, projector):
+        assert projector.parse_fields(None) == PUBLIC_FIELDS
+        assert projector.parse_fields("") == PUBLIC_FIELDS
+        assert projector.parse_fields(" , ") == PUBLIC_FIELDS
+
+    def test_parse_fields(self, projector):
+        assert projector.parse_fields("id, email,is_active") == {"id", "email", "is_active"}
+
+    def test_parse_fields_rejects_unknown_and_private_fields(self, projector):
+        with pytest.raises(ValueError, match="hashed_password"):
+            projector.parse_fields("id,hashed_password")
+        with pytest.raises(ValueError, match="nickname"):
+            projector.parse_fields("nickname")
+
+    def test_dump_json_projects_fields(self, projector, users):
+        rows = json.loads(projector.dump_json(users, frozenset({"id", "email"})))
+        assert rows == [{"id": u.id, "email": u.email} for u in users]
+
+    def test_dump_json_default_matches_response_model(self, projector, users):
+        rows = json.loads(projector.dump_json(users))
+        expected = [
+            json.loads(UserResponse(**u.model_dump()).model_dump_json()) for u in users
+        ]
+        assert rows == expected
+        assert all("hashed_password" not in row for row in rows)
+
+    def test_projection_is_cached(self, projector, users):
+        fields = projector.parse_fields("id,email")
+        projector.dump_json(users, fields)
+        first = projector._projections[fields]
+        projector.dump_json(users, projector.parse_fields("email,id"))
+        assert projector._projections[fields] is first
@@ -0,0 +1,226 @@
+"""Tests for UserRepository, including concurrent write stress tests."""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from models.user import User
+from repositories.user_repository import UserRepository
+
+
+def _make_user(n, email=None, username=None):
+    return User(
+        email=email or f"user{n}@example.com",
+        username=username or f"user{n}",
+        hashed_password="x",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def _run_threads(target, thread_count):
+    barrier = threading.Barrier(thread_count)
+
+    def worker(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(thread_count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+        assert not t.is_alive(), "worker thread deadlocked"
+
+
+def _assert_indexes_consistent(repo):
+    assert len(repo._email_index) == len(repo._users)
+    assert len(repo._username_index) == len(repo._users)
+    for user_id, user in repo._users.items():
+        assert repo._email_index[user.email] == user_id
+        assert repo._username_index[user.username] == user_id
+
+
+class TestUserRepositoryUpdate:
+    def test_in_place_email_change_reindexes(self, user_repository):
+        user = user_repository.create(_make_user(1))
+        user.email = "renamed@example.com"
+        user_repository.update(user)
+        assert user_repository.get_by_email("renamed@example.com") is user
+        assert user_repository.get_by_email("user1@example.com") is None
+
+    def test_update_rejects_taken_email(self, user_repository):
+        user_repository.create(_make_user(1))
+        second = user_repository.create(_make_user(2))
+        second.email = "user1@example.com"
+        with pytest.raises(ValueError, match="already exists"):
+            user_repository.update(second)
+
+    def test_delete_after_in_place_rename(self, user_repository):
+        user = user_repository.create(_make_user(1))
+        user.username = "renamed"
+        user_repository.update(user)
+        assert user_repository.delete(user.id) is True
+        assert user_repository.get_by_username("renamed") is None
+        _assert_indexes_consistent(user_repository)
+
+
+class TestUserRepositoryConcurrency:
+    THREADS = 16
+    OPS_PER_THREAD = 200
+
+    def test_concurrent_duplicate_registrations_only_one_wins(self):
+        repo = UserRepository()
+        successes = []
+        for round_number in range(20):
+            winners = []
+
+            def register(index):
+                user = _make_user(
+                    index,
+                    email=f"race{round_number}@example.com",
+                    username=f"racer{round_number}-{index}",
+                )
+                try:
+                    repo.create(user)
+                    winners.append(user.id)
+                except ValueError:
+                    pass
+
+            _run_threads(register, self.THREADS)
+            successes.append(len(winners))
+
+        assert successes == [1] * 20
+        _assert_indexes_consistent(repo)
+
+    def test_concurrent_create_and_update_keeps_indexes_consistent(self):
+        repo = UserRepository()
+
+        def hammer(index):
+            for n in range(self.OPS_PER_THREAD):
+                user = repo.create(_make_user(f"{index}-{n}"))
+                user.email = f"moved{index}-{n}@example.com"
+                user.username = f"moved{index}-{n}"
+                repo.update(user)
+
+        _run_threads(hammer, self.THREADS)
+
+        assert repo.count() == self.THREADS * self.OPS_PER_THREAD
+        _assert_indexes_consistent(repo)
+        assert repo.get_by_email("user0-0@example.com") is None
+        assert repo.get_by_email("moved0-0@example.com") is not None
+
+    def test_concurrent_renames_to_contended_email(self):
+        repo = UserRepository()
+        users = [repo.create(_make_user(i)) for i in range(self.THREADS)]
+        winners = []
+
+        def rename(index):
+            user = users[index].model_copy()
+            user.email = "contended@example.com"
+            try:
+                repo.update(user)
+                winners.append(index)
+            except ValueError:
+                pass
+
+        _run_threads(rename, self.THREADS)
+        assert len(winners) == 1
+        _assert_indexes_consistent(repo)
+
+
+class TestUserRepositoryFilters:
+    def _populate(self, repo):
+        base = datetime(2024, 1, 1)
+        users = []
+        for i in range(10):
+            user = _make_user(i)
+            user.created_at = base + timedelta(days=i)
+            user.is_active = i % 2 == 0
+            user.is_verified = i % 3 == 0
+            users.append(repo.create(user))
+        return base, users
+
+    def test_find_by_flags(self, user_repository):
+        _, users = self._populate(user_repository)
+        result = user_repository.find(is_active=True, is_verified=False)
+        assert [u.id for u in result] == [users[i].id for i in (2, 4, 8)]
+
+    def test_find_by_created_range(self, user_repository):
+        base, users = self._populate(user_repository)
+        result = user_repository.find(
+            created_from=base + timedelta(days=3), created_to=base + timedelta(days=6)
+        )
+        assert [u.id for u in result] == [users[i].id for i in (3, 4, 5)]
+
+    def test_find_combines_flags_and_range_with_pagination(self, user_repository):
+        base, users = self._populate(user_repository)
+        result = user_repository.find(
+            is_active=False, created_from=base + timedelta(days=2), skip=1, limit=2
+        )
+        assert [u.id for u in result] == [users[i].id for i in (5, 7)]
+
+    def test_flag_transitions_update_index_and_counts(self, user_repository):
+        _, users = self._populate(user_repository)
+        assert user_repository.count(is_active=True) == 5
+        assert user_repository.count(is_verified=False) == 6
+        users[1].is_active = True
+        user_repository.update(users[1])
+        assert user_repository.count(is_active=True) == 6
+        assert users[1] in user_repository.find(is_active=True)
+
+    def test_delete_removes_from_filters(self, user_repository):
+        _, users = self._populate(user_repository)
+        user_repository.delete(users[0].id)
+        assert user_repository.count(is_active=True) == 4
+        assert user_repository.count(is_active=True, is_verified=True) == 1
+        assert users[0] not in user_repository.find(is_verified=True)
+        assert users[0] not in user_repository.find(created_from=datetime(2023, 1, 1))
+
+    def test_freed_slots_are_reused_in_creation_order(self, user_repository):
+        base, users = self._populate(user_repository)
+        user_repository.delete_many([users[2].id, users[4].id])
+        late = _make_user(10)
+        late.created_at = base + timedelta(days=20)
+        user_repository.create(late)
+        assert len(user_repository._filters._slot_users) == 10
+        result = user_repository.find(is_active=True)
+        assert [u.id for u in result] == [users[i].id for i in (0, 6, 8)] + [late.id]
+
+    def test_bulk_flag_changes_move_users_between_combinations(self, user_repository):
+        _, users = self._populate(user_repository)
+        user_repository.bulk_set_flags([u.id for u in users[:4]], is_verified=True)
+        assert user_repository.count(is_active=True, is_verified=True) == 3
+        assert user_repository.count(is_active=False, is_verified=False) == 2
+        result = user_repository.find(is_verified=True, skip=1, limit=3)
+        assert [u.id for u in result] == [users[i].id for i in (1, 2, 3)]
+
+
+class TestUserRepositoryCreateMany:
+    def test_create_many_indexes_all(self, user_repository):
+        users = [_make_user(i) for i in range(5)]
+        user_repository.create_many(users)
+        assert user_repository.count() == 5
+        assert user_repository.count(is_active=True) == 5
+        _assert_indexes_consistent(user_repository)
+
+    def test_create_many_keeps_creation_order(self, user_repository):
+        base = datetime(2024, 1, 1)
+        first = [_make_user(i) for i in range(3)]
+        for i, user in enumerate(first):
+            user.created_at = base + timedelta(days=2 * i)
+        user_repository.create_many(first)
+        late = _make_user(3)
+        late.created_at = base + timedelta(days=1)
+        user_repository.create_many([late])
+        assert [u.id for u in user_repository.find()] == [first[0].id, late.id, first[1].id, first[2].id]
+
+    def test_create_many_is_all_or_nothing(self, user_repository):
+        user_repository.create(_make_user(0))
+        with pytest.raises(ValueError, match="already exists"):
+            user_repository.create_many([_make_user(1), _make_user(0)])
+        assert user_repository.count() == 1
+
+    def test_create_many_rejects_duplicates_within_batch(self, user_repository):
+        with pytest.raises(ValueError, match="already exists"):
+            user_repository.create_many([_make_user(1), _make_user(2, email="user1@example.com")])
+        assert user_repository.count() == 0
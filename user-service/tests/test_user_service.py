@@ -1,6 +1,8 @@
 """Tests for UserService."""
 import pytest
-from models.user import UserCreate, UserUpdate
+from datetime import datetime, timedelta, timezone
+from models.user import User, UserCreate, UserUpdate, BulkAction
+from models.address import AddressCreate
 
 
 class TestUserServiceCreate:
@@ -150,3 +152,141 @@ class TestUserServiceLifecycle:
         users = user_service.list_users()
         assert len(users) == 2
 
+    def test_list_user_records_returns_stored_users(self, user_service, created_user):
+        (record,) = user_service.list_user_records(is_active=True)
+        assert isinstance(record, User)
+        assert record.id == created_user.id
+
+
+class TestUserServiceFilteredListing:
+    def test_list_users_filtered_by_flags(self, user_service, created_user, sample_user_data):
+        second = UserCreate(
+            email="jane@example.com",
+            username="janedoe",
+            password="SecurePass1!",
+            first_name="Jane",
+            last_name="Doe",
+        )
+        other = user_service.create_user(second)
+        user_service.verify_user(other.id)
+        user_service.deactivate_user(created_user.id)
+
+        assert [u.id for u in user_service.list_users(is_verified=True)] == [other.id]
+        assert [u.id for u in user_service.list_users(is_active=False)] == [created_user.id]
+        assert user_service.count_users(is_active=True) == 1
+
+    def test_list_users_accepts_timezone_aware_bounds(self, user_service, created_user):
+        since = datetime.now(timezone.utc) - timedelta(minutes=5)
+        result = user_service.list_users(created_from=since)
+        assert [u.id for u in result] == [created_user.id]
+
+
+class TestUserServiceBulkActions:
+    def _create_users(self, user_service, count):
+        users = []
+        for i in range(count):
+            data = UserCreate(
+                email=f"bulk{i}@example.com",
+                username=f"bulk{i}",
+                password="SecurePass1!",
+                first_name="Bulk",
+                last_name="User",
+            )
+            users.append(user_service.create_user(data))
+        return users
+
+    def test_bulk_deactivate(self, user_service, token_generations):
+        users = self._create_users(user_service, 3)
+        ids = [u.id for u in users]
+        result = user_service.bulk_action(BulkAction.DEACTIVATE, ids + ["missing"])
+        assert result.succeeded == 3
+        assert result.failed == 1
+        assert [(r.user_id, r.applied) for r in result.results] == [
+            *((uid, True) for uid in ids), ("missing", False)
+        ]
+        assert all(not user_service.get_user(uid).is_active for uid in ids)
+        assert all(token_generations.current(uid) > 0 for uid in ids)
+
+    def test_bulk_delete_revokes_tokens(self, user_service, token_manager, token_generations):
+        users = self._create_users(user_service, 2)
+        token = token_manager.create_access_token(users[0].id, {"gen": 0})
+        user_service.bulk_action(BulkAction.DELETE, [u.id for u in users])
+        assert all(token_generations.current(u.id) > 0 for u in users)
+        assert not token_generations.is_current(users[0].id, token_manager.decode_token(token)["gen"])
+
+    def test_bulk_verify_then_activate(self, user_service):
+        users = self._create_users(user_service, 2)
+        ids = [u.id for u in users]
+        user_service.bulk_action(BulkAction.VERIFY, ids)
+        assert user_service.count_users(is_verified=True) == 2
+        user_service.bulk_action(BulkAction.DEACTIVATE, ids)
+        user_service.bulk_action(BulkAction.ACTIVATE, ids)
+        assert user_service.count_users(is_active=True) == 2
+
+    def test_bulk_delete_cascades_addresses(self, user_service, address_service):
+        users = self._create_users(user_service, 2)
+        for user in users:
+            address_service.add_address(
+                user.id,
+                AddressCreate(
+                    label="Home",
+                    street_line1="123 Main St",
+                    city="Springfield",
+                    state="IL",
+                    postal_code="62701",
+                ),
+            )
+        result = user_service.bulk_action(BulkAction.DELETE, [u.id for u in users])
+        assert result.succeeded == 2
+        assert user_service.list_users() == []
+        assert all(address_service.list_addresses(u.id) == [] for u in users)
+
+    def test_bulk_duplicate_ids_reported_once(self, user_service):
+        users = self._create_users(user_service, 1)
+        result = user_service.bulk_action(BulkAction.DELETE, [users[0].id, users[0].id])
+        assert len(result.results) == 1
+        assert result.succeeded == 1
+
+    def test_bulk_rejects_oversized_request(self, user_service):
+        ids = ["x"] * (user_service.MAX_BULK_USER_IDS + 1)
+        with pytest.raises(ValueError, match="At most"):
+            user_service.bulk_action(BulkAction.VERIFY, ids)
+
+
+class TestUserServiceStats:
+    def test_stats_track_lifecycle(self, user_service, created_user):
+        second = user_service.create_user(UserCreate(
+            email="jane@example.com",
+            username="janedoe",
+            password="SecurePass1!",
+            first_name="Jane",
+            last_name="Doe",
+        ))
+        user_service.verify_user(second.id)
+        user_service.deactivate_user(created_user.id)
+
+        stats = user_service.get_stats()
+        assert (stats.total, stats.active, stats.inactive) == (2, 1, 1)
+        assert (stats.verified, stats.unverified) == (1, 1)
+        assert stats.signups_per_day == {datetime.utcnow().date(): 2}
+
+        user_service.activate_user(created_user.id)
+        user_service.delete_user(second.id)
+        stats = user_service.get_stats()
+        assert (stats.total, stats.active, stats.verified) == (1, 1, 0)
+        assert sum(stats.signups_per_day.values()) == 1
+
+    def test_stats_window_excludes_old_signups(self, user_service, user_repository):
+        old = User(
+            email="old@example.com",
+            username="olduser",
+            hashed_password="x",
+            first_name="Old",
+            last_name="User",
+            created_at=datetime.utcnow() - timedelta(days=90),
+        )
+        user_repository.create(old)
+        stats = user_service.get_stats(days=30)
+        assert stats.total == 1
+        assert stats.signups_per_day == {}
+        assert user_service.get_stats(days=91).signups_per_day == {old.created_at.date(): 1}
@@ -8,6 +8,7 @@ from utils.validators import (
     validate_name,
 )
 from utils.password_hasher import PasswordHasher
+from utils.postal_codes import PostalCodeValidator
 
 
 class TestEmailValidation:
@@ -90,6 +91,39 @@ class TestPostalCodeValidation:
         assert valid is False
 
 
+class TestPostalCodeValidator:
+    def test_bundled_rules_cover_more_countries(self):
+        countries = PostalCodeValidator().countries
+        assert {"US", "CA", "UK", "GB", "DE", "FR", "NL", "JP"} <= set(countries)
+
+    def test_country_and_case_insensitive(self):
+        validator = PostalCodeValidator()
+        assert validator.validate("k1a 0b1", "ca")[0] is True
+        assert validator.validate("1012 ab", "NL")[0] is True
+
+    def test_unknown_country_accepts_any_code(self):
+        assert PostalCodeValidator().validate("anything", "ZZ") == (True, "")
+
+    def test_rejects_trailing_garbage(self):
+        assert PostalCodeValidator().validate("62701\n", "US")[0] is False
+
+    def test_batch_matches_single_validation(self):
+        validator = PostalCodeValidator()
+        pairs = [
+            ("62701", "US"), ("SW1A 1AA", "GB"), ("1234", "DE"), ("75008", "FR"),
+            ("", "US"), ("00-950", "PL"), ("62701-12", "US"), ("x", "ZZ"),
+        ]
+        assert validator.validate_batch(pairs) == [validator.validate(*p) for p in pairs]
+
+    def test_custom_rules_file(self, tmp_path):
+        rules = tmp_path / "rules.json"
+        rules.write_text('{"_comment": "test", "XX": "\\\\d{2}"}')
+        validator = PostalCodeValidator(str(rules))
+        assert validator.countries == ["XX"]
+        assert validator.validate("12", "XX")[0] is True
+        assert validator.validate("123", "XX")[0] is False
+
+
 class TestNameValidation:
     def test_valid_name(self):
         valid, msg = validate_name("John")
@@ -0,0 +1,162 @@
+"""Local breached-password lookups over a memory-mapped sorted hash corpus.
+
+The corpus file is a 16-byte header followed by fixed-width records, each the
+first ``record_size`` bytes of a password's SHA-1 digest, sorted ascending
+with duplicates removed. Lookups binary-search the memory-mapped file, so
+opening a multi-GB corpus is instant and only the pages touched by searches
+become resident.
+
+Build a corpus from a plain list of hex SHA-1 hashes (one per line, with an
+optional ``:count`` suffix as in the Pwned Passwords downloads) with::
+
+    python -m utils.breached_passwords build hashes.txt corpus.bin --record-size 10
+"""
+import argparse
+import hashlib
+import mmap
+import struct
+import sys
+from typing import Iterator, Optional
+
+MAGIC = b"BPWDv1\0\0"
+HEADER = struct.Struct("<8sII")  # magic, record_size, reserved
+DEFAULT_RECORD_SIZE = 10
+MIN_RECORD_SIZE = 6
+SHA1_SIZE = 20
+
+
+class BreachedPasswordChecker:
+    """Checks passwords against a memory-mapped breached-hash corpus."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Breached password corpus '{path}' is empty")
+
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"Breached password corpus '{path}' is truncated")
+        magic, record_size, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or not MIN_RECORD_SIZE <= record_size <= SHA1_SIZE:
+            self.close()
+            raise ValueError(f"'{path}' is not a breached password corpus")
+
+        self._record_size = record_size
+        self._count = (len(self._mm) - HEADER.size) // record_size
+
+    @property
+    def record_size(self) -> int:
+        return self._record_size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def is_breached(self, password: str) -> bool:
+        """Check whether a password appears in the corpus."""
+        digest = hashlib.sha1(password.encode("utf-8")).digest()
+        return self.contains_digest(digest)
+
+    def contains_digest(self, digest: bytes) -> bool:
+        """Check whether a (possibly longer) SHA-1 digest's prefix is in the corpus."""
+        key = digest[: self._record_size]
+        size = self._record_size
+        mm = self._mm
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * size
+            record = mm[offset: offset + size]
+            if record < key:
+                lo = mid + 1
+            elif record > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def close(self):
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "BreachedPasswordChecker":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _parse_hashes(path: str, record_size: int) -> Iterator[bytes]:
+    with open(path, "r", encoding="ascii") as source:
+        for line_number, line in enumerate(source, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            hex_digest = line.split(":", 1)[0]
+            if len(hex_digest) != SHA1_SIZE * 2:
+                raise ValueError(f"Line {line_number}: expected a 40-character SHA-1 hash")
+            yield bytes.fromhex(hex_digest)[:record_size]
+
+
+def build_corpus(source_path: str, dest_path: str, record_size: int = DEFAULT_RECORD_SIZE) -> int:
+    """Build a sorted, de-duplicated corpus file from a plain hash list.
+
+    Input that is already sorted (like the Pwned Passwords downloads) is
+    streamed straight to disk; unsorted input is sorted in memory.
+
+    Returns:
+        The number of records written.
+    """
+    if not MIN_RECORD_SIZE <= record_size <= SHA1_SIZE:
+        raise ValueError(f"record_size must be between {MIN_RECORD_SIZE} and {SHA1_SIZE}")
+
+    previous = None
+    is_sorted = True
+    for record in _parse_hashes(source_path, record_size):
+        if previous is not None and record < previous:
+            is_sorted = False
+            break
+        previous = record
+
+    records = _parse_hashes(source_path, record_size)
+    if not is_sorted:
+        records = iter(sorted(records))
+
+    written = 0
+    previous = None
+    with open(dest_path, "wb") as dest:
+        dest.write(HEADER.pack(MAGIC, record_size, 0))
+        for record in records:
+            if record == previous:
+                continue
+            dest.write(record)
+            previous = record
+            written += 1
+    return written
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Breached password corpus tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Build a corpus from a plain SHA-1 hash list")
+    build.add_argument("source", help="Text file with one hex SHA-1 hash per line")
+    build.add_argument("dest", help="Output corpus file")
+    build.add_argument(
+        "--record-size",
+        type=int,
+        default=DEFAULT_RECORD_SIZE,
+        help=f"Bytes of each digest to keep (default {DEFAULT_RECORD_SIZE})",
+    )
+    args = parser.parse_args(argv)
+
+    count = build_corpus(args.source, args.dest, args.record_size)
+    print(f"Wrote {count} records to {args.dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
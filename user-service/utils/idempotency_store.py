@@ -0,0 +1,125 @@
+"""Idempotency-key response store for retry-safe POST endpoints."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """Raised when an idempotency key is reused with a different request."""
+
+
+class IdempotencyKeyInProgress(ValueError):
+    """Raised when a duplicate request gives up waiting on the original."""
+
+
+class _Entry:
+    __slots__ = ("request_hash", "done", "result", "error", "abandoned", "expires_at")
+
+    def __init__(self, request_hash: str):
+        self.request_hash = request_hash
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.abandoned = False
+        self.expires_at = float("inf")
+
+
+class IdempotencyStore:
+    """Bounded TTL map of ``(namespace, key) -> (request hash, outcome)``.
+
+    The first request for a key runs the handler; replays with the same
+    request hash get the stored outcome back without redoing any work, and
+    concurrent duplicates block until the first request finishes. Outcomes
+    include the exception types listed in ``stored_errors`` (e.g. validation
+    failures) so that a retry sees the same answer; any other exception is
+    not stored, so the request can be retried. Keys are scoped to a
+    ``namespace`` (the caller), so two callers that pick the same key never
+    see each other's outcomes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 24 * 3600,
+        wait_timeout: float = 30.0,
+        stored_errors: tuple = (),
+    ):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._wait_timeout = wait_timeout
+        self._stored_errors = stored_errors
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(
+        self, key: str, request_hash: str, handler: Callable[[], Any], namespace: str = ""
+    ) -> Any:
+        """Run ``handler`` at most once per key and return its (stored) outcome."""
+        key = (namespace, key)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at <= time.monotonic():
+                    del self._entries[key]
+                    entry = None
+                owner = entry is None
+                if owner:
+                    entry = _Entry(request_hash)
+                    self._entries[key] = entry
+                    self._evict()
+
+            if entry.request_hash != request_hash:
+                raise IdempotencyKeyMismatch(
+                    "Idempotency key was already used with a different request"
+                )
+            if owner:
+                return self._execute(key, entry, handler)
+
+            if not entry.done.wait(self._wait_timeout):
+                raise IdempotencyKeyInProgress(
+                    "A request with this idempotency key is still in progress"
+                )
+            if entry.abandoned:
+                continue  # the original failed unexpectedly; take over
+            if entry.error is not None:
+                # A fresh copy per replay, so concurrent replays never share
+                # (and keep extending) one exception's traceback
+                raise copy.copy(entry.error).with_traceback(None)
+            return entry.result
+
+    def _execute(self, key: Tuple[str, str], entry: _Entry, handler: Callable[[], Any]) -> Any:
+        try:
+            entry.result = handler()
+        except self._stored_errors as e:
+            entry.error = e
+            self._complete(entry)
+            raise
+        except BaseException:
+            with self._lock:
+                self._entries.pop(key, None)
+            entry.abandoned = True
+            entry.done.set()
+            raise
+        self._complete(entry)
+        return entry.result
+
+    def _complete(self, entry: _Entry):
+        entry.expires_at = time.monotonic() + self._ttl_seconds
+        entry.done.set()
+
+    def _evict(self):
+        # Oldest entries first; in-flight entries are never evicted, and are
+        # moved to the back so the next-oldest finished entry can go.
+        in_flight = 0
+        while len(self._entries) > self._max_entries and in_flight < len(self._entries):
+            key, entry = next(iter(self._entries.items()))
+            if entry.done.is_set():
+                self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                in_flight += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
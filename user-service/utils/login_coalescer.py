@@ -0,0 +1,99 @@
+"""Coalescing of identical in-flight password verifications."""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from utils.password_hasher import PasswordHasher
+
+
+class _Flight:
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[bool] = None
+
+
+class LoginCoalescer:
+    """Shares one password verification among identical concurrent attempts.
+
+    Attempts are keyed by the user, their stored hash and a keyed digest of
+    the attempted password (the plaintext is never kept). The first attempt
+    for a key runs the PBKDF2 verification; identical attempts that arrive
+    while it runs wait for and reuse its result. Failed verifications are
+    also remembered for ``negative_ttl_seconds``, so a retry storm with a
+    wrong password costs one verification. Successes are never cached, and
+    because the stored hash is part of the key, a password change makes
+    every cached failure irrelevant.
+    """
+
+    def __init__(
+        self,
+        password_hasher: PasswordHasher,
+        negative_ttl_seconds: float = 5.0,
+        max_negative_entries: int = 10000,
+    ):
+        self._hasher = password_hasher
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._max_negative_entries = max_negative_entries
+        self._secret = os.urandom(32)
+        self._in_flight: dict = {}
+        self._failures: "OrderedDict[Tuple[str, str, bytes], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.verifications = 0
+        self.coalesced = 0
+        self.negative_hits = 0
+
+    def verify(self, user_id: str, password: str, hashed: str) -> bool:
+        """Verify a password, sharing work with identical concurrent attempts."""
+        key = (user_id, hashed, self._digest(password))
+        with self._lock:
+            expires_at = self._failures.get(key)
+            if expires_at is not None:
+                if expires_at > time.monotonic():
+                    self.negative_hits += 1
+                    return False
+                del self._failures[key]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._in_flight[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.result is not None:
+                return flight.result
+            # The leader failed unexpectedly; verify independently.
+            return self._hasher.verify_password(password, hashed)
+
+        try:
+            flight.result = self._hasher.verify_password(password, hashed)
+        finally:
+            with self._lock:
+                self.verifications += 1
+                del self._in_flight[key]
+                if flight.result is False:
+                    self._remember_failure(key)
+            flight.done.set()
+        return flight.result
+
+    def clear(self):
+        """Forget all remembered failures."""
+        with self._lock:
+            self._failures.clear()
+
+    def _digest(self, password: str) -> bytes:
+        return hmac.new(self._secret, password.encode("utf-8"), hashlib.sha256).digest()
+
+    def _remember_failure(self, key: Tuple[str, str, bytes]):
+        self._failures[key] = time.monotonic() + self._negative_ttl_seconds
+        self._failures.move_to_end(key)
+        while len(self._failures) > self._max_negative_entries:
+            self._failures.popitem(last=False)
@@ -3,18 +3,32 @@ import hashlib
 import hmac
 import os
 import base64
+from typing import Optional
+
+from utils.breached_passwords import BreachedPasswordChecker
 
 
 class PasswordHasher:
     """Handles secure password hashing and verification."""
 
-    def __init__(self, salt_length: int = 32, iterations: int = 100000):
+    def __init__(
+        self,
+        salt_length: int = 32,
+        iterations: int = 100000,
+        breached_checker: Optional[BreachedPasswordChecker] = None,
+    ):
         self._salt_length = salt_length
         self._iterations = iterations
+        self._breached_checker = breached_checker
+
+    def hash_password(self, password: str, salt: Optional[bytes] = None) -> str:
+        """Hash a password using PBKDF2 with SHA-256.
 
-    def hash_password(self, password: str) -> str:
-        """Hash a password using PBKDF2 with SHA-256."""
-        salt = os.urandom(self._salt_length)
+        A random salt is generated unless one is given; pass a salt only to
+        produce reproducible hashes for test data.
+        """
+        if salt is None:
+            salt = os.urandom(self._salt_length)
         key = hashlib.pbkdf2_hmac(
             "sha256",
             password.encode("utf-8"),
@@ -63,3 +77,15 @@ class PasswordHasher:
             return False, "Password must contain at least one special character"
         return True, ""
 
+    def validate_new_password(self, password: str) -> tuple[bool, str]:
+        """Check strength requirements and reject known-breached passwords.
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        valid, msg = self.is_strong_password(password)
+        if not valid:
+            return valid, msg
+        if self._breached_checker is not None and self._breached_checker.is_breached(password):
+            return False, "Password has appeared in a data breach; choose a different password"
+        return True, ""
@@ -0,0 +1,76 @@
+"""Data-driven postal code validation with batch support."""
+import json
+import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "postal_codes.json")
+
+
+class PostalCodeValidator:
+    """Validates postal codes against a compiled per-country rule table.
+
+    Rules are loaded once from a JSON file mapping country codes to
+    full-match patterns. Countries without a rule accept any non-empty code.
+    """
+
+    def __init__(self, rules_path: str = DEFAULT_RULES_PATH):
+        with open(rules_path, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+        self._patterns: Dict[str, "re.Pattern"] = {
+            country.upper(): re.compile(pattern, re.ASCII)
+            for country, pattern in rules.items()
+            if not country.startswith("_")
+        }
+
+    @property
+    def countries(self) -> List[str]:
+        return sorted(self._patterns)
+
+    def validate(self, postal_code: str, country: str = "US") -> Tuple[bool, str]:
+        """Validate one postal code.
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if not postal_code or not postal_code.strip():
+            return False, "Postal code is required"
+        pattern = self._patterns.get(country.upper())
+        if pattern and not pattern.fullmatch(postal_code.upper()):
+            return False, f"Invalid postal code format for {country}"
+        return True, ""
+
+    def validate_batch(self, addresses: Sequence[Tuple[str, str]]) -> List[Tuple[bool, str]]:
+        """Validate many ``(postal_code, country)`` pairs.
+
+        Pairs are grouped by country so that each compiled pattern is looked
+        up once and applied across its whole group.
+
+        Returns:
+            One (is_valid, error_message) tuple per input pair, in input order
+        """
+        results: List[Optional[Tuple[bool, str]]] = [None] * len(addresses)
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for index, (postal_code, country) in enumerate(addresses):
+            if not postal_code or not postal_code.strip():
+                results[index] = (False, "Postal code is required")
+            else:
+                groups[country].append(index)
+
+        ok = (True, "")
+        for country, indexes in groups.items():
+            pattern = self._patterns.get(country.upper())
+            if pattern is None:
+                for index in indexes:
+                    results[index] = ok
+                continue
+            fullmatch = pattern.fullmatch
+            invalid = (False, f"Invalid postal code format for {country}")
+            codes = [addresses[index][0].upper() for index in indexes]
+            for index, matched in zip(indexes, map(fullmatch, codes)):
+                results[index] = ok if matched else invalid
+        return results
+
+
+default_validator = PostalCodeValidator()
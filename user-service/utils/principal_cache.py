@@ -0,0 +1,63 @@
+"""Bounded TTL cache of authenticated principals."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from models.user import User
+
+
+class PrincipalCache:
+    """LRU cache of users keyed by user_id, with a per-entry time-to-live.
+
+    Sits in front of the user repository on the authentication path so that
+    resolving the current user needs no storage access in the steady state.
+    Writers are expected to call ``invalidate`` whenever a user changes; the
+    TTL only bounds staleness for changes made outside this process.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[User]:
+        """Get a cached user, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user: User):
+        """Cache a user, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self._ttl_seconds)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        """Drop a user from the cache."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_many(self, user_ids: Iterable[str]):
+        """Drop many users from the cache under a single lock acquisition."""
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        """Drop all cached users."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,147 @@
+"""Opt-in cProfile sampling of individual requests."""
+import asyncio
+import contextvars
+import cProfile
+import functools
+import hmac
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from fastapi.routing import APIRoute
+
+_current_request: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "profiled_request", default=None
+)
+
+_PROFILE_NAME = re.compile(r"^[\w.-]+\.prof$")
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps a rotating directory of profiles.
+
+    A request is profiled when it carries the configured token in the
+    ``X-Profile`` header, or when it is picked by ``sample_rate``. Profiling
+    happens in the thread that runs the endpoint, so it covers the handler,
+    services, password hashing, model validation and repository code.
+    """
+
+    HEADER = "X-Profile"
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 0.0,
+        token: Optional[str] = None,
+        max_profiles: int = 50,
+    ):
+        self._directory = directory
+        self._sample_rate = sample_rate
+        self._token = token
+        self._max_profiles = max_profiles
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        """Check a privileged profiling token."""
+        return bool(self._token and token and hmac.compare_digest(token, self._token))
+
+    def should_profile(self, header_value: Optional[str]) -> bool:
+        if self.is_authorized(header_value):
+            return True
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    def start_request(self, method: str, path: str) -> contextvars.Token:
+        """Mark the current request for profiling; the endpoint wrapper does the work."""
+        return _current_request.set({"method": method, "path": path, "profile": None})
+
+    def finish_request(self, token: contextvars.Token, elapsed_ms: float) -> Optional[str]:
+        """Write the current request's profile, if one was collected, and rotate."""
+        request = _current_request.get()
+        _current_request.reset(token)
+        if request is None or request["profile"] is None:
+            return None
+
+        slug = re.sub(r"[^\w-]+", "_", request["path"]).strip("_") or "root"
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        name = f"{stamp}_{request['method']}_{slug}_{elapsed_ms:.0f}ms.prof"
+        request["profile"].dump_stats(os.path.join(self._directory, name))
+        self._rotate()
+        return name
+
+    def wrap_endpoint(self, func: Callable) -> Callable:
+        """Wrap a sync endpoint so it runs under cProfile when its request is selected."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            request = _current_request.get()
+            if request is None:
+                return func(*args, **kwargs)
+            profile = cProfile.Profile()
+            request["profile"] = profile
+            return profile.runcall(func, *args, **kwargs)
+
+        return wrapper
+
+    def list_profiles(self) -> List[dict]:
+        """List stored profiles, newest first."""
+        profiles = []
+        for entry in os.scandir(self._directory):
+            if entry.is_file() and _PROFILE_NAME.match(entry.name):
+                stat = entry.stat()
+                profiles.append({
+                    "name": entry.name,
+                    "size_bytes": stat.st_size,
+                    "created_at": datetime.utcfromtimestamp(stat.st_mtime),
+                })
+        profiles.sort(key=lambda p: p["name"], reverse=True)
+        return profiles
+
+    def profile_path(self, name: str) -> Optional[str]:
+        """Resolve a stored profile by name, refusing anything outside the directory."""
+        if not _PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(self._directory, name)
+        return path if os.path.isfile(path) else None
+
+    def _rotate(self):
+        with self._lock:
+            profiles = self.list_profiles()
+            for stale in profiles[self._max_profiles:]:
+                try:
+                    os.remove(os.path.join(self._directory, stale["name"]))
+                except FileNotFoundError:
+                    pass
+
+
+def install_profiler(app, profiler: RequestProfiler):
+    """Install request profiling on an app.
+
+    Only called when profiling is configured, so a disabled profiler adds no
+    middleware and no wrapper to the request path.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not asyncio.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = profiler.wrap_endpoint(route.dependant.call)
+
+    @app.middleware("http")
+    async def profile_requests(request, call_next):
+        if not profiler.should_profile(request.headers.get(RequestProfiler.HEADER)):
+            return await call_next(request)
+        token = profiler.start_request(request.method, request.url.path)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            name = profiler.finish_request(token, elapsed_ms)
+        if name:
+            response.headers["X-Profile-Name"] = name
+        return response
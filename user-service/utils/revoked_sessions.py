@@ -0,0 +1,57 @@
+"""Replicable table of logged-out session ids."""
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class RevokedSessionTable:
+    """Tracks sessions that were logged out before their tokens expired.
+
+    Tokens carry a ``sid`` claim; a token is rejected only if its session is
+    listed here, so any worker can validate tokens it did not issue. Each
+    entry is kept until the session's tokens would have expired anyway,
+    which keeps the table small enough to replicate like the generation
+    table.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, datetime] = {}  # session_id -> token expiry
+        self._lock = threading.Lock()
+        self._next_purge: Optional[datetime] = None
+
+    def revoke(self, session_id: str, expires_at: datetime) -> bool:
+        """Revoke a session until ``expires_at``; False if it was already revoked."""
+        with self._lock:
+            self._purge(datetime.utcnow())
+            if session_id in self._revoked:
+                return False
+            self._revoked[session_id] = expires_at
+            if self._next_purge is None or expires_at < self._next_purge:
+                self._next_purge = expires_at
+            return True
+
+    def is_revoked(self, session_id: str) -> bool:
+        return session_id in self._revoked
+
+    def snapshot(self) -> Dict[str, datetime]:
+        """Export the table for replication to other workers."""
+        with self._lock:
+            return dict(self._revoked)
+
+    def merge(self, revoked: Dict[str, datetime]):
+        """Merge a replicated snapshot."""
+        with self._lock:
+            for session_id, expires_at in revoked.items():
+                self._revoked.setdefault(session_id, expires_at)
+                if self._next_purge is None or expires_at < self._next_purge:
+                    self._next_purge = expires_at
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def _purge(self, now: datetime):
+        # Caller holds the lock. Only scans once the earliest entry has expired.
+        if self._next_purge is None or now < self._next_purge:
+            return
+        self._revoked = {sid: exp for sid, exp in self._revoked.items() if exp > now}
+        self._next_purge = min(self._revoked.values(), default=None)
@@ -0,0 +1,43 @@
+"""Striped locks for fine-grained mutual exclusion on string keys."""
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+class StripedLock:
+    """A fixed pool of locks selected by hashing a key.
+
+    Writers touching unrelated keys usually land on different stripes and run
+    in parallel, while writers on the same key always serialize. Multiple keys
+    are locked in ascending stripe order so concurrent callers cannot deadlock.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _stripes_for(self, keys) -> List[int]:
+        return sorted({zlib.crc32(key.encode("utf-8")) % len(self._locks) for key in keys})
+
+    @contextmanager
+    def acquire(self, *keys: str) -> Iterator[None]:
+        """Hold the stripes covering all given keys for the duration of the block."""
+        stripes = self._stripes_for(keys)
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+    @contextmanager
+    def acquire_all(self) -> Iterator[None]:
+        """Hold every stripe, excluding all other writers, for bulk operations."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
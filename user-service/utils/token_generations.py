@@ -0,0 +1,95 @@
+"""Per-user token generation table for mass token revocation."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable
+
+from utils.token_manager import ACCESS_TOKEN_EXPIRE_HOURS
+
+
+class TokenGenerationTable:
+    """Tracks the current token generation for each user.
+
+    Every access token carries a ``gen`` claim equal to the user's generation
+    at issue time, and a token is valid while its generation is at least the
+    user's current one. Bumping a user's generation revokes all of that
+    user's outstanding tokens in O(1) without touching per-session state.
+
+    A generation is the bump time in milliseconds (kept increasing per
+    user), so a later bump always outranks every token issued before it.
+    Once a token lifetime has passed since a bump, every token it rejects
+    has expired anyway, so the entry is dropped and the user is back at
+    generation 0. Users that were never bumped, or not bumped recently,
+    take no space in the table, so it stays small enough to replicate
+    across workers.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = ACCESS_TOKEN_EXPIRE_HOURS * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        # user_id -> generation, in bump order, so the oldest entries expire first
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._ttl_ms = int(ttl_seconds * 1000)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def current(self, user_id: str) -> int:
+        """Get the current generation for a user."""
+        return self._generations.get(user_id, 0)
+
+    def bump(self, user_id: str) -> int:
+        """Advance a user's generation, revoking all previously issued tokens."""
+        with self._lock:
+            now_ms = self._now_ms()
+            self._purge(now_ms)
+            return self._bump(user_id, now_ms)
+
+    def bump_many(self, user_ids: Iterable[str]):
+        """Advance the generation of many users under a single lock acquisition."""
+        with self._lock:
+            now_ms = self._now_ms()
+            self._purge(now_ms)
+            for user_id in user_ids:
+                self._bump(user_id, now_ms)
+
+    def is_current(self, user_id: str, generation: int) -> bool:
+        """Check whether a token generation is still current for a user."""
+        return generation >= self._generations.get(user_id, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Export the table for replication to other workers."""
+        with self._lock:
+            return dict(self._generations)
+
+    def merge(self, generations: Dict[str, int]):
+        """Merge a replicated snapshot, keeping the highest generation per user."""
+        with self._lock:
+            for user_id, generation in generations.items():
+                if generation > self._generations.get(user_id, 0):
+                    self._generations[user_id] = generation
+                    self._generations.move_to_end(user_id)
+
+    def __len__(self) -> int:
+        return len(self._generations)
+
+    def _now_ms(self) -> int:
+        return int(self._clock() * 1000)
+
+    def _bump(self, user_id: str, now_ms: int) -> int:
+        # Caller holds the lock
+        generation = max(self._generations.get(user_id, 0) + 1, now_ms)
+        self._generations[user_id] = generation
+        self._generations.move_to_end(user_id)
+        return generation
+
+    def _purge(self, now_ms: int):
+        # Caller holds the lock. Entries are in bump order, so stop at the
+        # first one still inside a token lifetime.
+        cutoff = now_ms - self._ttl_ms
+        while self._generations:
+            user_id, generation = next(iter(self._generations.items()))
+            if generation > cutoff:
+                break
+            self._generations.popitem(last=False)
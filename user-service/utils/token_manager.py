@@ -21,6 +21,11 @@ class TokenManager:
         self._secret_key = secret_key
         self._expire_hours = expire_hours
 
+    @property
+    def lifetime(self) -> timedelta:
+        """How long an access token stays valid after it is issued."""
+        return timedelta(hours=self._expire_hours)
+
     def create_access_token(self, user_id: str, extra_claims: Optional[Dict[str, Any]] = None) -> str:
         """Create a JWT access token for a user."""
         now = datetime.utcnow()
@@ -0,0 +1,52 @@
+"""Sparse-fieldset JSON serialization of stored users."""
+import threading
+from typing import FrozenSet, List, Optional
+
+from pydantic import TypeAdapter
+
+from models.user import User, UserResponse
+
+# Only fields that are part of the public response may be selected; this
+# is what keeps hashed_password out of projected output.
+PUBLIC_FIELDS: FrozenSet[str] = frozenset(UserResponse.model_fields)
+
+
+class UserProjector:
+    """Serializes lists of stored users to JSON, keeping only selected fields.
+
+    Users are dumped straight from the stored ``User`` records by pydantic's
+    compiled serializer, without building intermediate response models. The
+    include spec for each distinct field set is built once and cached.
+    """
+
+    def __init__(self, max_cached: int = 256):
+        self._adapter = TypeAdapter(List[User])
+        self._max_cached = max_cached
+        self._projections: dict = {}
+        self._lock = threading.Lock()
+
+    def parse_fields(self, fields: Optional[str]) -> FrozenSet[str]:
+        """Parse a ``fields=id,email`` query value; None or empty selects all public fields."""
+        if not fields:
+            return PUBLIC_FIELDS
+        selected = frozenset(f.strip() for f in fields.split(",") if f.strip())
+        unknown = selected - PUBLIC_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        if not selected:
+            return PUBLIC_FIELDS
+        return selected
+
+    def dump_json(self, users: List[User], fields: FrozenSet[str] = PUBLIC_FIELDS) -> bytes:
+        """Serialize users to a JSON array containing only ``fields``."""
+        return self._adapter.dump_json(users, include=self._projection(fields))
+
+    def _projection(self, fields: FrozenSet[str]) -> dict:
+        projection = self._projections.get(fields)
+        if projection is None:
+            projection = {"__all__": set(fields)}
+            with self._lock:
+                if len(self._projections) >= self._max_cached:
+                    self._projections.clear()
+                self._projections[fields] = projection
+        return projection
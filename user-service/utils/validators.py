@@ -1,6 +1,8 @@
 """Input validation utilities."""
 import re
-from typing import Tuple
+from typing import List, Sequence, Tuple
+
+from utils.postal_codes import default_validator
 
 
 def validate_email(email: str) -> Tuple[bool, str]:
@@ -67,22 +69,16 @@ def validate_postal_code(postal_code: str, country: str = "US") -> Tuple[bool, s
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not postal_code or not postal_code.strip():
-        return False, "Postal code is required"
+    return default_validator.validate(postal_code, country)
 
-    patterns = {
-        "US": r'^\d{5}(-\d{4})?$',
-        "CA": r'^[A-Za-z]\d[A-Za-z]\s?\d[A-Za-z]\d$',
-        "UK": r'^[A-Za-z]{1,2}\d[A-Za-z\d]?\s?\d[A-Za-z]{2}$',
-        "DE": r'^\d{5}$',
-        "FR": r'^\d{5}$',
-    }
 
-    pattern = patterns.get(country.upper())
-    if pattern and not re.match(pattern, postal_code):
-        return False, f"Invalid postal code format for {country}"
+def validate_postal_codes(addresses: Sequence[Tuple[str, str]]) -> List[Tuple[bool, str]]:
+    """Validate many (postal_code, country) pairs at once.
 
-    return True, ""
+    Returns:
+        List of (is_valid, error_message) tuples in input order
+    """
+    return default_validator.validate_batch(addresses)
 
 
 def validate_name(name: str, field_name: str = "Name") -> Tuple[bool, str]: